@@ -0,0 +1,71 @@
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+import httpx
+
+from mock_llm_server import start_mock_server
+
+# Compares the old "new AsyncClient per call" pattern with the shared
+# keep-alive client from client/llm_client.py against the local mock LLM.
+MOCK_PORT = 8089
+MOCK_LATENCY_MS = 5.0
+ITERATIONS = 200
+CONCURRENCY = 10
+
+os.environ.setdefault("DEEPSEEK_BASE_URL", f"http://127.0.0.1:{MOCK_PORT}/v1")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "client"))
+from llm_client import get_llm_client, close_llm_clients, stage_timeout  # noqa: E402
+
+PAYLOAD = {"model": "deepseek-chat", "messages": [{"role": "user", "content": "ping"}]}
+
+
+async def call_fresh_client():
+    async with httpx.AsyncClient(base_url=os.environ["DEEPSEEK_BASE_URL"]) as client:
+        response = await client.post("chat/completions", json=PAYLOAD, timeout=stage_timeout("router"))
+        response.raise_for_status()
+
+
+async def call_shared_client():
+    response = await get_llm_client().post("chat/completions", json=PAYLOAD, timeout=stage_timeout("router"))
+    response.raise_for_status()
+
+
+async def measure(name, call, mock):
+    mock.RequestHandlerClass.state.reset()
+    latencies = []
+    semaphore = asyncio.Semaphore(CONCURRENCY)
+
+    async def timed():
+        async with semaphore:
+            start = time.perf_counter()
+            await call()
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start_all = time.perf_counter()
+    await asyncio.gather(*(timed() for _ in range(ITERATIONS)))
+    total = time.perf_counter() - start_all
+    stats = mock.RequestHandlerClass.state.snapshot()
+
+    print(f"\n{name}")
+    print(f"  Median latency : {statistics.median(latencies):.2f} ms (server adds {MOCK_LATENCY_MS} ms)")
+    print(f"  Mean latency   : {statistics.mean(latencies):.2f} ms")
+    print(f"  Throughput     : {ITERATIONS / total:.1f} req/s")
+    print(f"  TCP connections: {stats['connections']} for {stats['requests']} requests")
+
+
+async def run_benchmark():
+    print(f"🔬 LLM client benchmark (N={ITERATIONS}, Concurrency={CONCURRENCY}, mock on port {MOCK_PORT})")
+    mock = start_mock_server(MOCK_PORT, MOCK_LATENCY_MS)
+    try:
+        await measure("Fresh AsyncClient per call", call_fresh_client, mock)
+        await measure("Shared keep-alive client", call_shared_client, mock)
+    finally:
+        await close_llm_clients()
+        mock.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_benchmark())
@@ -0,0 +1,323 @@
+import bisect
+import json
+import os
+import re
+import sys
+import threading
+
+from config import DB_JSON_PATH
+from name_index import NameIndex
+
+
+def normalize(text):
+    # Same folding as normalize() in src/index.ts, so lookups agree with the server
+    return re.sub(r"[\s.\-]", "", (text or "").lower().strip())
+
+
+def _intern(value):
+    # Days, rooms, semesters, programs... repeat across thousands of records
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class Student:
+    __slots__ = ("id", "name", "program", "semester")
+
+    def __init__(self, id, name, program, semester):
+        self.id = id
+        self.name = name
+        self.program = program
+        self.semester = semester
+
+    def as_dict(self):
+        return {"name": self.name, "program": self.program, "semester": self.semester}
+
+
+class Professor:
+    __slots__ = ("id", "name", "office", "email", "department")
+
+    def __init__(self, id, name, office, email, department):
+        self.id = id
+        self.name = name
+        self.office = office
+        self.email = email
+        self.department = department
+
+    def as_dict(self):
+        return {"name": self.name, "office": self.office, "email": self.email, "department": self.department}
+
+
+class Module:
+    __slots__ = ("id", "name", "prof_id")
+
+    def __init__(self, id, name, prof_id):
+        self.id = id
+        self.name = name
+        self.prof_id = prof_id
+
+
+class Grade:
+    # Module name and professor live on the Module record, not on every grade
+    __slots__ = ("module", "grade", "credits", "prof_id", "status", "semester")
+
+    def __init__(self, module, grade, credits, prof_id, status, semester):
+        self.module = module
+        self.grade = grade
+        self.credits = credits
+        self.prof_id = prof_id
+        self.status = status
+        self.semester = semester
+
+    def as_dict(self):
+        return {"module_id": self.module.id, "module": self.module.name, "grade": self.grade, "credits": self.credits,
+                "prof_id": self.prof_id, "status": self.status, "semester": self.semester}
+
+
+class Lecture:
+    __slots__ = ("day", "time", "room", "lecture", "prof_id", "type")
+
+    def __init__(self, day, time, room, lecture, prof_id, type):
+        self.day = day
+        self.time = time
+        self.room = room
+        self.lecture = lecture
+        self.prof_id = prof_id
+        self.type = type
+
+    def as_dict(self):
+        return {"day": self.day, "time": self.time, "room": self.room, "lecture": self.lecture,
+                "prof_id": self.prof_id, "type": self.type}
+
+
+class AcademicStore:
+    """Read-only, indexed view of db.json, built once.
+
+    Exact lookups (ID, normalized name, module -> professor, professor ->
+    modules, course -> schedule) are dict hits; name prefixes use a sorted
+    key list and bisect. The find_* methods follow the server's helpers (ID,
+    then exact name, then the first substring match in file order) and only
+    fall back to a scan over the precomputed normalized keys when the exact
+    indexes miss. Unlike the server, an exact professor or module name also
+    wins over an earlier entry that merely contains it.
+
+    The search_* methods rank fuzzy matches (typos, umlaut spellings) with a
+    trigram index that is built on first use.
+    """
+
+    backend = "json"
+
+    def __init__(self, db):
+        self.professors = {}
+        self.professor_by_name = {}
+        self.professor_by_last_name = {}
+        for prof_id, p in db.get("professors", {}).items():
+            prof = Professor(prof_id, p["name"], p.get("office"), p.get("email"), _intern(p.get("department")))
+            self.professors[prof_id] = prof
+            self.professor_by_name.setdefault(normalize(p["name"]), prof)
+            # "Weber" for "Prof. Dr. E. Weber"
+            self.professor_by_last_name.setdefault(normalize(p["name"].split()[-1]), prof)
+        self._professor_keys = tuple((normalize(p.name), p) for p in self.professors.values())
+
+        self.students = {}
+        students_by_name = {}
+        for student_id, s in db.get("students", {}).items():
+            student = Student(student_id, s["name"], _intern(s.get("program")), s.get("semester"))
+            self.students[student_id] = student
+            students_by_name.setdefault(normalize(s["name"]), []).append(student)
+        # Same name, several students: all of them, in file order
+        self.students_by_name = {name: tuple(students) for name, students in students_by_name.items()}
+        self._student_keys = tuple((normalize(s.name), s) for s in self.students.values())
+        self._sorted_student_names = sorted(self.students_by_name)
+
+        # Modules in the order the server's grade scan meets them; the first
+        # grade decides the professor, like get_professor_for_module
+        self.modules = {}
+        self.grades = {}
+        # Every module a professor graded in (query_academic_data), first-seen order
+        modules_by_professor = {}
+        for student_id, grades in db.get("grades", {}).items():
+            records = []
+            for g in grades:
+                module = self.modules.get(g["module_id"])
+                if module is None:
+                    module = self.modules[g["module_id"]] = Module(g["module_id"], g["module"], g.get("prof_id"))
+                prof_id = _intern(g.get("prof_id"))
+                modules_by_professor.setdefault(prof_id, {})[module.id] = module
+                records.append(Grade(module, g.get("grade"), g.get("credits"), prof_id,
+                                     _intern(g.get("status")), _intern(g.get("semester"))))
+            self.grades[student_id] = tuple(records)
+        self.modules_by_professor = {prof_id: tuple(modules.values()) for prof_id, modules in modules_by_professor.items()}
+        self.module_by_name = {}
+        for module in self.modules.values():
+            self.module_by_name.setdefault(normalize(module.name), module)
+        self._module_keys = tuple((normalize(m.name), m) for m in self.modules.values())
+
+        self.schedule = {}
+        for course, lectures in db.get("schedule", {}).items():
+            self.schedule.setdefault(normalize(course), (course, tuple(
+                Lecture(_intern(l.get("day")), _intern(l.get("time")), _intern(l.get("room")), _intern(l.get("lecture")),
+                        _intern(l.get("prof_id")), _intern(l.get("type")))
+                for l in lectures)))
+        # Course records are only read whole (query_academic_data), keep them as they are
+        self.courses = dict(db.get("courses", {}))
+        self._course_keys = tuple((normalize(key), key) for key in self.courses)
+        self._name_indexes = {}
+        self._index_lock = threading.Lock()
+
+    @classmethod
+    def from_file(cls, path=DB_JSON_PATH):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    # --- Students ---
+
+    def student(self, student_id):
+        return self.students.get(student_id)
+
+    def students_named(self, name):
+        return self.students_by_name.get(normalize(name), ())
+
+    def students_with_prefix(self, prefix, limit=20):
+        """Students whose normalized name starts with `prefix`, alphabetically (O(log n + k))."""
+        prefix = normalize(prefix)
+        names = self._sorted_student_names
+        found = []
+        for i in range(bisect.bisect_left(names, prefix), len(names)):
+            if not names[i].startswith(prefix) or len(found) >= limit:
+                break
+            found.extend(self.students_by_name[names[i]])
+        return found[:limit]
+
+    def find_student(self, query):
+        """findStudentId(): direct ID, exact normalized name, then first substring match."""
+        q = normalize(query)
+        if q in self.students:
+            return self.students[q]
+        exact = self.students_by_name.get(q)
+        if exact:
+            return exact[0]
+        return next((student for key, student in self._student_keys if q in key), None)
+
+    def grades_for(self, student_id):
+        return self.grades.get(student_id, ())
+
+    # --- Professors ---
+
+    def professor(self, prof_id):
+        return self.professors.get(prof_id)
+
+    def find_professor(self, query):
+        """findProfessorId(): exact full or last name, else the first professor whose name contains the query."""
+        q = normalize(query)
+        prof = self.professor_by_name.get(q) or self.professor_by_last_name.get(q)
+        return prof or next((p for key, p in self._professor_keys if q in key), None)
+
+    def modules_taught_by(self, prof_id):
+        return self.modules_by_professor.get(prof_id, ())
+
+    # --- Modules ---
+
+    def find_module(self, query):
+        """findModule(): exact normalized name, else the first module whose name contains the query."""
+        q = normalize(query)
+        return self.module_by_name.get(q) or next((m for key, m in self._module_keys if q in key), None)
+
+    def professor_for_module(self, query):
+        """(Module, Professor or None) for get_professor_for_module, or None if no module matches."""
+        module = self.find_module(query)
+        if module is None:
+            return None
+        return module, self.professors.get(module.prof_id)
+
+    # --- Schedule ---
+
+    def schedule_for(self, course_name):
+        """(course key, lectures) for get_schedule's exact normalized match, or None."""
+        return self.schedule.get(normalize(course_name))
+
+    # --- Courses ---
+
+    def find_course(self, query):
+        """(key, course dict) for the first course whose key contains the query, or None."""
+        q = normalize(query)
+        return next(((key, self.courses[key]) for norm, key in self._course_keys if q in norm), None)
+
+    def query_academic_data(self, student_name=None, professor_name=None, course_name=None):
+        return query_academic_data(self, student_name, professor_name, course_name)
+
+    # --- Ranked fuzzy search ---
+
+    def _name_index(self, kind):
+        with self._index_lock:
+            index = self._name_indexes.get(kind)
+            if index is None:
+                if kind == "students":
+                    pairs = ((s.name, s) for s in self.students.values())
+                elif kind == "professors":
+                    pairs = ((p.name, p) for p in self.professors.values())
+                else:
+                    pairs = ((m.name, m) for m in self.modules.values())
+                index = self._name_indexes[kind] = NameIndex(pairs)
+            return index
+
+    def search_students(self, query, limit=5):
+        """[(score, Student)], best first; every student of an equally named group is listed."""
+        return self._name_index("students").search(query, limit)
+
+    def search_professors(self, query, limit=5):
+        return self._name_index("professors").search(query, limit)
+
+    def search_modules(self, query, limit=5):
+        return self._name_index("modules").search(query, limit)
+
+    def stats(self):
+        return {"students": len(self.students), "professors": len(self.professors), "modules": len(self.modules),
+                "grades": sum(len(g) for g in self.grades.values()), "courses": len(self.schedule)}
+
+
+def query_academic_data(store, student_name=None, professor_name=None, course_name=None):
+    """The query_academic_data tool on any store (AcademicStore or SqliteAcademicStore).
+
+    Returns the tool's {"queryDescription", "results"} payload, or a
+    "... not found." string like the server.
+    """
+    student = store.find_student(student_name) if student_name else None
+    prof = store.find_professor(professor_name) if professor_name else None
+    if student_name and student is None:
+        return f"Student '{student_name}' not found."
+    if professor_name and prof is None:
+        return f"Professor '{professor_name}' not found."
+
+    description, results = "Query Results", []
+    if student is not None:
+        description = f"Results for student: {student.name}"
+        grades = store.grades_for(student.id)
+        if prof is not None:
+            description += f" and professor: {prof.name}"
+            grades = [g for g in grades if g.prof_id == prof.id]
+        for g in grades:
+            teacher = store.professor(g.prof_id)
+            results.append({**g.as_dict(), "professor_name": teacher.name if teacher else None})
+    elif prof is not None:
+        description = f"Courses taught by professor: {prof.name}"
+        results = list(dict.fromkeys(m.name for m in store.modules_taught_by(prof.id)))
+    elif course_name:
+        description = f"Information for course: {course_name}"
+        found = store.find_course(course_name)
+        if found:
+            results = [found[1]]
+    return {"queryDescription": description, "results": results}
+
+
+_store = None
+_store_mtime = None
+_lock = threading.Lock()
+
+
+def get_academic_store(path=DB_JSON_PATH):
+    # Rebuilt when db.json changes, like the local router's entity tables
+    global _store, _store_mtime
+    with _lock:
+        mtime = os.stat(path).st_mtime_ns
+        if _store is None or mtime != _store_mtime:
+            _store, _store_mtime = AcademicStore.from_file(path), mtime
+        return _store
@@ -0,0 +1,71 @@
+import asyncio
+import atexit
+import threading
+
+
+class AsyncRuntime:
+    """A single asyncio loop running on a daemon thread.
+
+    Streamlit reruns the script on a fresh thread for every interaction, so a
+    loop owned by the script thread cannot keep sessions, HTTP pools or caches
+    alive. Coroutines are submitted to this loop instead and the script only
+    waits on the returned futures; several browser sessions share the loop
+    and make progress concurrently.
+    """
+
+    def __init__(self, name="mcp-async-runtime"):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run_loop, name=name, daemon=True)
+        self._thread.start()
+        self._closed = False
+        atexit.register(self.shutdown)
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def submit(self, coro):
+        """Schedules `coro` on the runtime loop and returns a concurrent.futures.Future."""
+        if self._closed:
+            raise RuntimeError("Async runtime is shut down.")
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro, timeout=None):
+        """Blocks the calling thread until `coro` is done and returns its result."""
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except BaseException:
+            # Streamlit stops a rerun by raising into the script thread;
+            # don't leave the coroutine running for nobody.
+            future.cancel()
+            raise
+
+    def iterate(self, async_gen):
+        """Sync generator over an async generator, one item per round trip."""
+        try:
+            while True:
+                try:
+                    yield self.run(async_gen.__anext__())
+                except StopAsyncIteration:
+                    return
+        finally:
+            if not self._closed:
+                self.submit(async_gen.aclose())
+
+    async def _close_resources(self):
+        from mcp_pool import close_session_pools
+        from llm_client import close_llm_clients
+        await close_session_pools()
+        await close_llm_clients()
+
+    def shutdown(self, timeout=5):
+        if self._closed:
+            return
+        try:
+            self.run(self._close_resources(), timeout)
+        except Exception:
+            pass
+        self._closed = True
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout)
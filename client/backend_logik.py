@@ -1,123 +1,260 @@
 import json
 import asyncio
-import httpx
 import google.generativeai as genai
-from mcp import ClientSession
-from mcp.client.sse import sse_client
 
 from config import (
-    DEEPSEEK_API_KEY, DEEPSEEK_BASE_URL, USE_DEEPSEEK, 
-    GOOGLE_API_KEY, GEMINI_MODEL, MCP_URL, REAL_DB_NEWS, 
+    DEEPSEEK_API_KEY, USE_DEEPSEEK, 
+    GOOGLE_API_KEY, GEMINI_MODEL, REAL_DB_NEWS, 
     DEEPSEEK_MODEL
 )
+from mcp_pool import get_session_pool
+from mcp_catalog import get_capability_catalog
+from llm_client import get_llm_client, stage_timeout
+from router_cache import get_router_cache
+from local_router import get_local_router
+from response_synthesis import choose_policy, render_locally
+from tracing import PipelineTrace, export_trace
+from result_cache import get_result_cache
 
 if not USE_DEEPSEEK and GOOGLE_API_KEY: 
     genai.configure(api_key=GOOGLE_API_KEY)
 
-async def call_deepseek_model(prompt_text: str, model_name: str, api_key: str):
+async def call_deepseek_model(prompt_text: str, model_name: str, api_key: str, stage: str = "default"):
     if not api_key: return "Error: DEEPSEEK_API_KEY not found."
     headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
     messages = [{"role": "user", "content": prompt_text}]
     payload = {"model": model_name, "messages": messages}
-    async with httpx.AsyncClient(base_url=DEEPSEEK_BASE_URL) as client:
-        response = await client.post("https://api.deepseek.com/chat/completions", headers=headers, json=payload, timeout=60.0)
-        if response.status_code != 200: return f"Error {response.status_code}: {response.text}"
-        return response.json()["choices"][0]["message"]["content"]
+    client = get_llm_client()
+    response = await client.post("chat/completions", headers=headers, json=payload, timeout=stage_timeout(stage))
+    if response.status_code != 200: return f"Error {response.status_code}: {response.text}"
+    return response.json()["choices"][0]["message"]["content"]
 
-async def execute_mcp_pipeline(prompt_text, language="German"):
-    trace_steps = []
-    final_response = ""
+async def stream_deepseek_model(prompt_text: str, model_name: str, api_key: str, stage: str = "default"):
+    if not api_key:
+        yield "Error: DEEPSEEK_API_KEY not found."
+        return
+    headers = {"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"}
+    messages = [{"role": "user", "content": prompt_text}]
+    payload = {"model": model_name, "messages": messages, "stream": True}
+    client = get_llm_client()
+    async with client.stream("POST", "chat/completions", headers=headers, json=payload, timeout=stage_timeout(stage)) as response:
+        if response.status_code != 200:
+            yield f"Error {response.status_code}: {(await response.aread()).decode('utf-8', 'replace')}"
+            return
+        # OpenAI-style SSE: "data: {...}" lines, terminated by "data: [DONE]"
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"): continue
+            data = line[5:].strip()
+            if data == "[DONE]": break
+            delta = json.loads(data)["choices"][0].get("delta", {}).get("content")
+            if delta: yield delta
+
+async def call_llm(prompt_text, stage="default"):
+    if USE_DEEPSEEK: return await call_deepseek_model(prompt_text, DEEPSEEK_MODEL, DEEPSEEK_API_KEY, stage=stage)
+    model = genai.GenerativeModel(GEMINI_MODEL)
+    return (await model.generate_content_async(prompt_text)).text
+
+async def stream_llm(prompt_text, stage="default"):
+    if USE_DEEPSEEK:
+        async for chunk in stream_deepseek_model(prompt_text, DEEPSEEK_MODEL, DEEPSEEK_API_KEY, stage=stage):
+            yield chunk
+    else:
+        model = genai.GenerativeModel(GEMINI_MODEL)
+        async for chunk in await model.generate_content_async(prompt_text, stream=True):
+            if chunk.text: yield chunk.text
+
+def _trace_event(step, span=None):
+    if span is not None: step["timing"] = span.as_dict()
+    return {"type": "step", "data": step}
+
+async def stream_mcp_pipeline(prompt_text, language="German", stream_final=True):
+    # Yields {"type": "step", "data": trace_step} while the pipeline runs and
+    # {"type": "token", "text": ...} chunks of the final answer at the end.
+    # The last step is a waterfall of all timed stages.
+    trace = PipelineTrace(language=language)
+    async for event in _pipeline_events(prompt_text, language, stream_final, trace):
+        yield event
+    yield _trace_event({
+        "step": 6, "icon": "⏱️", "title": "Zeitachse (Wasserfall)",
+        "simple_desc": f"Die Anfrage hat insgesamt {trace.total_ms():.0f} ms gedauert. So verteilt sich die Zeit auf die einzelnen Stufen.",
+        "visual_type": "waterfall", "data": trace.waterfall()
+    })
+    export_trace(trace)
+
+async def _pipeline_events(prompt_text, language, stream_final, trace):
     try:
-        async with sse_client(MCP_URL) as streams:
-            async with ClientSession(streams[0], streams[1]) as session:
-                await session.initialize()
-                trace_steps.append({
-                    "step": 1, "icon": "🔌", "title": "Verbindung & Handshake",
-                    "simple_desc": "Der Client (Chatbot) verbindet sich via SSE-Protokoll mit dem DHBW-Enterprise Server.",
-                    "visual_type": "status", "data": {"status": "Connected", "protocol": "JSON-RPC 2.0"}
-                })
-                
-                tool_response = await session.list_tools()
-                tools_list = [{"Tool Name": t.name, "Funktion": t.description[:60]+"..."} for t in tool_response.tools]
-                
-                trace_steps.append({
-                    "step": 2, "icon": "🧰", "title": "Discovery (Werkzeug-Erkennung)",
-                    "simple_desc": f"Der Server meldet {len(tool_response.tools)} verfügbare Fähigkeiten.",
-                    "visual_type": "table", "data": tools_list, "raw_data": tool_response.tools
-                })
-                
-                tools_for_prompt = [{"name": t.name, "description": t.description, "input_schema": t.inputSchema} for t in tool_response.tools]
-                
-                router_prompt = f"""
-                You are the DHBW System Router. Language: {language}.
-                Query: "{prompt_text}"
-                TOOLS: {json.dumps(tools_for_prompt, indent=2)}
-                RESOURCES: 
-                - dhbw://syllabus/{{module_key}} (e.g. 'intsem', 'webeng', 'cloud', 'datasci' based on db.json)
-                - dhbw://news/{{news_id}}
+        pool = get_session_pool()
+        reused = bool(pool.sessions)
+        known_sessions = set(pool.sessions)
+        with trace.span("mcp.connect", reused=reused) as span:
+            await pool.start()
+        # Freshly opened sessions know how long SSE connect and initialize took
+        for pooled in pool.sessions:
+            if pooled not in known_sessions and pooled.initialized_ns:
+                trace.add_span("mcp.sse_connect", pooled.opened_ns, pooled.connected_ns)
+                trace.add_span("mcp.initialize", pooled.connected_ns, pooled.initialized_ns)
+        yield _trace_event({
+            "step": 1, "icon": "🔌", "title": "Verbindung & Handshake",
+            "simple_desc": "Der Client (Chatbot) nutzt eine bestehende SSE-Verbindung aus dem Session-Pool." if reused
+                else "Der Client (Chatbot) verbindet sich via SSE-Protokoll mit dem DHBW-Enterprise Server.",
+            "visual_type": "status", "data": {"status": "Connected", "protocol": "JSON-RPC 2.0", "reused_session": reused, "pool": pool.snapshot()}
+        }, span)
+        
+        catalog = get_capability_catalog()
+        with trace.span("mcp.list_tools") as span:
+            misses_before = catalog.stats["misses"]
+            tools = await catalog.tools()
+            tools_prompt = await catalog.tools_prompt()
+            from_cache = catalog.stats["misses"] == misses_before
+            span.add_bytes(tools_prompt)
+            span.set(cache_hit=from_cache)
+        tools_list = [{"Tool Name": t.name, "Funktion": t.description[:60]+"..."} for t in tools]
+        
+        yield _trace_event({
+            "step": 2, "icon": "🧰", "title": "Discovery (Werkzeug-Erkennung)",
+            "simple_desc": f"Der Server meldet {len(tools)} verfügbare Fähigkeiten." + (" (aus dem Katalog-Cache)" if from_cache else ""),
+            "visual_type": "table", "data": tools_list, "raw_data": tools,
+            "cache": {"hit": from_cache, **catalog.snapshot()}
+        }, span)
+        
+        router_prompt = f"""
+        You are the DHBW System Router. Language: {language}.
+        Query: "{prompt_text}"
+        TOOLS: {tools_prompt}
+        RESOURCES: 
+        - dhbw://syllabus/{{module_key}} (e.g. 'intsem', 'webeng', 'cloud', 'datasci' based on db.json)
+        - dhbw://news/{{news_id}}
+        
+        OUTPUT JSON ONLY: {{ "action": "tool|resource|chat", "name|uri": "...", "reasoning": "...", "args": {{...}} }}
+        """
+        
+        # Cheapest first: local rules, then the decision cache, then the LLM
+        local_router = get_local_router()
+        router_cache = get_router_cache()
+        with trace.span("router") as span:
+            decision = local_router.route(prompt_text, {t.name for t in tools})
+            router_source = "local" if decision is not None else None
+            if decision is None:
+                catalog_version = await catalog.version()
+                decision = router_cache.get(prompt_text, language, catalog_version)
+                router_source = "cache" if decision is not None else "llm"
+            if decision is None:
+                raw_response = await call_llm(router_prompt, stage="router")
+                span.add_bytes(router_prompt)
+                span.add_bytes(raw_response)
                 
-                OUTPUT JSON ONLY: {{ "action": "tool|resource|chat", "name|uri": "...", "reasoning": "...", "args": {{...}} }}
-                """
-                
-                if USE_DEEPSEEK: raw_response = await call_deepseek_model(router_prompt, DEEPSEEK_MODEL, DEEPSEEK_API_KEY)
-                else: 
-                    model = genai.GenerativeModel(GEMINI_MODEL)
-                    raw_response = (await model.generate_content_async(router_prompt)).text
-                
-                try: decision = json.loads(raw_response.replace("```json","").replace("```", "").strip())
+                try:
+                    decision = json.loads(raw_response.replace("```json","").replace("```", "").strip())
+                    router_cache.put(prompt_text, language, catalog_version, decision)
                 except: decision = {"action": "chat", "response": raw_response}
-                
-                trace_steps.append({
-                    "step": 3, "icon": "🧠", "title": "Router (LLM Entscheidung)",
-                    "simple_desc": f"Das KI-Modell analysiert Ihre Absicht. Es entscheidet sich für die Aktion **'{decision.get('action')}'**.",
-                    "visual_type": "decision", "data": decision
-                })
-                
-                execution_data = ""
-                if decision.get("action") == "resource":
-                    uri = decision.get("uri", decision.get("name", "N/A"))
-                    try:
-                        res = await session.read_resource(uri)
-                        execution_data = res.contents[0].text if res.contents else "Resource Empty."
-                        trace_steps.append({
-                            "step": 4, "icon": "📄", "title": "Resource Fetch",
-                            "simple_desc": f"Der Server lädt den Inhalt der Ressource '{uri}' aus der Datenbank.",
-                            "visual_type": "code", "data": execution_data
-                        })
-                    except Exception as e:
-                        execution_data = f"Error reading resource: {e}"
-                        trace_steps.append({"step": 4, "icon": "❌", "title": "Resource Error", "simple_desc": "Fehler beim Laden", "visual_type": "error", "data": str(e)})
+            if router_source != "local":
+                # LLM and cached decisions may carry a misspelled name the server would not find
+                decision = local_router.validate(decision)
+            span.set(source=router_source, corrected=bool(decision.get("corrected_args")))
+        
+        router_titles = {"llm": "Router (LLM Entscheidung)", "cache": "Router (Cache-Treffer)", "local": "Router (Lokale Regeln)"}
+        router_descs = {
+            "llm": f"Das KI-Modell analysiert Ihre Absicht. Es entscheidet sich für die Aktion **'{decision.get('action')}'**.",
+            "cache": f"Diese Anfrage wurde bereits geroutet. Die gespeicherte Entscheidung **'{decision.get('action')}'** wird ohne LLM-Aufruf wiederverwendet.",
+            "local": f"Die Anfrage passt eindeutig zu einem bekannten Muster. Der lokale Router wählt **'{decision.get('action')}'** ohne LLM-Aufruf.",
+        }
+        yield _trace_event({
+            "step": 3, "icon": "🧠", "title": router_titles[router_source],
+            "simple_desc": router_descs[router_source] + "".join(
+                f" Der Name '{c['from']}' wurde zu '{c['to']}' korrigiert." for c in decision.get("corrected_args", {}).values()),
+            "visual_type": "decision", "data": decision, "router": router_source,
+            "cache": {"hit": router_source == "cache", **router_cache.snapshot()},
+            "local_router": local_router.snapshot()
+        }, span)
+        
+        execution_data = ""
+        result_cache = get_result_cache()
+        if decision.get("action") == "resource":
+            uri = decision.get("uri", decision.get("name", "N/A"))
+            try:
+                with trace.span("mcp.read_resource", uri=uri) as span:
+                    res, result_cached = await result_cache.read_resource(pool, uri)
+                    execution_data = res.contents[0].text if res.contents else "Resource Empty."
+                    span.add_bytes(execution_data)
+                    span.set(cache_hit=result_cached)
+                yield _trace_event({
+                    "step": 4, "icon": "📄", "title": "Resource Fetch",
+                    "simple_desc": f"Der Server lädt den Inhalt der Ressource '{uri}' aus der Datenbank." if not result_cached
+                        else f"Der Inhalt der Ressource '{uri}' kommt aus dem Client-Cache (kein Server-Aufruf).",
+                    "visual_type": "code", "data": execution_data,
+                    "cache": {"hit": result_cached, **result_cache.snapshot()}
+                }, span)
+            except Exception as e:
+                execution_data = f"Error reading resource: {e}"
+                yield _trace_event({"step": 4, "icon": "❌", "title": "Resource Error", "simple_desc": "Fehler beim Laden", "visual_type": "error", "data": str(e)})
 
-                elif decision.get("action") == "tool":
-                    tool_name = decision.get("name", "N/A")
-                    args = decision.get("args", {})
-                    try:
-                        res = await session.call_tool(tool_name, args)
-                        execution_data = res.content[0].text if res.content else "No output."
-                        trace_steps.append({
-                            "step": 4, "icon": "⚡", "title": "Ausführung (Backend)",
-                            "simple_desc": f"Der Server führt den Python-Code für '{tool_name}' aus.",
-                            "visual_type": "code", "data": execution_data
-                        })
-                    except Exception as e: execution_data = f"Error: {e}"
-                
-                elif decision.get("action") == "chat":
-                    execution_data = decision.get("response", "")
-                    trace_steps.append({
-                        "step": 4, "icon": "💬", "title": "Direkte Antwort",
-                        "simple_desc": "Keine Datenbank-Abfrage notwendig.",
-                        "visual_type": "text", "data": execution_data
-                    })
-                
-                final_prompt = f"""Role: University Assistant. Lang: {language}. User: "{prompt_text}". Data: {execution_data}. Task: Answer nicely and professionally. Use Markdown."""
-                if USE_DEEPSEEK: final_response = await call_deepseek_model(final_prompt, DEEPSEEK_MODEL, DEEPSEEK_API_KEY)
-                else: 
-                    model = genai.GenerativeModel(GEMINI_MODEL)
-                    final_response = (await model.generate_content_async(final_prompt)).text
+        elif decision.get("action") == "tool":
+            tool_name = decision.get("name", "N/A")
+            args = decision.get("args", {})
+            try:
+                with trace.span("mcp.call_tool", tool=tool_name) as span:
+                    res, result_cached = await result_cache.call_tool(pool, tool_name, args)
+                    execution_data = res.content[0].text if res.content else "No output."
+                    span.add_bytes(execution_data)
+                    span.set(cache_hit=result_cached)
+                yield _trace_event({
+                    "step": 4, "icon": "⚡", "title": "Ausführung (Backend)",
+                    "simple_desc": f"Der Server führt den Python-Code für '{tool_name}' aus." if not result_cached
+                        else f"Das Ergebnis von '{tool_name}' mit diesen Argumenten kommt aus dem Client-Cache (kein Server-Aufruf).",
+                    "visual_type": "code", "data": execution_data,
+                    "cache": {"hit": result_cached, **result_cache.snapshot()}
+                }, span)
+            except Exception as e:
+                execution_data = f"Error: {e}"
+                yield _trace_event({"step": 4, "icon": "❌", "title": "Tool Error", "simple_desc": f"Fehler beim Ausführen von '{tool_name}'", "visual_type": "error", "data": str(e)})
+        
+        elif decision.get("action") == "chat":
+            execution_data = decision.get("response", "")
+            yield _trace_event({
+                "step": 4, "icon": "💬", "title": "Direkte Antwort",
+                "simple_desc": "Keine Datenbank-Abfrage notwendig.",
+                "visual_type": "text", "data": execution_data
+            })
+        
+        with trace.span("synthesis") as span:
+            policy = choose_policy(decision)
+            local_answer = render_locally(policy, decision, execution_data, language)
+            span.add_bytes(local_answer)
+            span.set(policy=policy, llm_call=local_answer is None)
+        yield _trace_event({
+            "step": 5, "icon": "✍️", "title": "Antwort-Synthese",
+            "simple_desc": "Die Server-Antwort ist bereits darstellbar und wird ohne zweiten LLM-Aufruf angezeigt." if local_answer is not None
+                else "Das KI-Modell formuliert aus den Daten eine Antwort.",
+            "visual_type": "status", "data": {"policy": policy, "llm_call": local_answer is None}
+        }, span)
+        if local_answer is not None:
+            yield {"type": "token", "text": local_answer}
+            return
+
+        final_prompt = f"""Role: University Assistant. Lang: {language}. User: "{prompt_text}". Data: {execution_data}. Task: Answer nicely and professionally. Use Markdown."""
+        # Streaming: the span includes the time the consumer spends rendering each chunk
+        with trace.span("llm.final", stream=stream_final) as span:
+            span.add_bytes(final_prompt)
+            if stream_final:
+                async for chunk in stream_llm(final_prompt, stage="final"):
+                    if "ttft_ms" not in span.attributes: span.set(ttft_ms=round(span.duration_ms, 3))
+                    span.add_bytes(chunk)
+                    yield {"type": "token", "text": chunk}
+            else:
+                final_response = await call_llm(final_prompt, stage="final")
+                span.add_bytes(final_response)
+        if not stream_final: yield {"type": "token", "text": final_response}
     except Exception as e:
-        trace_steps.append({"step": 0, "title": "Fehler", "simple_desc": "Systemfehler", "visual_type": "error", "data": str(e)})
-        final_response = "Es ist ein Fehler aufgetreten."
-    return trace_steps, final_response
+        yield _trace_event({"step": 0, "title": "Fehler", "simple_desc": "Systemfehler", "visual_type": "error", "data": str(e)})
+        yield {"type": "token", "text": "Es ist ein Fehler aufgetreten."}
+
+async def execute_mcp_pipeline(prompt_text, language="German"):
+    trace_steps = []
+    chunks = []
+    async for event in stream_mcp_pipeline(prompt_text, language, stream_final=False):
+        if event["type"] == "step": trace_steps.append(event["data"])
+        else: chunks.append(event["text"])
+    return trace_steps, "".join(chunks)
 
 async def simulate_news_pipeline(query):
     await asyncio.sleep(1.5)
@@ -166,43 +303,38 @@ async def simulate_news_pipeline(query):
 
 async def verify_real_server_has_tool():
     try:
-        async with sse_client(MCP_URL) as streams:
-            async with ClientSession(streams[0], streams[1]) as session:
-                await session.initialize()
-                response = await session.list_tools()
-                tool_names = [t.name for t in response.tools]
-                
-                if "get_university_news" in tool_names:
-                    return True, "Tool 'get_university_news' gefunden! Gute Arbeit."
-                else:
-                    return False, f"Tool nicht gefunden. Gefundene Tools: {', '.join(tool_names)}"
+        # Students restart the server to add the tool, so never trust the cache here
+        tools = await get_capability_catalog().tools(refresh=True)
+        tool_names = [t.name for t in tools]
+        
+        if "get_university_news" in tool_names:
+            return True, "Tool 'get_university_news' gefunden! Gute Arbeit."
+        else:
+            return False, f"Tool nicht gefunden. Gefundene Tools: {', '.join(tool_names)}"
     except Exception as e:
         return False, f"Verbindung fehlgeschlagen: {str(e)}. Läuft der Server?"
     
 # --- NEW: RESOURCE VERIFICATION (FIXED) ---
 async def verify_real_server_has_resource(resource_pattern):
     try:
-        async with sse_client(MCP_URL) as streams:
-            async with ClientSession(streams[0], streams[1]) as session:
-                await session.initialize()
-                response = await session.list_resources()
-                
-                # FIX: Explicitly convert AnyUrl to string to prevent TaskGroup errors
-                found = False
-                uris = []
-                for res in response.resources:
-                    # Convert AnyUrl object to string for comparison
-                    uri_str = str(res.uri)
-                    uris.append(uri_str)
-                    if resource_pattern in uri_str:
-                        found = True
-                        break
-                
-                if found:
-                    return True, f"Resource mit Pattern '{resource_pattern}' gefunden!"
-                else:
-                    short_uris = ", ".join(uris[:3]) + "..." if uris else "Keine"
-                    return False, f"Resource '{resource_pattern}' nicht gefunden. Verfügbar: {short_uris}"
+        resources = await get_capability_catalog().resources(refresh=True)
+        
+        # FIX: Explicitly convert AnyUrl to string to prevent TaskGroup errors
+        found = False
+        uris = []
+        for res in resources:
+            # Convert AnyUrl object to string for comparison
+            uri_str = str(res.uri)
+            uris.append(uri_str)
+            if resource_pattern in uri_str:
+                found = True
+                break
+        
+        if found:
+            return True, f"Resource mit Pattern '{resource_pattern}' gefunden!"
+        else:
+            short_uris = ", ".join(uris[:3]) + "..." if uris else "Keine"
+            return False, f"Resource '{resource_pattern}' nicht gefunden. Verfügbar: {short_uris}"
     except Exception as e:
         # Catch and simplify TaskGroup errors
         msg = str(e)
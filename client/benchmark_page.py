@@ -2,6 +2,38 @@ import streamlit as st
 import json
 import os
 
+def show_scaling_results(results_path):
+    if not os.path.exists(results_path):
+        st.warning(f"File `{os.path.basename(results_path)}` not found.")
+        st.info("💡 Run the scaling benchmark first:\n\n`python -m mcp_bench scale --sizes 1000 10000 100000`")
+        return
+    with open(results_path, "r") as f:
+        results = json.load(f)
+
+    st.info(f"**Last Scaling Run:** {results.get('last_run_utc', 'N/A')} · Server: `{results.get('server', 'N/A')}`")
+    points = [p for p in results.get("points", []) if "probes" in p]
+    for failed in (p for p in results.get("points", []) if "error" in p):
+        st.error(f"{failed['students']:,} students: {failed['error']}")
+    if not points:
+        return
+
+    students = [p["students"] for p in points]
+    st.header("⏱️ p50 Latency vs. Students")
+    latency_chart = {"students": students}
+    for label in points[0]["probes"]:
+        latency_chart[label] = [p["probes"][label]["p50_ms"] for p in points]
+    st.line_chart(latency_chart, x="students")
+
+    st.header("💾 Server Memory vs. Students")
+    st.line_chart({"students": students, "RSS idle (MB)": [p.get("rss_idle_mb") for p in points],
+                   "RSS after probes (MB)": [p.get("rss_after_mb") for p in points]}, x="students")
+
+    st.header("📐 Growth Exponents")
+    st.caption("Slope of log(latency) over log(students): ~0 = constant, ~1 = linear scan.")
+    st.dataframe([{"Metric": name, "k": k} for name, k in results.get("growth_exponents", {}).items()],
+                 use_container_width=True)
+
+
 def show_benchmark_results():
     st.title("📊 Benchmark Results")
 
@@ -10,17 +42,23 @@ def show_benchmark_results():
     root_dir = os.path.join(script_dir, "..")
 
     # UI for selecting benchmark type
-    benchmark_type = st.selectbox("Select Benchmark Type", ["SSE", "stdio"])
+    benchmark_type = st.selectbox("Select Benchmark Type", ["SSE", "stdio", "Streamable HTTP", "Data Scaling"])
+
+    if benchmark_type == "Data Scaling":
+        show_scaling_results(os.path.join(root_dir, "benchmark_results_scale.json"))
+        return
 
     if benchmark_type == "SSE":
         results_path = os.path.join(root_dir, "benchmark_results.json")
-    else:
+    elif benchmark_type == "stdio":
         results_path = os.path.join(root_dir, "benchmark_results_stdio.json")
+    else:
+        results_path = os.path.join(root_dir, "benchmark_results_streamable_http.json")
 
     # Check if file exists
     if not os.path.exists(results_path):
         st.warning(f"File `{os.path.basename(results_path)}` not found.")
-        st.info("💡 Please run the benchmark script in your terminal first:\n\n`python benchmark.py` (for SSE) or `python benchmark_stdio.py` (for Stdio)")
+        st.info("💡 Please run the benchmark script in your terminal first:\n\n`python benchmark.py` (for SSE), `python benchmark_stdio.py` (for Stdio) or `python -m mcp_bench --transport streamable-http`")
         return
 
     # Load Data
@@ -34,21 +72,43 @@ def show_benchmark_results():
     # --- RENDER METADATA ---
     st.info(f"**Last Benchmark Run:** {results.get('last_run_utc', 'N/A')} ({results.get('type', 'N/A').upper()})")
 
+    if "workload" in results:
+        st.caption(f"Workload: `{results['workload']['name']}` · Target: `{results['transport']['target']}` · Load model: {results['load_model']['mode']}")
+
     # --- RENDER TOOLS TABLE ---
     st.header("🛠️ Tool Benchmarks")
     
     col1, col2 = st.columns(2)
     col1.metric("Overall Avg Latency (Tools)", f"{results.get('overall_avg_latency_tools', 0):.2f} ms")
+    # Percentiles only exist in results written by the histogram-based benchmark
+    if "overall_latency_tools_ms" in results:
+        col2.metric("Overall p99 Latency (Tools)", f"{results['overall_latency_tools_ms']['p99_ms']:.2f} ms")
     
     tool_data = []
     for tool_name, tool_results in results.get("tools", {}).items():
-        tool_data.append({
+        row = {
             "Tool": tool_name,
             "Avg Latency (ms)": f"{tool_results['avg_latency']:.2f}",
             "Total Time (ms)": f"{tool_results['total_time']:.2f}",
             "Success": tool_results['successes'],
             "Errors": tool_results['errors']
-        })
+        }
+        latency = tool_results.get("latency_ms")
+        if latency:
+            row.update({
+                "p50 (ms)": f"{latency['p50_ms']:.2f}",
+                "p90 (ms)": f"{latency['p90_ms']:.2f}",
+                "p99 (ms)": f"{latency['p99_ms']:.2f}",
+                "p99.9 (ms)": f"{latency['p999_ms']:.2f}",
+                "Max (ms)": f"{latency['max_ms']:.2f}",
+                "Throughput (req/s)": f"{tool_results['throughput_rps']:.1f}"
+            })
+        if "client_cpu_ms_per_request" in tool_results:
+            row["Client CPU (ms/req)"] = f"{tool_results['client_cpu_ms_per_request']:.3f}"
+        if tool_results.get("mode") == "open-loop":
+            row["Target (req/s)"] = f"{tool_results['target_rps']:.1f}"
+            row["Service p99 (ms)"] = f"{tool_results['service_time_ms']['p99_ms']:.2f}"
+        tool_data.append(row)
     
     if tool_data:
         st.dataframe(tool_data, use_container_width=True)
@@ -60,17 +120,41 @@ def show_benchmark_results():
     
     if results.get('resources'):
         col1.metric("Overall Avg Latency (Resources)", f"{results.get('overall_avg_latency_resources', 0):.2f} ms")
+        if "resources_list_latency_ms" in results:
+            col2.metric("resources/list Latency", f"{results['resources_list_latency_ms']:.2f} ms")
         
         resource_data = []
         for resource_name, resource_results in results.get("resources", {}).items():
-            resource_data.append({
-                "Resource": resource_name,
-                "List Latency (ms)": f"{resource_results['list_latency_ms']:.2f}",
+            row = {"Resource": resource_name}
+            if "list_latency_ms" in resource_results:
+                # Older results files repeat the list latency per family
+                row["List Latency (ms)"] = f"{resource_results['list_latency_ms']:.2f}"
+            row.update({
                 "List Items": resource_results['list_item_count'],
                 "Read Avg Latency (ms)": f"{resource_results['read_avg_latency_ms']:.2f}"
             })
+            reads = resource_results.get("reads")
+            if reads:
+                row.update({
+                    "Read p50 (ms)": f"{reads['latency_ms']['p50_ms']:.2f}",
+                    "Read p99 (ms)": f"{reads['latency_ms']['p99_ms']:.2f}",
+                    "Reads/s": f"{reads['throughput_rps']:.1f}",
+                    "Bytes/Read": f"{resource_results['bytes']['mean']:.0f}",
+                    "Errors": reads['errors']
+                })
+            resource_data.append(row)
         
         if resource_data:
             st.dataframe(resource_data, use_container_width=True)
     else:
-        st.info("Resource benchmarking is not applicable (or no data found) for this run.")
\ No newline at end of file
+        st.info("Resource benchmarking is not applicable (or no data found) for this run.")
+
+    # --- RENDER CONCURRENCY SWEEP ---
+    if results.get("sweep"):
+        st.header("📈 Concurrency Sweep")
+        sweep_tool = st.selectbox("Tool", list(results["sweep"].keys()))
+        sweep = results["sweep"][sweep_tool]
+        st.caption(f"Throughput stops scaling at concurrency **{sweep['knee_concurrency']}** (knee).")
+        chart = {key: [point[key] for point in sweep["points"]] for key in ("throughput_rps", "p50_ms", "p99_ms")}
+        st.line_chart(chart, x="throughput_rps", y=["p50_ms", "p99_ms"])
+        st.dataframe(sweep["points"], use_container_width=True)
\ No newline at end of file
@@ -15,11 +15,82 @@ GEMINI_MODEL = 'gemini-2.0-flash'
 
 DEEPSEEK_API_KEY = os.getenv("DEEPSEEK_API_KEY")
 DEEPSEEK_MODEL = "deepseek-chat"
-DEEPSEEK_BASE_URL = "https://api.deepseek.com/v1"
+DEEPSEEK_BASE_URL = os.getenv("DEEPSEEK_BASE_URL", "https://api.deepseek.com/v1")
 
-MCP_URL = "http://localhost:3000/sse"
+# LLM HTTP Client (one keep-alive pool per process, see llm_client.py)
+LLM_HTTP2 = os.getenv("LLM_HTTP2", "1") == "1"
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+LLM_MAX_KEEPALIVE = int(os.getenv("LLM_MAX_KEEPALIVE", "10"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_STAGE_TIMEOUTS = {
+    "router": float(os.getenv("LLM_ROUTER_TIMEOUT", "30")),
+    "final": float(os.getenv("LLM_FINAL_TIMEOUT", "60")),
+    "default": 60.0,
+}
+
+MCP_URL = os.getenv("MCP_URL", "http://localhost:3000/sse")
+DB_JSON_PATH = os.getenv("DB_JSON_PATH", os.path.abspath(os.path.join(script_dir, "..", "src", "db.json")))
+# Client-side data backend: "json" (db.json in memory) or "sqlite" (import with client/sqlite_store.py;
+# falls back to JSON while the SQLite file is missing or older than db.json)
+DATA_BACKEND = os.getenv("DATA_BACKEND", "json")
+DB_SQLITE_PATH = os.getenv("DB_SQLITE_PATH", os.path.abspath(os.path.join(script_dir, "..", "src", "db.sqlite")))
 USE_DEEPSEEK = True 
 
+# MCP Session Pool (shared by the chat pipeline and the exercise checks)
+MCP_POOL_MIN_SESSIONS = int(os.getenv("MCP_POOL_MIN_SESSIONS", "1"))
+# src/index.ts keeps a single global SSE transport, so a second session would
+# replace the first one on the server. Raise only for servers with per-session transports.
+MCP_POOL_MAX_SESSIONS = int(os.getenv("MCP_POOL_MAX_SESSIONS", "1"))
+MCP_SESSION_MAX_IN_FLIGHT = int(os.getenv("MCP_SESSION_MAX_IN_FLIGHT", "8"))
+MCP_HEALTHCHECK_INTERVAL = float(os.getenv("MCP_HEALTHCHECK_INTERVAL", "30"))
+MCP_REQUEST_TIMEOUT = float(os.getenv("MCP_REQUEST_TIMEOUT", "10"))
+
+# Capability Catalog (list_changed notifications invalidate earlier, TTL is the fallback)
+CATALOG_TTL_SECONDS = float(os.getenv("CATALOG_TTL_SECONDS", "300"))
+
+# Router Decision Cache (set ROUTER_CACHE_PATH to keep decisions across restarts)
+ROUTER_CACHE_MAX_ENTRIES = int(os.getenv("ROUTER_CACHE_MAX_ENTRIES", "512"))
+ROUTER_CACHE_TTL_SECONDS = float(os.getenv("ROUTER_CACHE_TTL_SECONDS", "3600"))
+ROUTER_CACHE_PATH = os.getenv("ROUTER_CACHE_PATH") or None
+
+# Local Fast-Path Router (decisions below this confidence go to the LLM router)
+LOCAL_ROUTER_MIN_CONFIDENCE = float(os.getenv("LOCAL_ROUTER_MIN_CONFIDENCE", "0.8"))
+# Fuzzy name matches (typos, Müller/Mueller) need this score and this lead over the runner-up
+LOCAL_ROUTER_FUZZY_MIN_SCORE = float(os.getenv("LOCAL_ROUTER_FUZZY_MIN_SCORE", "0.85"))
+LOCAL_ROUTER_FUZZY_MARGIN = float(os.getenv("LOCAL_ROUTER_FUZZY_MARGIN", "0.1"))
+
+# Language of the server's own text (src/index.ts); it is only shown unchanged in this language
+MCP_OUTPUT_LANGUAGE = os.getenv("MCP_OUTPUT_LANGUAGE", "English")
+
+# Response Synthesis per tool / resource family: "passthrough", "template" or "llm"
+RESPONSE_SYNTHESIS_POLICY = {
+    "default": "llm",
+    "get_student_grades": "passthrough",
+    "get_all_professors": "template",
+    "get_events": "template",
+    "get_schedule": "template",
+    "get_professor_info": "template",
+    "get_professor_for_module": "template",
+    "syllabus": "passthrough",
+    "news": "template",
+    "publications": "template",
+}
+
+# Pipeline Tracing (set TRACE_EXPORT_PATH to append OpenTelemetry-style spans as JSONL)
+TRACE_EXPORT_PATH = os.getenv("TRACE_EXPORT_PATH") or None
+
+# Tool/Resource Result Cache (TTL in seconds per tool name or resource family, 0 = never cache)
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1024"))
+RESULT_CACHE_TTLS = {
+    "default": 60,
+    "get_all_professors": 600,
+    "get_events": 300,
+    "syllabus": 3600,
+    "publications": 3600,
+    "news": 300,
+}
+
 # Data Constants
 LEARNING_SCENARIOS = [
     "Zeige mir die Noten für Student s1001",
@@ -8,7 +8,7 @@ from backend_logik import (
     verify_real_server_has_resource, simulate_security_check, simulate_chaining_pipeline
 )
 from ui_components import render_learning_step
-from utils import get_or_create_eventloop
+from utils import run_async
 
 # === PHASE 1: INTRO ===
 def render_intro_phase():
@@ -106,8 +106,7 @@ def render_analysis_phase():
         loading_ph = st.empty()
         with loading_ph.container():
             st.info(f"🤖 **Analysiere Anfrage:** '{st.session_state.current_demo_query}'")
-            loop = get_or_create_eventloop()
-            trace, final = loop.run_until_complete(execute_mcp_pipeline(st.session_state.current_demo_query, "German"))
+            trace, final = run_async(execute_mcp_pipeline(st.session_state.current_demo_query, "German"))
             st.session_state.trace_data = trace
             st.session_state.final_res = final
             st.session_state.current_trace_type = "analysis"
@@ -221,8 +220,7 @@ def render_simulation_phase():
         loading_ph = st.empty()
         with loading_ph.container():
             st.info("🤖 **Simuliere Netzwerkverkehr...**")
-            loop = get_or_create_eventloop()
-            trace, final = loop.run_until_complete(simulate_news_pipeline("News?"))
+            trace, final = run_async(simulate_news_pipeline("News?"))
             st.session_state.trace_data = trace
             st.session_state.final_res = final
             st.session_state.current_trace_type = "simulation"
@@ -257,8 +255,7 @@ def render_exercise_phase():
 
     if st.button("Verifizieren: Läuft das News-Tool?", type="primary", use_container_width=True):
         with st.spinner("Prüfe Server..."):
-            loop = get_or_create_eventloop()
-            success, msg = loop.run_until_complete(verify_real_server_has_tool())
+            success, msg = run_async(verify_real_server_has_tool())
             
             if success:
                 st.session_state.ex1_solved = True
@@ -349,8 +346,7 @@ def render_resource_exercise():
 
     if st.button("Verifizieren: Gibt es die Mensa-Resource?", type="primary", use_container_width=True):
         with st.spinner("Scanne Server Resources..."):
-            loop = get_or_create_eventloop()
-            success, msg = loop.run_until_complete(verify_real_server_has_resource("mensa"))
+            success, msg = run_async(verify_real_server_has_resource("mensa"))
             
             if success:
                 st.session_state.ex2_solved = True
@@ -385,8 +381,7 @@ def render_security_phase():
     
     if st.button("🔥 Angriff starten (Simulation)", type="primary", use_container_width=True):
         with st.status("🚨 Intrusion Detection System active..."):
-            loop = get_or_create_eventloop()
-            trace, final = loop.run_until_complete(simulate_security_check(attack))
+            trace, final = run_async(simulate_security_check(attack))
             st.session_state.trace_data = trace
             st.session_state.final_res = final
     
@@ -425,8 +420,7 @@ def render_agent_intro():
     
     if st.button("🧠 Agent starten (Reasoning Loop)", type="primary", use_container_width=True):
         with st.status("Agent denkt nach..."):
-            loop = get_or_create_eventloop()
-            trace, final = loop.run_until_complete(simulate_chaining_pipeline())
+            trace, final = run_async(simulate_chaining_pipeline())
             st.session_state.trace_data = trace
             st.session_state.final_res = final
             
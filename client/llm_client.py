@@ -0,0 +1,47 @@
+import asyncio
+import importlib.util
+
+import httpx
+
+from config import (
+    DEEPSEEK_BASE_URL, LLM_HTTP2, LLM_MAX_CONNECTIONS, LLM_MAX_KEEPALIVE,
+    LLM_KEEPALIVE_EXPIRY, LLM_CONNECT_TIMEOUT, LLM_STAGE_TIMEOUTS
+)
+
+# HTTP/2 needs the optional 'h2' package; without it we silently stay on HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# httpx connections are bound to the event loop that opened them, so the
+# "process-wide" client is really one client per loop.
+_clients = {}
+
+
+def stage_timeout(stage):
+    read = LLM_STAGE_TIMEOUTS.get(stage, LLM_STAGE_TIMEOUTS["default"])
+    return httpx.Timeout(read, connect=LLM_CONNECT_TIMEOUT)
+
+
+def get_llm_client(base_url=DEEPSEEK_BASE_URL):
+    loop = asyncio.get_running_loop()
+    key = (id(loop), base_url)
+    client = _clients.get(key)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            base_url=base_url,
+            http2=LLM_HTTP2 and HTTP2_AVAILABLE,
+            limits=httpx.Limits(
+                max_connections=LLM_MAX_CONNECTIONS,
+                max_keepalive_connections=LLM_MAX_KEEPALIVE,
+                keepalive_expiry=LLM_KEEPALIVE_EXPIRY,
+            ),
+            timeout=stage_timeout("default"),
+        )
+        _clients[key] = client
+    return client
+
+
+async def close_llm_clients():
+    """Shutdown hook: closes the clients that belong to the running loop."""
+    loop = asyncio.get_running_loop()
+    for key in [k for k in _clients if k[0] == id(loop)]:
+        await _clients.pop(key).aclose()
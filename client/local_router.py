@@ -0,0 +1,272 @@
+import json
+import os
+import re
+import threading
+
+from academic_store import AcademicStore, normalize as server_normalize
+from config import DB_JSON_PATH, LOCAL_ROUTER_FUZZY_MARGIN, LOCAL_ROUTER_FUZZY_MIN_SCORE, LOCAL_ROUTER_MIN_CONFIDENCE
+from name_index import UMLAUTS, NameIndex
+from sqlite_store import get_data_store
+
+# Keyword groups per intent (German + English, matched against the casefolded query)
+KEYWORDS = {
+    "grades": ("noten", "note ", "grades", "grade ", "zeugnis", "leistungen"),
+    "all_professors": ("alle professoren", "all professors", "liste der professoren", "professoren im system", "list professors"),
+    "list_words": ("liste", "list", "alle", "all", "zeige", "show"),
+    "professors_word": ("professoren", "professors", "dozenten", "lecturers"),
+    "teaches": ("wer liest", "wer unterrichtet", "wer lehrt", "who teaches", "who lectures", "professor für", "professor for", "dozent für"),
+    "schedule": ("stundenplan", "schedule", "vorlesungsplan", "timetable"),
+    "syllabus": ("syllabus", "lehrplan", "modulbeschreibung"),
+    "events": ("events", "event", "veranstaltungen", "veranstaltung"),
+    "prof_info": ("büro", "buero", "office", "email", "e-mail", "mail", "kontakt", "contact", "sprechstunde"),
+    "news": ("news", "neuigkeiten", "nachrichten", "artikel"),
+}
+
+# Anything that sounds like a write request is left to the LLM (and the server's read-only schema)
+MUTATING_WORDS = ("set ", "update", "delete", "drop ", "ändere", "aendere", "lösche", "loesche", "setze", "ignore")
+
+# A misspelled name is trusted a little less than an exact one
+FUZZY_CONFIDENCE = 0.8
+
+# Tool arguments that name an entity the router knows, for validate()
+ARGUMENT_ENTITIES = {
+    ("get_student_grades", "query"): "students",
+    ("get_professor_for_module", "module_name"): "modules",
+    ("get_professor_info", "prof_name"): "professors",
+    ("get_schedule", "course_name"): "courses",
+}
+
+
+def normalize(text):
+    # The server's folding plus umlaut spelling variants and quotes, for matching free text
+    return re.sub(r"['\"]", "", server_normalize((text or "").casefold().translate(UMLAUTS)))
+
+
+def _has_any(query, words):
+    return any(w in query for w in words)
+
+
+class LocalRouter:
+    """Deterministic pattern + entity router that runs before the LLM router.
+
+    Every rule needs an intent keyword and, where the tool takes an argument,
+    an entity from db.json. Only unambiguous matches above the confidence
+    threshold are returned; everything else goes to the LLM. Entities that
+    are not mentioned verbatim are looked up in a fuzzy name index.
+
+    validate() asks `store` (AcademicStore or SqliteAcademicStore, built
+    from `db` if not given) what the server's lookups would find.
+    """
+
+    def __init__(self, db, min_confidence=LOCAL_ROUTER_MIN_CONFIDENCE, store=None):
+        self.min_confidence = min_confidence
+        self.store = store if store is not None else AcademicStore(db)
+        self.stats = {"handled": 0, "fallback": 0, "corrected": 0}
+        self.student_ids = set(db.get("students", {}))
+        self.students = {normalize(s["name"]): sid for sid, s in db.get("students", {}).items()}
+        # Professors are usually referred to by last name ("Weber"), keep both forms
+        self.professors = {}
+        for p in db.get("professors", {}).values():
+            self.professors[normalize(p["name"])] = p["name"]
+            self.professors.setdefault(normalize(p["name"].split()[-1]), p["name"])
+        self._names = {
+            "students": [(s["name"], sid) for sid, s in db.get("students", {}).items()],
+            "professors": [(name, p["name"]) for p in db.get("professors", {}).values() for name in (p["name"], p["name"].split()[-1])],
+        }
+        self.modules = {}
+        for grades in db.get("grades", {}).values():
+            for g in grades:
+                self.modules[normalize(g["module"])] = g["module"]
+                self.modules.setdefault(normalize(g["module_id"]), g["module"])
+        # get_schedule only looks in db["schedule"]; a course without lectures cannot be routed to it
+        self.courses = {normalize(c): c for c in db.get("schedule", {})}
+        self.syllabi = {normalize(k): k for k in db.get("syllabi", {})}
+        self.news = {normalize(k): k for k in db.get("news", {})}
+        self._names["modules"] = [(m, m) for m in dict.fromkeys(self.modules.values())]
+        self._names["courses"] = [(c, c) for c in dict.fromkeys(self.courses.values())]
+        # Built on first use; most queries name their entity verbatim
+        self._name_indexes = {}
+        self._index_lock = threading.Lock()
+
+    @staticmethod
+    def _find(entities, query_norm):
+        # Longest key per entity; a match inside a longer match does not count
+        # ("informatik" inside "wirtschaftsinformatik"). Returns (entity, #distinct matches).
+        best = {}
+        for key, value in entities.items():
+            if key and key in query_norm and len(key) > len(best.get(value, "")):
+                best[value] = key
+        hits = [v for v, k in best.items() if not any(k != other and k in other for other in best.values())]
+        if not hits:
+            return None, 0
+        return max(hits, key=lambda v: len(best[v])), len(hits)
+
+    def _name_index(self, kind):
+        with self._index_lock:
+            if kind not in self._name_indexes:
+                self._name_indexes[kind] = NameIndex(self._names[kind])
+            return self._name_indexes[kind]
+
+    def _fuzzy_find(self, kind, text, mentions=True):
+        """(entity, 1) for a clear fuzzy winner, (entity, 2) if the runner-up is close, (None, 0) below the score."""
+        index = self._name_index(kind)
+        ranked = index.mentions(text, limit=2) if mentions else index.search(text, limit=2)
+        if not ranked or ranked[0][0] < LOCAL_ROUTER_FUZZY_MIN_SCORE:
+            return None, 0
+        clear = len(ranked) == 1 or ranked[0][0] - ranked[1][0] >= LOCAL_ROUTER_FUZZY_MARGIN
+        return ranked[0][1], 1 if clear else 2
+
+    def _match(self, kind, query, qn, confidence):
+        # Verbatim mention first, then the fuzzy index. Returns (entity, confidence).
+        entity, n = self._find(getattr(self, kind), qn)
+        if entity is None:
+            entity, n = self._fuzzy_find(kind, query)
+            confidence = min(confidence, FUZZY_CONFIDENCE)
+        return entity, confidence if n == 1 else 0.5
+
+    def _candidates(self, query):
+        q = f" {query.casefold()} "
+        qn = normalize(query)
+        candidates = []
+
+        if _has_any(q, KEYWORDS["grades"]):
+            sids = list(dict.fromkeys(t for t in re.findall(r"\bs\d{4,}\b", q) if t in self.student_ids))
+            if sids:
+                # get_student_grades takes one student; "Noten von s1001 und s1002" is for the LLM
+                confidence = 0.95 if len(sids) == 1 else 0.5
+                candidates.append((confidence, {"action": "tool", "name": "get_student_grades", "args": {"query": sids[0]}}))
+            else:
+                student, confidence = self._match("students", query, qn, 0.9)
+                if student:
+                    candidates.append((confidence, {"action": "tool", "name": "get_student_grades", "args": {"query": student}}))
+
+        if _has_any(q, KEYWORDS["all_professors"]) or (_has_any(q, KEYWORDS["professors_word"]) and _has_any(q, KEYWORDS["list_words"])):
+            candidates.append((0.9, {"action": "tool", "name": "get_all_professors", "args": {}}))
+
+        if _has_any(q, KEYWORDS["teaches"]):
+            module, confidence = self._match("modules", query, qn, 0.9)
+            if module:
+                candidates.append((confidence, {"action": "tool", "name": "get_professor_for_module", "args": {"module_name": module}}))
+
+        if _has_any(q, KEYWORDS["schedule"]):
+            course, confidence = self._match("courses", query, qn, 0.9)
+            if course:
+                candidates.append((confidence, {"action": "tool", "name": "get_schedule", "args": {"course_name": course}}))
+
+        if _has_any(q, KEYWORDS["syllabus"]):
+            key, n = self._find(self.syllabi, qn)
+            if key:
+                uri = f"dhbw://syllabus/{key}"
+                candidates.append((0.9 if n == 1 else 0.5, {"action": "resource", "uri": uri, "name": uri, "args": {}}))
+
+        if _has_any(q, KEYWORDS["events"]):
+            # "News about the events" is a news question the rules cannot answer, not get_events
+            confidence = 0.5 if _has_any(q, KEYWORDS["news"]) else 0.85
+            candidates.append((confidence, {"action": "tool", "name": "get_events", "args": {}}))
+
+        if _has_any(q, KEYWORDS["prof_info"]):
+            prof, confidence = self._match("professors", query, qn, 0.85)
+            if prof:
+                candidates.append((confidence, {"action": "tool", "name": "get_professor_info", "args": {"prof_name": prof}}))
+
+        if _has_any(q, KEYWORDS["news"]):
+            key, n = self._find(self.news, qn)
+            if key:
+                uri = f"dhbw://news/{key}"
+                candidates.append((0.85 if n == 1 else 0.5, {"action": "resource", "uri": uri, "name": uri, "args": {}}))
+
+        return candidates
+
+    def route(self, query, available_tools=None):
+        """Returns a router decision dict, or None if the LLM should decide."""
+        if _has_any(f" {query.casefold()} ", MUTATING_WORDS):
+            self.stats["fallback"] += 1
+            return None
+        candidates = self._candidates(query)
+        if available_tools is not None:
+            candidates = [c for c in candidates if c[1]["action"] != "tool" or c[1]["name"] in available_tools]
+        confident = [c for c in candidates if c[0] >= self.min_confidence]
+        # Two different confident intents ("Noten und Stundenplan") are a job for the LLM
+        if len(confident) != 1:
+            self.stats["fallback"] += 1
+            return None
+        confidence, decision = confident[0]
+        self.stats["handled"] += 1
+        return {
+            **decision,
+            "reasoning": f"Lokaler Regel-Router: eindeutiges Muster erkannt (Konfidenz {confidence:.2f}).",
+            "confidence": confidence,
+            "router": "local",
+        }
+
+    def _resolves(self, kind, value):
+        # The store follows the server's helpers: ID, exact name or (except for courses) a substring
+        if kind == "students":
+            return self.store.find_student(value) is not None
+        if kind == "professors":
+            return self.store.find_professor(value) is not None
+        if kind == "modules":
+            return self.store.find_module(value) is not None
+        return self.store.schedule_for(value) is not None
+
+    def validate(self, decision):
+        """Replaces a misspelled entity argument of an LLM or cached decision with the known entity.
+
+        Arguments the server would resolve stay as they are; a clear fuzzy
+        winner replaces the rest and is listed under "corrected_args".
+        """
+        args = decision.get("args")
+        if decision.get("action") != "tool" or not isinstance(args, dict):
+            return decision
+        corrected = {}
+        for arg, value in args.items():
+            kind = ARGUMENT_ENTITIES.get((decision.get("name"), arg))
+            if kind is None or not isinstance(value, str) or not value.strip() or self._resolves(kind, value):
+                continue
+            entity, n = self._fuzzy_find(kind, value, mentions=False)
+            if n == 1:
+                corrected[arg] = {"from": value, "to": entity}
+        if not corrected:
+            return decision
+        self.stats["corrected"] += 1
+        return {**decision, "args": {**args, **{arg: c["to"] for arg, c in corrected.items()}}, "corrected_args": corrected}
+
+    def snapshot(self):
+        total = self.stats["handled"] + self.stats["fallback"]
+        return {
+            **self.stats,
+            "handled_ratio": round(self.stats["handled"] / total, 3) if total else 0.0,
+            "min_confidence": self.min_confidence,
+        }
+
+
+_local_router = None
+_local_router_mtime = None
+_lock = threading.Lock()
+
+
+def get_local_router():
+    # Rebuilt when db.json changes; counters carry over so the ratio covers the whole process.
+    # The data store (DATA_BACKEND) is looked up on every call, it is rebuilt on its own schedule.
+    global _local_router, _local_router_mtime
+    with _lock:
+        try:
+            mtime = os.stat(DB_JSON_PATH).st_mtime_ns
+        except OSError:
+            mtime = None
+        try:
+            store = get_data_store()
+        except OSError:
+            store = None
+        if _local_router is None or mtime != _local_router_mtime:
+            db = {}
+            if mtime is not None:
+                with open(DB_JSON_PATH, "r", encoding="utf-8") as f:
+                    db = json.load(f)
+            router = LocalRouter(db, store=store)
+            if _local_router is not None:
+                router.stats = _local_router.stats
+            _local_router, _local_router_mtime = router, mtime
+        elif store is not None:
+            _local_router.store = store
+        return _local_router
@@ -1,8 +1,8 @@
 import streamlit as st
 from config import LEARNING_SCENARIOS
 from styles import apply_custom_styles
-from utils import load_db, get_text, get_or_create_eventloop
-from backend_logik import execute_mcp_pipeline
+from utils import load_db, get_text, iterate_async
+from backend_logik import stream_mcp_pipeline
 from learning_phases import (
     render_intro_phase, render_transports_phase, render_analysis_phase, 
     render_zod_phase, render_builder_phase, render_simulation_phase, 
@@ -123,11 +123,20 @@ elif view_mode == "Learning Trail":
         st.session_state.messages.append({"role": "user", "content": prompt})
         with st.chat_message("user"): st.markdown(prompt)
         with st.chat_message("assistant"):
-            with st.spinner("Antworte..."):
-                loop = get_or_create_eventloop()
-                _, res = loop.run_until_complete(execute_mcp_pipeline(prompt, st.session_state.language))
-                st.markdown(res)
-                st.session_state.messages.append({"role": "assistant", "content": res})
+            status = st.status("Antworte...", expanded=False)
+
+            def answer_tokens():
+                # Trace steps go into the status box, answer tokens straight into the chat
+                for event in iterate_async(stream_mcp_pipeline(prompt, st.session_state.language)):
+                    if event["type"] == "step":
+                        step = event["data"]
+                        status.write(f"{step.get('icon', '')} {step['title']}")
+                    else:
+                        yield event["text"]
+                status.update(label="Fertig", state="complete")
+
+            res = st.write_stream(answer_tokens())
+            st.session_state.messages.append({"role": "assistant", "content": res})
 
 elif view_mode == "Settings":
     st.title("⚙️ Einstellungen & Debug")
@@ -0,0 +1,133 @@
+import asyncio
+import hashlib
+import json
+import time
+
+from mcp import types
+
+from config import CATALOG_TTL_SECONDS
+from mcp_pool import get_session_pool
+
+
+async def _collect_pages(session, method, field):
+    # list_* results are paginated; follow nextCursor until the server is done
+    items, cursor = [], None
+    while True:
+        page = await getattr(session, method)(cursor) if cursor else await getattr(session, method)()
+        items.extend(getattr(page, field))
+        cursor = page.nextCursor
+        if not cursor:
+            return items
+
+
+class CapabilityCatalog:
+    """Client-side cache of the server's tools and resources.
+
+    Entries live until the server announces a change (list_changed
+    notification), the pool had to reconnect (a restarted server may expose
+    different capabilities) or the TTL runs out as a last resort.
+    """
+
+    def __init__(self, pool, ttl=CATALOG_TTL_SECONDS):
+        self.pool = pool
+        self.ttl = ttl
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        self._entries = {}
+        self._prompt_fragment = None
+        self._version = None
+        self._reconnects_seen = pool.stats["reconnects"]
+        self._lock = asyncio.Lock()
+        pool.message_handlers.append(self._on_message)
+
+    async def _on_message(self, message):
+        if not isinstance(message, types.ServerNotification):
+            return
+        if isinstance(message.root, types.ToolListChangedNotification):
+            self.invalidate("tools")
+        elif isinstance(message.root, types.ResourceListChangedNotification):
+            self.invalidate("resources", "resource_templates")
+
+    def invalidate(self, *kinds):
+        kinds = kinds or tuple(self._entries)
+        for kind in kinds:
+            self._entries.pop(kind, None)
+        if "tools" in kinds:
+            self._prompt_fragment = None
+            self._version = None
+        self.stats["invalidations"] += 1
+
+    def _fresh(self, kind):
+        if self.pool.stats["reconnects"] != self._reconnects_seen:
+            self._reconnects_seen = self.pool.stats["reconnects"]
+            self.invalidate()
+        entry = self._entries.get(kind)
+        return entry is not None and (not self.ttl or time.monotonic() - entry[0] < self.ttl)
+
+    async def _get(self, kind, method, field, refresh):
+        if not refresh and self._fresh(kind):
+            self.stats["hits"] += 1
+            return self._entries[kind][1]
+        async with self._lock:
+            # Another caller may have filled the entry while we waited
+            if not refresh and self._fresh(kind):
+                self.stats["hits"] += 1
+                return self._entries[kind][1]
+            self.stats["misses"] += 1
+            items = await self.pool.run(lambda session: _collect_pages(session, method, field))
+            self._entries[kind] = (time.monotonic(), items)
+            if kind == "tools":
+                self._prompt_fragment = None
+                self._version = None
+            return items
+
+    async def tools(self, refresh=False):
+        return await self._get("tools", "list_tools", "tools", refresh)
+
+    async def resources(self, refresh=False):
+        return await self._get("resources", "list_resources", "resources", refresh)
+
+    async def resource_templates(self, refresh=False):
+        return await self._get("resource_templates", "list_resource_templates", "resourceTemplates", refresh)
+
+    async def tools_prompt(self):
+        """The TOOLS section of the router prompt, serialized once per catalog state."""
+        # Reuse the entry the caller just fetched without counting a second lookup
+        tools = self._entries["tools"][1] if self._fresh("tools") else await self.tools()
+        if self._prompt_fragment is None:
+            tools_for_prompt = [{"name": t.name, "description": t.description, "input_schema": t.inputSchema} for t in tools]
+            self._prompt_fragment = json.dumps(tools_for_prompt, indent=2)
+            self._version = hashlib.sha1(self._prompt_fragment.encode("utf-8")).hexdigest()[:12]
+        return self._prompt_fragment
+
+    async def version(self):
+        """Content hash of the tool catalog, stable across processes."""
+        await self.tools_prompt()
+        return self._version
+
+    def snapshot(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+            "cached": sorted(self._entries),
+            "version": self._version,
+        }
+
+
+# One catalog per live pool. Keyed by the pool object (not its id, which a
+# later pool can reuse) and dropped when the pool closes: the catalog holds
+# the pool, so nothing else would ever release either of them.
+_catalogs = {}
+
+
+def _forget_catalog(pool):
+    _catalogs.pop(pool, None)
+
+
+def get_capability_catalog():
+    pool = get_session_pool()
+    catalog = _catalogs.get(pool)
+    if catalog is None:
+        catalog = _catalogs[pool] = CapabilityCatalog(pool)
+        pool.close_handlers.append(_forget_catalog)
+    return catalog
@@ -0,0 +1,320 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from datetime import timedelta
+
+import anyio
+import httpx
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from config import (
+    MCP_URL, MCP_POOL_MIN_SESSIONS, MCP_POOL_MAX_SESSIONS,
+    MCP_SESSION_MAX_IN_FLIGHT, MCP_HEALTHCHECK_INTERVAL, MCP_REQUEST_TIMEOUT
+)
+
+# Errors that mean "the transport is gone", not "the server said no".
+# Only these trigger a reconnect + retry, everything else goes to the caller.
+CONNECTION_ERRORS = (
+    anyio.ClosedResourceError, anyio.BrokenResourceError, anyio.EndOfStream,
+    httpx.TransportError, ConnectionError, TimeoutError,
+)
+
+
+class SessionLostError(ConnectionError):
+    """A request failed and the session behind it no longer answers pings."""
+
+
+class PooledSession:
+    """One long-lived SSE connection + initialized ClientSession.
+
+    sse_client/ClientSession use anyio task groups, which must be entered and
+    exited in the same task. Each pooled session therefore owns a background
+    task that keeps the context managers open until close() is called.
+    """
+
+    def __init__(self, url, message_handler=None):
+        self.url = url
+        self.message_handler = message_handler
+        self.session = None
+        self.in_flight = 0
+        self.total_requests = 0
+        self.created_at = time.monotonic()
+        self.last_used = self.created_at
+        self.error = None
+        # perf_counter_ns timestamps of the connect phases (for pipeline traces)
+        self.opened_ns = self.connected_ns = self.initialized_ns = None
+        self._ready = asyncio.Event()
+        self._closing = asyncio.Event()
+        self._task = None
+
+    @property
+    def healthy(self):
+        return self.session is not None and self._task is not None and not self._task.done()
+
+    async def open(self):
+        self._task = asyncio.create_task(self._run())
+        await self._ready.wait()
+        if self.error is not None:
+            raise self.error
+        return self
+
+    async def _run(self):
+        self.opened_ns = time.perf_counter_ns()
+        try:
+            async with sse_client(self.url) as streams:
+                self.connected_ns = time.perf_counter_ns()
+                async with ClientSession(
+                    streams[0], streams[1],
+                    read_timeout_seconds=timedelta(seconds=MCP_REQUEST_TIMEOUT),
+                    message_handler=self.message_handler,
+                ) as session:
+                    await session.initialize()
+                    self.initialized_ns = time.perf_counter_ns()
+                    self.session = session
+                    self._ready.set()
+                    await self._closing.wait()
+        except Exception as e:
+            self.error = e
+        finally:
+            self.session = None
+            self._ready.set()
+
+    async def ping(self):
+        if not self.healthy:
+            return False
+        try:
+            await asyncio.wait_for(self.session.send_ping(), MCP_REQUEST_TIMEOUT)
+            return True
+        except Exception as e:
+            self.error = e
+            return False
+
+    async def close(self):
+        self._closing.set()
+        if self._task is not None:
+            try:
+                await asyncio.wait_for(self._task, MCP_REQUEST_TIMEOUT)
+            except Exception:
+                self._task.cancel()
+
+
+class MCPSessionPool:
+    """Shared pool of initialized MCP sessions.
+
+    Sessions are handed out least-loaded first; a session accepts up to
+    max_in_flight concurrent requests (JSON-RPC multiplexes them over the
+    same stream). New sessions are only opened when every live session is
+    at its limit and the pool is below max_sessions.
+    """
+
+    def __init__(self, url=MCP_URL, min_sessions=MCP_POOL_MIN_SESSIONS,
+                 max_sessions=MCP_POOL_MAX_SESSIONS, max_in_flight=MCP_SESSION_MAX_IN_FLIGHT,
+                 healthcheck_interval=MCP_HEALTHCHECK_INTERVAL):
+        self.url = url
+        self.min_sessions = min_sessions
+        self.max_sessions = max(max_sessions, 1)
+        self.max_in_flight = max(max_in_flight, 1)
+        self.healthcheck_interval = healthcheck_interval
+        self.sessions = []
+        self.message_handlers = []
+        # Called once the pool is closed; caches bound to this pool drop their entries here
+        self.close_handlers = []
+        self._cond = asyncio.Condition()
+        # Sessions being opened outside the lock; they count against max_sessions
+        self._opening = 0
+        # Background close() of discarded sessions; referenced so they are not
+        # garbage collected mid-close and awaited in close()
+        self._close_tasks = set()
+        self._health_task = None
+        self._closed = False
+        self.stats = {"opened": 0, "reconnects": 0, "acquired": 0, "waited": 0, "failed_pings": 0}
+
+    async def _dispatch_message(self, message):
+        for handler in list(self.message_handlers):
+            await handler(message)
+
+    async def start(self):
+        async with self._cond:
+            missing = self._reserve_missing()
+        results = await asyncio.gather(*(self._open_session() for _ in range(missing)), return_exceptions=True)
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            raise errors[0]
+        if self._health_task is None and self.healthcheck_interval:
+            self._health_task = asyncio.create_task(self._health_loop())
+        return self
+
+    def _reserve_missing(self):
+        # Call with the lock held: reserves the slots up to min_sessions
+        missing = max(self.min_sessions - len(self.sessions) - self._opening, 0)
+        self._opening += missing
+        return missing
+
+    async def _open_session(self, claim=False):
+        """Opens a session for a slot reserved via self._opening and registers it.
+
+        Connecting and initializing take a full round trip or more, so this
+        runs without the lock; other callers keep using the live sessions
+        meanwhile. With claim=True the new session is handed to the caller
+        in the same step, before any waiter can take it.
+        """
+        pooled = PooledSession(self.url, self._dispatch_message)
+        try:
+            await pooled.open()
+        except BaseException:
+            async with self._cond:
+                self._opening -= 1
+                self._cond.notify_all()
+            await pooled.close()
+            raise
+        async with self._cond:
+            self._opening -= 1
+            if not self._closed:
+                self.sessions.append(pooled)
+                self.stats["opened"] += 1
+                if claim:
+                    self._claim(pooled)
+            self._cond.notify_all()
+        if self._closed:
+            await pooled.close()
+            raise RuntimeError("MCP session pool is closed.")
+        return pooled
+
+    def _claim(self, pooled):
+        pooled.in_flight += 1
+        pooled.total_requests += 1
+        pooled.last_used = time.monotonic()
+        self.stats["acquired"] += 1
+
+    def _discard(self, pooled):
+        if pooled in self.sessions:
+            self.sessions.remove(pooled)
+            task = asyncio.create_task(pooled.close())
+            self._close_tasks.add(task)
+            task.add_done_callback(self._close_tasks.discard)
+
+    async def _acquire(self):
+        async with self._cond:
+            while True:
+                if self._closed:
+                    raise RuntimeError("MCP session pool is closed.")
+                for pooled in [s for s in self.sessions if not s.healthy]:
+                    self._discard(pooled)
+                    self.stats["reconnects"] += 1
+
+                candidates = [s for s in self.sessions if s.in_flight < self.max_in_flight]
+                if candidates:
+                    pooled = min(candidates, key=lambda s: s.in_flight)
+                    self._claim(pooled)
+                    return pooled
+
+                if len(self.sessions) + self._opening < self.max_sessions:
+                    self._opening += 1
+                    break
+
+                self.stats["waited"] += 1
+                await self._cond.wait()
+        return await self._open_session(claim=True)
+
+    async def _release(self, pooled, broken=False):
+        async with self._cond:
+            pooled.in_flight -= 1
+            if broken:
+                self._discard(pooled)
+                self.stats["reconnects"] += 1
+            self._cond.notify_all()
+
+    @asynccontextmanager
+    async def session(self):
+        if self._health_task is None or not self.sessions:
+            await self.start()
+        pooled = await self._acquire()
+        broken = False
+        try:
+            yield pooled.session
+        except CONNECTION_ERRORS:
+            broken = True
+            raise
+        except Exception as e:
+            # A dead SSE stream often surfaces as a request timeout (McpError),
+            # so ask the session directly before blaming the server.
+            if not await pooled.ping():
+                broken = True
+                raise SessionLostError(f"MCP session lost: {e}") from e
+            raise
+        finally:
+            await self._release(pooled, broken=broken or not pooled.healthy)
+
+    async def run(self, operation, retries=1):
+        """Runs `operation(session)` on a pooled session.
+
+        If the connection dies underneath the call, the session is replaced
+        and the operation is retried (reads only, all our MCP calls are
+        side-effect free).
+        """
+        for attempt in range(retries + 1):
+            try:
+                async with self.session() as session:
+                    return await operation(session)
+            except CONNECTION_ERRORS:
+                if attempt >= retries:
+                    raise
+
+    async def _health_loop(self):
+        while not self._closed:
+            await asyncio.sleep(self.healthcheck_interval)
+            for pooled in list(self.sessions):
+                # Busy sessions prove their health by answering real requests
+                if pooled.in_flight == 0 and not await pooled.ping():
+                    self.stats["failed_pings"] += 1
+                    async with self._cond:
+                        self._discard(pooled)
+                        self.stats["reconnects"] += 1
+                        self._cond.notify_all()
+            async with self._cond:
+                missing = self._reserve_missing()
+            # Failures mean the server is down - try again on the next tick
+            await asyncio.gather(*(self._open_session() for _ in range(missing)), return_exceptions=True)
+
+    def snapshot(self):
+        return {
+            "sessions": len(self.sessions),
+            "in_flight": [s.in_flight for s in self.sessions],
+            "min_sessions": self.min_sessions,
+            "max_sessions": self.max_sessions,
+            "max_in_flight": self.max_in_flight,
+            **self.stats,
+        }
+
+    async def close(self):
+        self._closed = True
+        if self._health_task is not None:
+            self._health_task.cancel()
+            self._health_task = None
+        sessions, self.sessions = self.sessions, []
+        await asyncio.gather(*(s.close() for s in sessions), *self._close_tasks, return_exceptions=True)
+        handlers, self.close_handlers = self.close_handlers, []
+        for handler in handlers:
+            handler(self)
+
+
+# One pool per event loop: asyncio primitives (and the anyio task groups
+# inside the sessions) are bound to the loop they were created on.
+_pools = {}
+
+
+def get_session_pool(url=MCP_URL):
+    loop = asyncio.get_running_loop()
+    key = (id(loop), url)
+    pool = _pools.get(key)
+    if pool is None or pool._closed:
+        pool = MCPSessionPool(url)
+        _pools[key] = pool
+    return pool
+
+
+async def close_session_pools():
+    loop = asyncio.get_running_loop()
+    for key in [k for k in _pools if k[0] == id(loop)]:
+        await _pools.pop(key).close()
@@ -0,0 +1,145 @@
+import difflib
+import heapq
+import re
+import unicodedata
+from array import array
+from collections import Counter
+
+# Ranked fuzzy lookup for person, module and course names. A trigram
+# inverted index proposes candidates; the best of them are re-ranked word by
+# word with difflib. "Webr", "Musterman", "Mueller"/"Muller" for "Müller"
+# still find their entry, and the closest name wins instead of the first one
+# in file order.
+
+UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss", "ı": "i"})
+# Do not identify anybody
+TITLE_WORDS = frozenset(("prof", "dr", "professor", "professorin", "herr", "frau", "mr", "mrs", "ms"))
+# Trigrams found in more entries than this share ("er ", "  s") only add noise and time
+STOP_GRAM_SHARE = 0.05
+RERANK_CANDIDATES = 64
+DEFAULT_MIN_SCORE = 0.6
+# A typed word that starts a name word ("Must" -> "Mustermann") counts as a near match
+PREFIX_SCORE = 0.9
+
+
+def _fold(text):
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def spellings(text):
+    """[(words, full)] per spelling of a name: umlauts as ae/oe/ue, then as plain vowels if that differs.
+
+    Titles are dropped; single letters (initials) only count in `full`,
+    which breaks ties between otherwise equal matches.
+    """
+    text = (text or "").casefold()
+    variants = []
+    for folded in (text.translate(UMLAUTS), text.replace("ß", "ss").replace("ı", "i")):
+        tokens = [t for t in re.findall(r"[a-z0-9]+", _fold(folded)) if t not in TITLE_WORDS]
+        words = tuple(t for t in tokens if len(t) > 1) or tuple(tokens)
+        if words and all(words != w for w, _ in variants):
+            variants.append((words, " ".join(tokens)))
+    return variants
+
+
+def trigrams(words):
+    grams = set()
+    for word in words:
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return grams
+
+
+def coverage(scored, other):
+    """How well each word of `scored` is found among `other`, weighted by word length (0..1)."""
+    total = 0.0
+    for word in scored:
+        matcher = difflib.SequenceMatcher(None, b=word)
+        best = 0.0
+        for candidate in other:
+            if candidate == word:
+                best = 1.0
+                break
+            if len(word) >= 3 and candidate.startswith(word):
+                best = max(best, PREFIX_SCORE)
+            matcher.set_seq1(candidate)
+            if matcher.real_quick_ratio() > best and matcher.quick_ratio() > best:
+                best = max(best, matcher.ratio())
+        total += best * len(word)
+    return total / sum(len(w) for w in scored) if scored else 0.0
+
+
+class NameIndex:
+    """Immutable trigram index over (name, value) pairs.
+
+    Entries are distinct spellings, so a thousand "Anna Müller"s share one
+    entry and the candidate set stays small. Two ways to ask:
+    search(name) scores how much of the typed name an entry contains (lookup
+    by name); mentions(text) scores how much of an entry's name appears in a
+    free-text query (entity detection for routing).
+    """
+
+    def __init__(self, pairs):
+        self._entries = []
+        self._values = []
+        entry_ids = {}
+        postings = {}
+        for name, value in pairs:
+            for words, full in spellings(name):
+                entry_id = entry_ids.get(words)
+                if entry_id is None:
+                    entry_id = entry_ids[words] = len(self._entries)
+                    self._entries.append((words, full, len(trigrams(words))))
+                    # dict as an ordered set: the same value can arrive under two names
+                    self._values.append({})
+                    for gram in trigrams(words):
+                        postings.setdefault(gram, []).append(entry_id)
+                self._values[entry_id][value] = None
+        self._postings = {gram: array("I", ids) for gram, ids in postings.items()}
+        self._stop_limit = max(RERANK_CANDIDATES, int(len(self._entries) * STOP_GRAM_SHARE))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _candidates(self, words, mentions):
+        lists = [self._postings[g] for g in trigrams(words) if g in self._postings]
+        selective = [ids for ids in lists if len(ids) <= self._stop_limit] or lists
+        hits = Counter()
+        for ids in selective:
+            hits.update(ids)
+        if mentions:
+            return heapq.nlargest(RERANK_CANDIDATES, hits, key=lambda e: hits[e] / self._entries[e][2])
+        return heapq.nlargest(RERANK_CANDIDATES, hits, key=hits.__getitem__)
+
+    def _rank(self, query, mentions, limit, min_score):
+        variants = spellings(query)
+        if not variants:
+            return []
+        words, full = variants[0]
+        ranked = []
+        for entry_id in self._candidates(words, mentions):
+            entry_words, entry_full, gram_count = self._entries[entry_id]
+            score = coverage(entry_words, words) if mentions else coverage(words, entry_words)
+            if score < min_score:
+                continue
+            # Equal scores: the closer full spelling, or in free text the more specific name
+            tiebreak = gram_count if mentions else difflib.SequenceMatcher(None, full, entry_full).ratio()
+            ranked.append((-score, -tiebreak, entry_id))
+        ranked.sort()
+        results, seen = [], set()
+        for score, _, entry_id in ranked:
+            for value in self._values[entry_id]:
+                if value not in seen:
+                    seen.add(value)
+                    results.append((round(-score, 3), value))
+            if len(results) >= limit:
+                break
+        return results[:limit]
+
+    def search(self, name, limit=5, min_score=DEFAULT_MIN_SCORE):
+        """[(score, value)], best first, for a typed (partial, misspelled) name."""
+        return self._rank(name, False, limit, min_score)
+
+    def mentions(self, text, limit=5, min_score=DEFAULT_MIN_SCORE):
+        """[(score, value)], best first, for names that appear in a sentence."""
+        return self._rank(text, True, limit, min_score)
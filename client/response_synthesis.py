@@ -0,0 +1,115 @@
+import json
+
+from config import MCP_OUTPUT_LANGUAGE, RESPONSE_SYNTHESIS_POLICY
+from result_cache import resource_family
+
+# How the final answer is produced:
+#   "passthrough" - the tool output is already Markdown, show it as is
+#                   (only in MCP_OUTPUT_LANGUAGE; otherwise the template or the LLM)
+#   "template"    - render the JSON output with a local Markdown template
+#   "llm"         - send it through the final LLM call (original behaviour)
+
+LABELS = {
+    "German": {"professors": "Professoren", "events": "Veranstaltungen", "schedule": "Stundenplan",
+               "day": "Tag", "time": "Zeit", "lecture": "Vorlesung", "room": "Raum", "professor": "Professor",
+               "teaches": "wird gelesen von", "publications": "Publikationen", "office": "Büro",
+               "email": "E-Mail", "department": "Fachbereich"},
+    "English": {"professors": "Professors", "events": "Events", "schedule": "Schedule",
+                "day": "Day", "time": "Time", "lecture": "Lecture", "room": "Room", "professor": "Professor",
+                "teaches": "is taught by", "publications": "Publications", "office": "Office",
+                "email": "Email", "department": "Department"},
+}
+
+
+def _labels(language):
+    return LABELS.get(language, LABELS["English"])
+
+
+def _professors(data, t):
+    return f"**{t['professors']}:**\n\n" + "\n".join(f"- {name}" for name in data)
+
+
+def _events(data, t):
+    lines = [f"- **{e['name']}** ({e['date']}) – {e['location']}, {e['organizer']}" for e in data]
+    return f"**{t['events']}:**\n\n" + "\n".join(lines)
+
+
+def _schedule(data, t):
+    rows = [f"| {l['day']} | {l['time']} | {l['lecture']} | {l['room']} | {l.get('professor_name', '')} |" for l in data]
+    header = f"| {t['day']} | {t['time']} | {t['lecture']} | {t['room']} | {t['professor']} |\n|---|---|---|---|---|"
+    return f"**{t['schedule']}:**\n\n{header}\n" + "\n".join(rows)
+
+
+def _professor_info(data, t):
+    return (f"**{data['name']}**\n\n- {t['office']}: {data['office']}\n"
+            f"- {t['email']}: {data['email']}\n- {t['department']}: {data['department']}")
+
+
+def _professor_for_module(data, t):
+    return f"**{data['module']}** {t['teaches']} **{data['professor']}**."
+
+
+def _news(data, t):
+    return f"**{data['headline']}** ({data['date']})\n\n{data['body']}"
+
+
+def _publications(data, t):
+    return f"**{t['publications']}:**\n\n" + "\n".join(f"- {p}" for p in data)
+
+
+TEMPLATES = {
+    "get_all_professors": _professors,
+    "get_events": _events,
+    "get_schedule": _schedule,
+    "get_professor_info": _professor_info,
+    "get_professor_for_module": _professor_for_module,
+    "news": _news,
+    "publications": _publications,
+}
+
+
+def policy_key(decision):
+    if decision.get("action") == "resource":
+        return resource_family(decision.get("uri", decision.get("name", "")))
+    return decision.get("name", "")
+
+
+def choose_policy(decision):
+    if decision.get("action") not in ("tool", "resource"):
+        return "llm"
+    return RESPONSE_SYNTHESIS_POLICY.get(policy_key(decision), RESPONSE_SYNTHESIS_POLICY["default"])
+
+
+# null / [] / {} / "": nothing found - a header without rows is no answer
+EMPTY_RESULTS = (None, [], {}, "")
+
+
+def _is_empty(execution_data):
+    try:
+        return json.loads(execution_data) in EMPTY_RESULTS
+    except ValueError:
+        return False
+
+
+def render_locally(policy, decision, execution_data, language="German"):
+    """Returns the finished answer, or None if the LLM has to write it.
+
+    Anything the local path cannot handle safely (errors, empty results,
+    non-JSON output for a template, unexpected shapes) falls back to the LLM.
+    """
+    if policy == "llm" or not execution_data or execution_data.startswith("Error"):
+        return None
+    as_is = language == MCP_OUTPUT_LANGUAGE
+    if policy == "passthrough":
+        if as_is:
+            return None if _is_empty(execution_data) else execution_data
+        policy = "template"
+    template = TEMPLATES.get(policy_key(decision))
+    if policy != "template" or template is None:
+        return None
+    try:
+        data = json.loads(execution_data)
+        return template(data, _labels(language)) if data not in EMPTY_RESULTS else None
+    except (ValueError, KeyError, TypeError):
+        # Plain-text answers like "Course 'X' not found." are presentable as they are, in the server's language
+        return execution_data if as_is and not execution_data.lstrip().startswith(("{", "[")) else None
@@ -0,0 +1,135 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+from config import RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTLS, DB_JSON_PATH
+
+
+def canonical_args(args):
+    # Key order and omitted-vs-null optional args must not create separate entries
+    cleaned = {k: v for k, v in (args or {}).items() if v is not None}
+    return json.dumps(cleaned, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+
+
+def resource_family(uri):
+    # dhbw://syllabus/intsem -> "syllabus"
+    rest = str(uri).split("://", 1)[-1]
+    return rest.split("/", 1)[0]
+
+
+class ToolResultCache:
+    """Size-bounded LRU for call_tool / read_resource results.
+
+    The server answers from the static src/db.json, so identical calls give
+    identical results until that file changes. Entries are tagged with the
+    file's (mtime, size) fingerprint and dropped as soon as it differs. This
+    only helps when client and server share a checkout (the default setup);
+    otherwise the per-tool TTLs are the only bound on staleness.
+    """
+
+    FINGERPRINT_INTERVAL = 1.0
+
+    def __init__(self, max_entries=RESULT_CACHE_MAX_ENTRIES, ttls=RESULT_CACHE_TTLS, db_path=DB_JSON_PATH):
+        self.max_entries = max_entries
+        self.ttls = ttls
+        self.db_path = db_path
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "db_invalidations": 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._fingerprint = self._read_fingerprint()
+        self._fingerprint_checked = time.monotonic()
+
+    def _read_fingerprint(self):
+        try:
+            st = os.stat(self.db_path)
+            return (st.st_mtime_ns, st.st_size)
+        except OSError:
+            return None
+
+    def _check_db(self):
+        # stat() at most once per second, lookups stay cheap under load
+        now = time.monotonic()
+        if now - self._fingerprint_checked < self.FINGERPRINT_INTERVAL:
+            return
+        self._fingerprint_checked = now
+        fingerprint = self._read_fingerprint()
+        if fingerprint != self._fingerprint:
+            self._fingerprint = fingerprint
+            if self._entries:
+                self._entries.clear()
+                self.stats["db_invalidations"] += 1
+
+    def ttl_for(self, kind, name):
+        policy_key = resource_family(name) if kind == "resource" else name
+        return self.ttls.get(policy_key, self.ttls["default"])
+
+    def get(self, kind, name, args=None):
+        key = (kind, name, canonical_args(args))
+        with self._lock:
+            self._check_db()
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() > entry[0]:
+                del self._entries[key]
+                self.stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry[1]
+
+    def put(self, kind, name, args, value):
+        ttl = self.ttl_for(kind, name)
+        if not ttl:
+            return
+        key = (kind, name, canonical_args(args))
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+
+    async def call_tool(self, pool, name, args):
+        """Returns (result, cache_hit). Error results are never cached."""
+        cached = self.get("tool", name, args)
+        if cached is not None:
+            return cached, True
+        result = await pool.run(lambda session: session.call_tool(name, args))
+        if not result.isError:
+            self.put("tool", name, args, result)
+        return result, False
+
+    async def read_resource(self, pool, uri):
+        """Returns (result, cache_hit)."""
+        cached = self.get("resource", str(uri))
+        if cached is not None:
+            return cached, True
+        result = await pool.run(lambda session: session.read_resource(uri))
+        self.put("resource", str(uri), None, result)
+        return result, False
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def snapshot(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+
+_result_cache = None
+
+
+def get_result_cache():
+    global _result_cache
+    if _result_cache is None:
+        _result_cache = ToolResultCache()
+    return _result_cache
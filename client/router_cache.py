@@ -0,0 +1,117 @@
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+
+from config import ROUTER_CACHE_MAX_ENTRIES, ROUTER_CACHE_TTL_SECONDS, ROUTER_CACHE_PATH
+
+VALID_ACTIONS = {"tool", "resource", "chat"}
+
+
+def normalize_query(text):
+    # "Zeige mir die Noten für Student s1001?" and "zeige mir die noten  für student S1001"
+    # should land on the same entry; quotes and trailing punctuation carry no intent.
+    text = unicodedata.normalize("NFKC", text).casefold()
+    text = re.sub(r"[\"'`´“”„‘’?!.,;:]+", " ", text)
+    return " ".join(text.split())
+
+
+class RouterDecisionCache:
+    """LRU + TTL cache for router decisions, optionally persisted as JSON.
+
+    Keys combine the normalized query, the answer language and the catalog
+    version, so a changed tool list never serves decisions made for the old one.
+    """
+
+    def __init__(self, max_entries=ROUTER_CACHE_MAX_ENTRIES, ttl=ROUTER_CACHE_TTL_SECONDS, path=ROUTER_CACHE_PATH):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.stats = {"hits": 0, "misses": 0, "stores": 0, "evictions": 0, "expired": 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def make_key(query, language, catalog_version):
+        return f"{language}|{catalog_version}|{normalize_query(query)}"
+
+    def get(self, query, language, catalog_version):
+        key = self.make_key(query, language, catalog_version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and time.time() - entry["stored_at"] > self.ttl:
+                del self._entries[key]
+                self.stats["expired"] += 1
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            # Callers may annotate the decision, never hand out the cached dict itself
+            return json.loads(json.dumps(entry["decision"]))
+
+    def put(self, query, language, catalog_version, decision):
+        if decision.get("action") not in VALID_ACTIONS:
+            return
+        key = self.make_key(query, language, catalog_version)
+        with self._lock:
+            self._entries[key] = {"decision": json.loads(json.dumps(decision)), "stored_at": time.time()}
+            self._entries.move_to_end(key)
+            self.stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evictions"] += 1
+            self._save()
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._save()
+
+    def snapshot(self):
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return {
+            **self.stats,
+            "entries": len(self._entries),
+            "hit_rate": round(self.stats["hits"] / lookups, 3) if lookups else 0.0,
+        }
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                stored = json.load(f)
+        except (OSError, ValueError):
+            # A corrupt cache file is not worth failing the app for
+            return
+        for key, entry in stored.items():
+            self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _save(self):
+        if not self.path:
+            return
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            pass
+
+
+_router_cache = None
+
+
+def get_router_cache():
+    global _router_cache
+    if _router_cache is None:
+        _router_cache = RouterDecisionCache()
+    return _router_cache
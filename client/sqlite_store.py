@@ -0,0 +1,325 @@
+import argparse
+import json
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+from academic_store import Grade, Lecture, Module, Professor, Student, get_academic_store, normalize, query_academic_data
+from config import DATA_BACKEND, DB_JSON_PATH, DB_SQLITE_PATH
+from name_index import NameIndex
+
+# db.json as an indexed SQLite file, for data that no longer fits in memory
+# comfortably. import_json() converts it; SqliteAcademicStore answers the same
+# questions as AcademicStore with indexed queries and only reads the pages it
+# needs. Row order (seq) is db.json order, so "first match" means the same in
+# both backends.
+#
+#   python client/sqlite_store.py [--json src/db.json] [--out src/db.sqlite]
+
+SCHEMA_VERSION = "1"
+MMAP_BYTES = 256 * 2 ** 20
+
+# Value columns have no declared type, so grades and semesters keep their JSON types
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT) WITHOUT ROWID;
+CREATE TABLE students (seq INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, name TEXT NOT NULL, name_key TEXT NOT NULL,
+                       program, semester);
+CREATE TABLE professors (seq INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, name TEXT NOT NULL, name_key TEXT NOT NULL,
+                         last_key TEXT NOT NULL, office, email, department);
+CREATE TABLE modules (seq INTEGER PRIMARY KEY, id TEXT NOT NULL UNIQUE, name TEXT NOT NULL, name_key TEXT NOT NULL, prof_id);
+CREATE TABLE grades (seq INTEGER PRIMARY KEY, student_id TEXT NOT NULL, module_id TEXT NOT NULL, grade, credits, prof_id,
+                     status, semester);
+CREATE TABLE teaching (prof_id TEXT NOT NULL, module_id TEXT NOT NULL, first_seq INTEGER NOT NULL,
+                       PRIMARY KEY (prof_id, module_id)) WITHOUT ROWID;
+CREATE TABLE lectures (seq INTEGER PRIMARY KEY, course TEXT NOT NULL, course_key TEXT NOT NULL, day, time, room, lecture,
+                       prof_id, type);
+CREATE TABLE courses (seq INTEGER PRIMARY KEY, key TEXT NOT NULL, key_norm TEXT NOT NULL, data TEXT NOT NULL);
+"""
+# Built after the bulk insert, which beats maintaining them row by row
+INDEXES = """
+CREATE INDEX students_name ON students (name_key, seq);
+CREATE INDEX professors_name ON professors (name_key, seq);
+CREATE INDEX professors_last ON professors (last_key, seq);
+CREATE INDEX modules_name ON modules (name_key, seq);
+CREATE INDEX grades_student ON grades (student_id, seq);
+CREATE INDEX lectures_course ON lectures (course_key, seq);
+ANALYZE;
+"""
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def import_json(json_path=DB_JSON_PATH, sqlite_path=DB_SQLITE_PATH):
+    """Converts db.json into a fresh SQLite file, built next to the target and then swapped in.
+
+    Returns the row counts per table.
+    """
+    source = os.stat(json_path)
+    with open(json_path, "r", encoding="utf-8") as f:
+        db = json.load(f)
+    tmp_path = f"{sqlite_path}.tmp"
+    if os.path.exists(tmp_path):
+        os.remove(tmp_path)
+
+    # Modules and professor -> modules in first-seen order, collected during the grade insert
+    modules, teaching = {}, {}
+
+    def grade_rows():
+        seq = 0
+        for student_id, grades in db.get("grades", {}).items():
+            for g in grades:
+                seq += 1
+                modules.setdefault(g["module_id"], (g["module"], g.get("prof_id")))
+                if g.get("prof_id") is not None:
+                    teaching.setdefault((g["prof_id"], g["module_id"]), seq)
+                yield (seq, student_id, g["module_id"], g.get("grade"), g.get("credits"), g.get("prof_id"),
+                       g.get("status"), g.get("semester"))
+
+    conn = sqlite3.connect(tmp_path)
+    try:
+        # Nothing to recover on a crash: the target is only replaced once the import is complete
+        conn.executescript("PRAGMA journal_mode = OFF; PRAGMA synchronous = OFF;" + SCHEMA)
+        with conn:
+            conn.executemany("INSERT INTO students (id, name, name_key, program, semester) VALUES (?, ?, ?, ?, ?)",
+                             ((sid, s["name"], normalize(s["name"]), s.get("program"), s.get("semester"))
+                              for sid, s in db.get("students", {}).items()))
+            conn.executemany("INSERT INTO professors (id, name, name_key, last_key, office, email, department) "
+                             "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                             ((pid, p["name"], normalize(p["name"]), normalize(p["name"].split()[-1]), p.get("office"),
+                               p.get("email"), p.get("department"))
+                              for pid, p in db.get("professors", {}).items()))
+            conn.executemany("INSERT INTO grades VALUES (?, ?, ?, ?, ?, ?, ?, ?)", grade_rows())
+            conn.executemany("INSERT INTO modules (id, name, name_key, prof_id) VALUES (?, ?, ?, ?)",
+                             ((mid, name, normalize(name), prof_id) for mid, (name, prof_id) in modules.items()))
+            conn.executemany("INSERT INTO teaching VALUES (?, ?, ?)",
+                             ((prof_id, mid, seq) for (prof_id, mid), seq in teaching.items()))
+            conn.executemany("INSERT INTO lectures (course, course_key, day, time, room, lecture, prof_id, type) "
+                             "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                             ((course, normalize(course), l.get("day"), l.get("time"), l.get("room"), l.get("lecture"),
+                               l.get("prof_id"), l.get("type"))
+                              for course, lectures in db.get("schedule", {}).items() for l in lectures))
+            conn.executemany("INSERT INTO courses (key, key_norm, data) VALUES (?, ?, ?)",
+                             ((key, normalize(key), json.dumps(course, ensure_ascii=False))
+                              for key, course in db.get("courses", {}).items()))
+            conn.executemany("INSERT INTO meta VALUES (?, ?)", [
+                ("schema_version", SCHEMA_VERSION),
+                ("source_path", os.path.abspath(json_path)),
+                ("source_mtime_ns", str(source.st_mtime_ns)),
+                ("source_size", str(source.st_size)),
+                ("imported_at", time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())),
+            ])
+        conn.executescript(INDEXES)
+        counts = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+                  for table in ("students", "professors", "modules", "grades", "lectures", "courses")}
+    finally:
+        conn.close()
+    os.replace(tmp_path, sqlite_path)
+    return counts
+
+
+class SqliteAcademicStore:
+    """AcademicStore's lookups on an imported SQLite file (read-only).
+
+    Same methods, same record types and the same match order; only
+    search_* loads the names into memory, on first use.
+    """
+
+    backend = "sqlite"
+
+    def __init__(self, path=DB_SQLITE_PATH):
+        self.path = path
+        uri = Path(os.path.abspath(path)).as_uri() + "?mode=ro"
+        self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+        self._conn.execute(f"PRAGMA mmap_size = {MMAP_BYTES}")
+        self._lock = threading.Lock()
+        self.meta = dict(self._all("SELECT key, value FROM meta"))
+        self._name_indexes = {}
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def is_current(self, json_path=DB_JSON_PATH):
+        """False once db.json has changed since the import (True if there is no db.json at all)."""
+        if self.meta.get("schema_version") != SCHEMA_VERSION:
+            return False
+        try:
+            source = os.stat(json_path)
+        except OSError:
+            return True
+        return (self.meta.get("source_mtime_ns") == str(source.st_mtime_ns)
+                and self.meta.get("source_size") == str(source.st_size))
+
+    def _all(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+    def _one(self, sql, params=()):
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    # --- Students ---
+
+    STUDENT = "SELECT id, name, program, semester FROM students"
+
+    def student(self, student_id):
+        row = self._one(f"{self.STUDENT} WHERE id = ?", (student_id,))
+        return Student(*row) if row else None
+
+    def students_named(self, name):
+        return tuple(Student(*row) for row in self._all(f"{self.STUDENT} WHERE name_key = ? ORDER BY seq", (normalize(name),)))
+
+    def students_with_prefix(self, prefix, limit=20):
+        prefix = normalize(prefix)
+        if not prefix:
+            rows = self._all(f"{self.STUDENT} ORDER BY name_key, seq LIMIT ?", (limit,))
+        else:
+            upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+            rows = self._all(f"{self.STUDENT} WHERE name_key >= ? AND name_key < ? ORDER BY name_key, seq LIMIT ?",
+                             (prefix, upper, limit))
+        return [Student(*row) for row in rows]
+
+    def find_student(self, query):
+        q = normalize(query)
+        row = (self._one(f"{self.STUDENT} WHERE id = ?", (q,))
+               or self._one(f"{self.STUDENT} WHERE name_key = ? ORDER BY seq LIMIT 1", (q,))
+               or self._one(f"{self.STUDENT} WHERE instr(name_key, ?) > 0 ORDER BY seq LIMIT 1", (q,)))
+        return Student(*row) if row else None
+
+    def grades_for(self, student_id):
+        rows = self._all("SELECT m.id, m.name, m.prof_id, g.grade, g.credits, g.prof_id, g.status, g.semester "
+                         "FROM grades g JOIN modules m ON m.id = g.module_id WHERE g.student_id = ? ORDER BY g.seq",
+                         (student_id,))
+        return tuple(Grade(Module(mid, name, module_prof), *rest) for mid, name, module_prof, *rest in rows)
+
+    # --- Professors ---
+
+    PROFESSOR = "SELECT id, name, office, email, department FROM professors"
+
+    def professor(self, prof_id):
+        row = self._one(f"{self.PROFESSOR} WHERE id = ?", (prof_id,))
+        return Professor(*row) if row else None
+
+    def find_professor(self, query):
+        q = normalize(query)
+        row = (self._one(f"{self.PROFESSOR} WHERE name_key = ? ORDER BY seq LIMIT 1", (q,))
+               or self._one(f"{self.PROFESSOR} WHERE last_key = ? ORDER BY seq LIMIT 1", (q,))
+               or self._one(f"{self.PROFESSOR} WHERE instr(name_key, ?) > 0 ORDER BY seq LIMIT 1", (q,)))
+        return Professor(*row) if row else None
+
+    def modules_taught_by(self, prof_id):
+        return tuple(Module(*row) for row in self._all(
+            "SELECT m.id, m.name, m.prof_id FROM teaching t JOIN modules m ON m.id = t.module_id "
+            "WHERE t.prof_id = ? ORDER BY t.first_seq", (prof_id,)))
+
+    # --- Modules ---
+
+    MODULE = "SELECT id, name, prof_id FROM modules"
+
+    def find_module(self, query):
+        q = normalize(query)
+        row = (self._one(f"{self.MODULE} WHERE name_key = ? ORDER BY seq LIMIT 1", (q,))
+               or self._one(f"{self.MODULE} WHERE instr(name_key, ?) > 0 ORDER BY seq LIMIT 1", (q,)))
+        return Module(*row) if row else None
+
+    def professor_for_module(self, query):
+        module = self.find_module(query)
+        if module is None:
+            return None
+        return module, self.professor(module.prof_id)
+
+    # --- Schedule and courses ---
+
+    def schedule_for(self, course_name):
+        rows = self._all("SELECT course, day, time, room, lecture, prof_id, type FROM lectures WHERE course_key = ? ORDER BY seq",
+                         (normalize(course_name),))
+        if not rows:
+            return None
+        # Two keys that normalize alike: the first one wins, as in AcademicStore
+        course = rows[0][0]
+        return course, tuple(Lecture(*row[1:]) for row in rows if row[0] == course)
+
+    def find_course(self, query):
+        row = self._one("SELECT key, data FROM courses WHERE instr(key_norm, ?) > 0 ORDER BY seq LIMIT 1", (normalize(query),))
+        return (row[0], json.loads(row[1])) if row else None
+
+    def query_academic_data(self, student_name=None, professor_name=None, course_name=None):
+        return query_academic_data(self, student_name, professor_name, course_name)
+
+    # --- Ranked fuzzy search ---
+
+    def _name_index(self, kind):
+        with self._lock:
+            index = self._name_indexes.get(kind)
+        if index is None:
+            if kind == "students":
+                pairs = [(row[1], Student(*row)) for row in self._all(self.STUDENT)]
+            elif kind == "professors":
+                pairs = [(row[1], Professor(*row)) for row in self._all(self.PROFESSOR)]
+            else:
+                pairs = [(row[1], Module(*row)) for row in self._all(self.MODULE)]
+            index = NameIndex(pairs)
+            with self._lock:
+                index = self._name_indexes.setdefault(kind, index)
+        return index
+
+    def search_students(self, query, limit=5):
+        return self._name_index("students").search(query, limit)
+
+    def search_professors(self, query, limit=5):
+        return self._name_index("professors").search(query, limit)
+
+    def search_modules(self, query, limit=5):
+        return self._name_index("modules").search(query, limit)
+
+    def stats(self):
+        counts = {table: self._one(f"SELECT COUNT(*) FROM {table}")[0] for table in ("students", "professors", "modules", "grades")}
+        counts["courses"] = self._one("SELECT COUNT(DISTINCT course_key) FROM lectures")[0]
+        return counts
+
+
+_sqlite_store = None
+_sqlite_key = None
+_lock = threading.Lock()
+
+
+def get_data_store():
+    """The configured backend (DATA_BACKEND). SQLite falls back to db.json while its file is missing or stale."""
+    global _sqlite_store, _sqlite_key
+    if DATA_BACKEND != "sqlite":
+        return get_academic_store()
+    with _lock:
+        key = (_mtime(DB_SQLITE_PATH), _mtime(DB_JSON_PATH))
+        if key != _sqlite_key:
+            if _sqlite_store is not None:
+                _sqlite_store.close()
+            _sqlite_store = None
+            if key[0] is not None:
+                store = SqliteAcademicStore(DB_SQLITE_PATH)
+                if store.is_current(DB_JSON_PATH):
+                    _sqlite_store = store
+                else:
+                    store.close()
+            _sqlite_key = key
+        if _sqlite_store is not None:
+            return _sqlite_store
+    return get_academic_store()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import db.json into an indexed SQLite database.")
+    parser.add_argument("--json", default=DB_JSON_PATH)
+    parser.add_argument("--out", default=DB_SQLITE_PATH)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    counts = import_json(args.json, args.out)
+    print(f"✅ {args.out}: " + ", ".join(f"{n:,} {table}" for table, n in counts.items())
+          + f" in {time.perf_counter() - start:.1f} s ({os.path.getsize(args.out) / 2 ** 20:.1f} MB)")
@@ -81,6 +81,14 @@ def apply_custom_styles():
         .card-icon { font-size: 1.5rem; background-color: #eff6ff; width: 40px; height: 40px; display: flex; align-items: center; justify-content: center; border-radius: 50%; }
         .card-title { color: #1e3a8a; font-size: 1.1rem; font-weight: 700; }
         
+        /* PIPELINE WATERFALL */
+        .waterfall-row { display: flex; align-items: center; gap: 10px; margin-bottom: 4px; font-family: monospace; font-size: 0.85rem; }
+        .waterfall-label { width: 170px; color: #475569; white-space: nowrap; overflow: hidden; text-overflow: ellipsis; }
+        .waterfall-track { flex-grow: 1; position: relative; height: 14px; background: #f1f5f9; border-radius: 4px; }
+        .waterfall-bar { position: absolute; top: 0; height: 14px; min-width: 2px; background: #3b82f6; border-radius: 4px; }
+        .waterfall-bar.cached { background: #10b981; }
+        .waterfall-value { width: 160px; text-align: right; color: #64748b; }
+        
         .result-btn button { background-color: #10b981 !important; color: white !important; animation: pulse-green 2s infinite; font-weight: bold !important; border: none !important; }
         .action-btn button { background-color: #3b82f6 !important; color: white !important; border: 1px solid #60a5fa !important; }
         div[data-testid="stStatusWidget"] { display: none; }
@@ -0,0 +1,122 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from config import TRACE_EXPORT_PATH
+
+# Same rule of thumb as benchmark.py: ~4 bytes per token
+BYTES_PER_TOKEN = 4
+
+
+def payload_size(payload):
+    if payload is None:
+        return 0
+    if isinstance(payload, bytes):
+        return len(payload)
+    if not isinstance(payload, str):
+        payload = json.dumps(payload, default=str)
+    return len(payload.encode("utf-8"))
+
+
+class Span:
+    def __init__(self, trace, name, start_ns, attributes=None):
+        self.trace = trace
+        self.name = name
+        self.span_id = os.urandom(8).hex()
+        self.start_ns = start_ns
+        self.end_ns = None
+        self.bytes = 0
+        self.attributes = dict(attributes or {})
+
+    def add_bytes(self, payload):
+        self.bytes += payload_size(payload)
+
+    def set(self, **attributes):
+        self.attributes.update(attributes)
+
+    @property
+    def duration_ms(self):
+        end = self.end_ns if self.end_ns is not None else time.perf_counter_ns()
+        return (end - self.start_ns) / 1e6
+
+    def as_dict(self):
+        return {
+            "name": self.name,
+            "start_ms": round((self.start_ns - self.trace.start_ns) / 1e6, 3),
+            "duration_ms": round(self.duration_ms, 3),
+            "bytes": self.bytes,
+            "tokens": self.bytes // BYTES_PER_TOKEN,
+            **self.attributes,
+        }
+
+
+class PipelineTrace:
+    """Monotonic-clock spans for one pipeline run.
+
+    Offsets come from perf_counter_ns; the wall-clock start is only used to
+    give exported spans absolute OpenTelemetry timestamps.
+    """
+
+    def __init__(self, name="mcp_pipeline", **attributes):
+        self.name = name
+        self.trace_id = os.urandom(16).hex()
+        self.start_ns = time.perf_counter_ns()
+        self.wall_start_ns = time.time_ns()
+        self.attributes = attributes
+        self.spans = []
+
+    @contextmanager
+    def span(self, name, **attributes):
+        span = Span(self, name, time.perf_counter_ns(), attributes)
+        self.spans.append(span)
+        try:
+            yield span
+        finally:
+            span.end_ns = time.perf_counter_ns()
+
+    def add_span(self, name, start_ns, end_ns, **attributes):
+        """Records a span measured elsewhere (e.g. the pool's connect timings)."""
+        span = Span(self, name, start_ns, attributes)
+        span.end_ns = end_ns
+        self.spans.append(span)
+        return span
+
+    def waterfall(self):
+        return [span.as_dict() for span in sorted(self.spans, key=lambda s: s.start_ns)]
+
+    def total_ms(self):
+        end = max((s.end_ns or s.start_ns for s in self.spans), default=self.start_ns)
+        return round((end - self.start_ns) / 1e6, 3)
+
+    def to_otel(self):
+        # OTLP/JSON-like span records, one per line in the export file
+        def ts(ns):
+            return str(self.wall_start_ns + (ns - self.start_ns))
+
+        records = []
+        for span in self.spans:
+            attrs = {"payload.bytes": span.bytes, "payload.tokens_est": span.bytes // BYTES_PER_TOKEN, **span.attributes}
+            records.append({
+                "traceId": self.trace_id,
+                "spanId": span.span_id,
+                "name": span.name,
+                "startTimeUnixNano": ts(span.start_ns),
+                "endTimeUnixNano": ts(span.end_ns or span.start_ns),
+                "attributes": [{"key": k, "value": {"stringValue": str(v)}} for k, v in attrs.items()],
+                "resource": {"service.name": "dhbw-mcp-client", "pipeline": self.name, **{k: str(v) for k, v in self.attributes.items()}},
+            })
+        return records
+
+
+_export_lock = threading.Lock()
+
+
+def export_trace(trace, path=TRACE_EXPORT_PATH):
+    if not path:
+        return
+    lines = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in trace.to_otel())
+    with _export_lock:
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(lines)
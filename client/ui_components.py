@@ -1,6 +1,19 @@
 import streamlit as st
 import pandas as pd
 
+def render_waterfall(spans):
+    total = max((s['start_ms'] + s['duration_ms'] for s in spans), default=0) or 1
+    rows = []
+    for s in spans:
+        left = s['start_ms'] / total * 100
+        width = s['duration_ms'] / total * 100
+        cached = " cached" if s.get('cache_hit') or s.get('source') in ("local", "cache") else ""
+        size = f" · {s['bytes'] / 1024:.1f} kB" if s.get('bytes') else ""
+        rows.append(f"""<div class="waterfall-row"><div class="waterfall-label">{s['name']}</div>
+            <div class="waterfall-track"><div class="waterfall-bar{cached}" style="left:{left:.2f}%; width:{width:.2f}%;"></div></div>
+            <div class="waterfall-value">{s['duration_ms']:.1f} ms{size}</div></div>""")
+    st.markdown("".join(rows), unsafe_allow_html=True)
+
 def render_learning_step(step_data):
     st.markdown(f"""
     <div class="learning-card">
@@ -27,4 +40,10 @@ def render_learning_step(step_data):
             elif step_data['visual_type'] == "code":
                 st.markdown("**Vom Server empfangene Rohdaten:**")
                 st.code(step_data['data'], language="json")
-            elif step_data['visual_type'] == "error": st.error(f"Fehler: {step_data['data']}")
\ No newline at end of file
+            elif step_data['visual_type'] == "waterfall":
+                render_waterfall(step_data['data'])
+                with st.expander("📋 Spans als Tabelle"): st.dataframe(pd.DataFrame(step_data['data']), hide_index=True, use_container_width=True)
+            elif step_data['visual_type'] == "error": st.error(f"Fehler: {step_data['data']}")
+            if 'timing' in step_data:
+                t = step_data['timing']
+                st.caption(f"⏱️ {t['duration_ms']:.1f} ms · 📦 {t['bytes']} Bytes · 🪙 ~{t['tokens']} Tokens")
\ No newline at end of file
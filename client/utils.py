@@ -1,15 +1,21 @@
 import os
 import json
-import asyncio
 import streamlit as st
+from async_runtime import AsyncRuntime
 
-def get_or_create_eventloop():
-    try:
-        return asyncio.get_event_loop()
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        return loop
+@st.cache_resource
+def get_async_runtime():
+    # Created once per server process and shared by all browser sessions,
+    # so MCP sessions, HTTP pools and caches survive reruns.
+    return AsyncRuntime()
+
+def run_async(coro):
+    return get_async_runtime().run(coro)
+
+def iterate_async(async_gen):
+    # Drives an async generator step by step from Streamlit's sync script,
+    # so every chunk can be rendered as soon as it arrives.
+    return get_async_runtime().iterate(async_gen)
 
 def load_db():
     # Ermittle den Pfad dieses Skripts (client/utils.py)
@@ -0,0 +1,177 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from datetime import timedelta
+
+from mcp import ClientSession
+from mcp.client.sse import sse_client
+
+from mcp_bench.histogram import LatencyHistogram
+
+MCP_URL = "http://localhost:3000/sse"
+DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src", "db.json")
+RESULTS_PATH = "benchmark_results_loadgen.json"
+
+# Every connection asks for "its own" student, so an answer that names a
+# different student id was routed to the wrong SSE stream (cross-talk).
+WORKLOAD_TOOL = "get_student_grades"
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Multi-process, multi-connection SSE load generator")
+    parser.add_argument("--url", default=MCP_URL)
+    parser.add_argument("--connections", type=int, default=16, help="independent SSE sessions in total")
+    parser.add_argument("--processes", type=int, default=min(4, os.cpu_count() or 1))
+    parser.add_argument("--warmup", type=float, default=5.0, help="seconds, one connection per process, not recorded")
+    parser.add_argument("--ramp-up", type=float, default=10.0, help="seconds over which the other connections join")
+    parser.add_argument("--duration", type=float, default=30.0, help="steady-state seconds with all connections")
+    parser.add_argument("--timeout", type=float, default=5.0, help="per-request timeout in seconds")
+    return parser.parse_args()
+
+
+def phase_of(t, plan):
+    if t < plan["rampup_start"]:
+        return "warmup"
+    if t < plan["steady_start"]:
+        return "rampup"
+    return "steady"
+
+
+async def run_connection(conn_id, student_id, start_at, plan, histograms, timeout):
+    stats = {"connection": conn_id, "student_id": student_id, "requests": 0, "errors": 0,
+             "tool_errors": 0, "mismatches": 0, "connect_error": None, "error_types": Counter()}
+    await asyncio.sleep(max(0.0, start_at - time.time()))
+    try:
+        async with sse_client(plan["url"]) as streams:
+            async with ClientSession(streams[0], streams[1], read_timeout_seconds=timedelta(seconds=timeout)) as session:
+                await session.initialize()
+                while time.time() < plan["end"]:
+                    phase = phase_of(time.time(), plan)
+                    start = time.perf_counter_ns()
+                    try:
+                        result = await session.call_tool(WORKLOAD_TOOL, {"query": student_id})
+                    except Exception as e:
+                        stats["requests"] += 1
+                        stats["errors"] += 1
+                        stats["error_types"][type(e).__name__] += 1
+                        continue
+                    elapsed = time.perf_counter_ns() - start
+                    stats["requests"] += 1
+                    text = "".join(getattr(c, "text", "") for c in result.content)
+                    # The server reported a failure: an error, but no evidence of cross-talk
+                    if result.isError:
+                        stats["errors"] += 1
+                        stats["tool_errors"] += 1
+                        stats["error_types"]["tool_error"] += 1
+                        continue
+                    if f"({student_id})" not in text:
+                        stats["errors"] += 1
+                        stats["mismatches"] += 1
+                        continue
+                    histograms[phase].record(elapsed)
+    except Exception as e:
+        # BaseExceptionGroup from anyio wraps the real cause
+        cause = e.exceptions[0] if hasattr(e, "exceptions") and e.exceptions else e
+        stats["connect_error"] = f"{type(cause).__name__}: {cause}"
+    stats["error_types"] = dict(stats["error_types"])
+    return stats
+
+
+async def run_worker(conn_ids, student_ids, plan, timeout):
+    histograms = {phase: LatencyHistogram() for phase in ("warmup", "rampup", "steady")}
+    tasks = []
+    for conn_id in conn_ids:
+        tasks.append(run_connection(conn_id, student_ids[conn_id % len(student_ids)],
+                                    plan["conn_start"][conn_id], plan, histograms, timeout))
+    connections = await asyncio.gather(*tasks)
+    return {"histograms": {phase: h.to_dict() for phase, h in histograms.items()}, "connections": connections}
+
+
+def worker_main(conn_ids, student_ids, plan, timeout):
+    return asyncio.run(run_worker(conn_ids, student_ids, plan, timeout))
+
+
+def make_plan(args):
+    # Wall-clock schedule shared by all processes (perf_counter is per process)
+    t0 = time.time() + 1.0
+    rampup_start = t0 + args.warmup
+    steady_start = rampup_start + args.ramp_up
+    late = list(range(args.processes, args.connections))
+    conn_start = {i: t0 for i in range(min(args.processes, args.connections))}
+    for n, conn_id in enumerate(late):
+        conn_start[conn_id] = rampup_start + args.ramp_up * n / max(1, len(late))
+    return {"url": args.url, "t0": t0, "rampup_start": rampup_start, "steady_start": steady_start,
+            "end": steady_start + args.duration, "conn_start": conn_start}
+
+
+def main():
+    args = parse_args()
+    args.processes = max(1, min(args.processes, args.connections))
+    with open(DB_PATH, "r", encoding="utf-8") as f:
+        student_ids = list(json.load(f)["students"])
+
+    print(f"🔬 SSE load generator: {args.connections} connections in {args.processes} processes against {args.url}")
+    print(f"   warm-up {args.warmup}s → ramp-up {args.ramp_up}s → steady state {args.duration}s")
+
+    plan = make_plan(args)
+    # Connection i lives in process i % P, so the warm-up connections 0..P-1 are one per process
+    assignments = [list(range(p, args.connections, args.processes)) for p in range(args.processes)]
+    with ProcessPoolExecutor(max_workers=args.processes) as pool:
+        futures = [pool.submit(worker_main, conn_ids, student_ids, plan, args.timeout) for conn_ids in assignments]
+        worker_results = [f.result() for f in futures]
+
+    merged = {phase: LatencyHistogram() for phase in ("warmup", "rampup", "steady")}
+    connections = []
+    for result in worker_results:
+        for phase, data in result["histograms"].items():
+            merged[phase].merge(LatencyHistogram.from_dict(data))
+        connections.extend(result["connections"])
+    connections.sort(key=lambda c: c["connection"])
+
+    error_types = Counter()
+    for conn in connections:
+        conn["error_rate"] = round(conn["errors"] / conn["requests"], 4) if conn["requests"] else (1.0 if conn["connect_error"] else 0.0)
+        error_types.update(conn["error_types"])
+        if conn["connect_error"]:
+            error_types["connect:" + conn["connect_error"].split(":")[0]] += 1
+
+    steady = merged["steady"]
+    results = {
+        "last_run_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "type": "sse-loadgen",
+        "config": {"url": args.url, "connections": args.connections, "processes": args.processes,
+                   "warmup_s": args.warmup, "ramp_up_s": args.ramp_up, "duration_s": args.duration,
+                   "timeout_s": args.timeout, "tool": WORKLOAD_TOOL},
+        "steady": {"latency_ms": steady.summary(), "throughput_rps": steady.count / args.duration if args.duration else 0,
+                   "histogram": steady.to_dict()},
+        "rampup": {"latency_ms": merged["rampup"].summary(), "histogram": merged["rampup"].to_dict()},
+        "connections": connections,
+        "connections_failed": sum(1 for c in connections if c["connect_error"]),
+        "tool_errors": sum(c["tool_errors"] for c in connections),
+        "mismatches": sum(c["mismatches"] for c in connections),
+        "error_types": dict(error_types),
+    }
+    with open(RESULTS_PATH, "w") as f:
+        json.dump(results, f, indent=2)
+
+    latency = results["steady"]["latency_ms"]
+    print(f"\n=== STEADY STATE: {results['steady']['throughput_rps']:.1f} req/s, p50={latency['p50_ms']:.2f} ms, "
+          f"p99={latency['p99_ms']:.2f} ms, p99.9={latency['p999_ms']:.2f} ms ===")
+    print("\nConnection  Requests  Errors  Tool errors  Mismatches  Error rate")
+    for conn in connections:
+        note = f"  ❌ {conn['connect_error']}" if conn["connect_error"] else ""
+        print(f"{conn['connection']:>10}  {conn['requests']:>8}  {conn['errors']:>6}  {conn['tool_errors']:>11}  "
+              f"{conn['mismatches']:>10}  {conn['error_rate']:>10.2%}{note}")
+    if results["tool_errors"]:
+        print(f"\n⚠️ {results['tool_errors']} calls returned a tool error (isError) from the server.")
+    if results["mismatches"]:
+        print(f"\n⚠️ {results['mismatches']} answers belonged to another connection (cross-talk between SSE sessions).")
+    print(f"\n✅ Results saved to {RESULTS_PATH}")
+
+
+if __name__ == "__main__":
+    main()
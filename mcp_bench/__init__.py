@@ -0,0 +1,13 @@
+"""Benchmark harness for the DHBW MCP server.
+
+One engine for every transport: `python -m mcp_bench --transport sse|stdio|streamable-http
+--workload <file>`. benchmark.py and benchmark_stdio.py are kept as shortcuts.
+"""
+
+from .histogram import LatencyHistogram
+from .harness import SCHEMA_VERSION, run_benchmark
+from .transports import TRANSPORTS, transport
+from .workload import WorkloadError, load_workload
+
+__all__ = ["LatencyHistogram", "SCHEMA_VERSION", "run_benchmark", "TRANSPORTS", "transport",
+           "WorkloadError", "load_workload"]
@@ -0,0 +1,273 @@
+import argparse
+import asyncio
+import json
+import sys
+
+from .coldstart import LAUNCH_MODES, RESULTS_PATH as COLDSTART_RESULTS_PATH, RUN_TIMEOUT, run_coldstart
+from .compare import DEFAULT_ALPHA, DEFAULT_MIN_EFFECT, compare_runs
+from .datagen import DATA_DIR, write_variant
+from .harness import run_benchmark
+from .history import HISTORY_PATH, append_run, find_run, load_runs, previous_run
+from .pipeline import (DEFAULT_LLM_PORT, DEFAULT_MCP_URL, DEFAULT_PIPELINE_WORKLOAD, RESULTS_PATH as PIPELINE_RESULTS_PATH,
+                       run_pipeline_benchmark)
+from .profiling import DEFAULT_SAMPLE_INTERVAL, PROFILE_DIR, PROFILE_MODES, RunProfiler
+from .scaling import DEFAULT_SERVER, DEFAULT_SIZES, RESULTS_PATH as SCALE_RESULTS_PATH, run_scaling
+from .soak import (DEFAULT_DURATION, DEFAULT_MAX_FD_GROWTH, DEFAULT_MAX_HEAP_GROWTH_KB, DEFAULT_MAX_RSS_GROWTH_KB,
+                   DEFAULT_SAMPLE_INTERVAL as SOAK_SAMPLE_INTERVAL, RESULTS_PATH as SOAK_RESULTS_PATH, SOAK_MODES, run_soak)
+from .store_bench import DEFAULT_FUZZY_QUERIES, RESULTS_PATH as STORE_RESULTS_PATH, run_store_benchmark
+from .transports import TRANSPORTS, get_transport
+from .workload import DEFAULT_WORKLOAD, load_workload
+
+PHASES = ("tools", "mix", "resources")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m mcp_bench", description="MCP benchmark harness")
+    parser.add_argument("--transport", choices=sorted(TRANSPORTS), default="sse")
+    parser.add_argument("--target", help="URL (sse, streamable-http) or server command (stdio); defaults per transport")
+    parser.add_argument("--workload", default=DEFAULT_WORKLOAD, help="workload JSON file")
+    parser.add_argument("--phases", nargs="+", choices=PHASES, default=list(PHASES))
+    parser.add_argument("--iterations", type=int, help="override requests per tool")
+    parser.add_argument("--concurrency", type=int, help="override max requests in flight")
+    parser.add_argument("--sweep", type=int, metavar="MAX", help="also run each tool at concurrency 1, 2, 4, ... MAX")
+    parser.add_argument("--rate", type=float, metavar="RPS", help="open loop: send at this rate instead of N concurrent workers")
+    parser.add_argument("--arrivals", choices=("uniform", "poisson"), default="uniform", help="inter-arrival distribution for --rate")
+    parser.add_argument("--seed", type=int, help="seed for Poisson arrivals and the mixed workload")
+    parser.add_argument("--output", help="results file; defaults per transport")
+    parser.add_argument("--history", default=HISTORY_PATH, help="append-only JSONL run history")
+    parser.add_argument("--no-history", action="store_true", help="don't record this run in the history")
+    add_profile_arguments(parser)
+    return parser
+
+
+def add_profile_arguments(parser):
+    parser.add_argument("--profile", choices=PROFILE_MODES, help="profile the client: cProfile or sampled collapsed stacks")
+    parser.add_argument("--profile-dir", default=PROFILE_DIR)
+    parser.add_argument("--profile-interval", type=float, default=DEFAULT_SAMPLE_INTERVAL, help="seconds between stack samples")
+
+
+def build_compare_parser():
+    parser = argparse.ArgumentParser(prog="python -m mcp_bench compare",
+                                     description="Flag per-tool latency regressions between two recorded runs")
+    parser.add_argument("--history", default=HISTORY_PATH)
+    parser.add_argument("--baseline", default="previous", help="run id / git commit prefix, 'latest' or 'previous'")
+    parser.add_argument("--candidate", default="latest", help="run id / git commit prefix, 'latest' or 'previous'")
+    parser.add_argument("--transport", help="only consider runs over this transport (default: the candidate's)")
+    parser.add_argument("--any-host", action="store_true", help="also compare against runs from other machines")
+    parser.add_argument("--test", choices=("mannwhitney", "bootstrap"), default="mannwhitney")
+    parser.add_argument("--percentile", type=float, default=50, help="percentile compared for the effect size (and bootstrap)")
+    parser.add_argument("--alpha", type=float, default=DEFAULT_ALPHA, help="significance level")
+    parser.add_argument("--min-effect", type=float, default=DEFAULT_MIN_EFFECT, help="minimum relative slowdown, e.g. 0.05")
+    return parser
+
+
+def history_main(argv):
+    parser = argparse.ArgumentParser(prog="python -m mcp_bench history", description="List recorded benchmark runs")
+    parser.add_argument("--history", default=HISTORY_PATH)
+    parser.add_argument("--transport")
+    options = parser.parse_args(argv)
+    runs = load_runs(options.history, transport=options.transport)
+    if not runs:
+        print(f"No runs recorded in {options.history}.")
+        return 0
+    print(f"{'Run':<10}{'Recorded (UTC)':<22}{'Commit':<18}{'Transport':<17}{'Workload':<12}{'Host':<14}{'p99 tools':>10}")
+    for run in runs:
+        p99 = run["results"].get("overall_latency_tools_ms", {}).get("p99_ms")
+        print(f"{run['run_id'][:8]:<10}{run['recorded_utc']:<22}{(run.get('git_commit') or '-')[:16]:<18}"
+              f"{run['transport'] or '-':<17}{run.get('workload') or '-':<12}{run['host_fingerprint']:<14}"
+              f"{f'{p99:.2f} ms' if p99 is not None else '-':>10}")
+    return 0
+
+
+def compare_main(argv):
+    options = build_compare_parser().parse_args(argv)
+    runs = load_runs(options.history, transport=options.transport)
+    candidate = find_run(runs, options.candidate)
+    if candidate is None:
+        print(f"❌ Candidate run '{options.candidate}' not found in {options.history}.")
+        return 2
+    # Baseline: same transport and workload, and the same machine unless --any-host
+    runs = load_runs(options.history, transport=candidate["transport"], workload=candidate.get("workload"),
+                     host=None if options.any_host else candidate["host_fingerprint"])
+    if options.baseline == "previous":
+        baseline = previous_run(runs, candidate)
+    else:
+        baseline = find_run(runs, options.baseline)
+    if baseline is None:
+        print(f"❌ No baseline '{options.baseline}' for transport '{candidate['transport']}' on this host.")
+        return 2
+    if baseline["host_fingerprint"] != candidate["host_fingerprint"]:
+        print("⚠️ Baseline and candidate ran on different hosts; differences may not be caused by the code.")
+
+    print(f"Baseline : {baseline['run_id'][:8]} ({(baseline.get('git_commit') or '-')[:12]}, {baseline['recorded_utc']})")
+    print(f"Candidate: {candidate['run_id'][:8]} ({(candidate.get('git_commit') or '-')[:12]}, {candidate['recorded_utc']})")
+    print(f"Test: {options.test}, p{options.percentile:g}, alpha={options.alpha}, min effect={options.min_effect:.0%}\n")
+
+    rows = compare_runs(baseline, candidate, options.test, options.alpha, options.min_effect, options.percentile)
+    icons = {"regression": "❌", "improvement": "✅", "no change": "  "}
+    for row in rows:
+        if "p_value" not in row:
+            print(f"   {row['name']:<32} {row['verdict']}")
+            continue
+        print(f"{icons[row['verdict']]} {row['name']:<32} {row['baseline_ms']:9.2f} → {row['candidate_ms']:9.2f} ms "
+              f"({row['change']:+.1%}, p99 {row['baseline_p99_ms']:.2f} → {row['candidate_p99_ms']:.2f} ms, "
+              f"p={row['p_value']:.4f})  {row['verdict']}")
+
+    regressions = [row["name"] for row in rows if row["verdict"] == "regression"]
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("\n✅ No significant regressions.")
+    return 0
+
+
+def add_data_arguments(parser):
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="student counts, e.g. 1000 10000 100000 1000000")
+    parser.add_argument("--data-dir", default=DATA_DIR)
+    parser.add_argument("--grades-per-student", type=int, default=6)
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def generate_data_main(argv):
+    parser = argparse.ArgumentParser(prog="python -m mcp_bench generate-data",
+                                     description="Write scaled db.json variants for the lookup-scaling benchmark")
+    add_data_arguments(parser)
+    options = parser.parse_args(argv)
+    for students in options.sizes:
+        path, meta = write_variant(students, options.data_dir, grades_per_student=options.grades_per_student, seed=options.seed)
+        print(f"✅ {path}: {meta['students']:,} students ({meta['distinct_spellings']:,} distinct names), "
+              f"{meta['grades']:,} grades, {meta['modules']:,} modules, "
+              f"{meta['bytes'] / 2 ** 20:.1f} MB")
+    return 0
+
+
+def scale_main(argv):
+    parser = argparse.ArgumentParser(prog="python -m mcp_bench scale",
+                                     description="Latency and memory of every lookup path against data size (stdio)")
+    add_data_arguments(parser)
+    parser.add_argument("--iterations", type=int, default=50, help="sequential calls per probe and size")
+    parser.add_argument("--server", default=DEFAULT_SERVER, help="server command; {dir} is the staged server directory")
+    parser.add_argument("--output", default=SCALE_RESULTS_PATH)
+    options = parser.parse_args(argv)
+    asyncio.run(run_scaling(options))
+    return 0
+
+
+def store_main(argv):
+    parser = argparse.ArgumentParser(prog="python -m mcp_bench store",
+                                     description="In-memory AcademicStore and SQLite backend vs. the server's linear scans, in process")
+    add_data_arguments(parser)
+    parser.add_argument("--iterations", type=int, default=200, help="lookups per probe, side and size")
+    parser.add_argument("--fuzzy-queries", type=int, default=DEFAULT_FUZZY_QUERIES,
+                        help="sampled student names per size for the fuzzy search recall (exact, typo, umlaut variants)")
+    parser.add_argument("--output", default=STORE_RESULTS_PATH)
+    options = parser.parse_args(argv)
+    run_store_benchmark(options)
+    return 0
+
+
+def coldstart_main(argv):
+    parser = argparse.ArgumentParser(prog="python -m mcp_bench coldstart",
+                                     description="Spawn -> initialize -> list_tools -> first call_tool, N times per launch mode")
+    parser.add_argument("--modes", nargs="+", choices=sorted(LAUNCH_MODES), default=list(LAUNCH_MODES))
+    parser.add_argument("--mode", action="append", metavar="NAME=TRANSPORT:COMMAND", help="extra launch mode, repeatable")
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--tool", default="get_student_grades")
+    parser.add_argument("--args", type=json.loads, default={"query": "s1001"}, help="JSON arguments for the first call")
+    parser.add_argument("--timeout", type=float, default=RUN_TIMEOUT, help="seconds per cold start before it counts as failed")
+    parser.add_argument("--build", action="store_true", help="run tsc first so the *-node modes have dist/")
+    parser.add_argument("--output", default=COLDSTART_RESULTS_PATH)
+    options = parser.parse_args(argv)
+    asyncio.run(run_coldstart(options))
+    return 0
+
+
+def add_pipeline_arguments(parser, workload_flag="--workload"):
+    parser.add_argument(workload_flag, dest="pipeline_workload", default=DEFAULT_PIPELINE_WORKLOAD,
+                        help="pipeline workload JSON (prompts + scripted router decisions)")
+    parser.add_argument("--router-latency", help="mock router latency spec, e.g. lognormal:450:0.35 (default: from the workload)")
+    parser.add_argument("--final-latency", help="mock answer latency spec, e.g. normal:1200:300 (default: from the workload)")
+    parser.add_argument("--llm-port", type=int, default=DEFAULT_LLM_PORT, help="port for the in-process mock LLM")
+    parser.add_argument("--mcp-url", default=DEFAULT_MCP_URL)
+    parser.add_argument("--no-client-caches", action="store_true",
+                        help="disable the local router, router cache and result cache so every request takes the full path")
+
+
+def pipeline_main(argv):
+    parser = argparse.ArgumentParser(prog="python -m mcp_bench pipeline",
+                                     description="End-to-end execute_mcp_pipeline benchmark with a mock LLM (needs the MCP server)")
+    add_pipeline_arguments(parser)
+    parser.add_argument("--iterations", type=int, help="pipeline runs per concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", help="concurrency levels, e.g. 1 4 16")
+    parser.add_argument("--rate", type=float, metavar="RPS", help="open loop: start pipelines at this rate instead")
+    parser.add_argument("--arrivals", choices=("uniform", "poisson"), default="uniform")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--output", default=PIPELINE_RESULTS_PATH)
+    add_profile_arguments(parser)
+    options = parser.parse_args(argv)
+    asyncio.run(run_pipeline_benchmark(options))
+    return 0
+
+
+def soak_main(argv):
+    parser = argparse.ArgumentParser(prog="python -m mcp_bench soak",
+                                     description="Hours of tool calls and/or pipeline runs with connection churn; fails on memory growth")
+    parser.add_argument("--modes", nargs="+", choices=SOAK_MODES, default=list(SOAK_MODES), help="rounds alternate between these")
+    parser.add_argument("--duration", default=DEFAULT_DURATION, help="e.g. 90s, 30m, 4h")
+    parser.add_argument("--churn-every", type=int, default=200, help="requests per connection before it is torn down")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--sample-interval", type=float, default=SOAK_SAMPLE_INTERVAL, help="seconds between memory samples")
+    parser.add_argument("--no-tracemalloc", action="store_true", help="RSS only; tracemalloc roughly doubles client CPU")
+    parser.add_argument("--tracemalloc-frames", type=int, default=1, help="frames kept per allocation")
+    parser.add_argument("--retain-history", action="store_true", help="keep every chat message like st.session_state.messages does")
+    parser.add_argument("--max-rss-growth", type=float, default=DEFAULT_MAX_RSS_GROWTH_KB, help="KB per 1000 requests")
+    parser.add_argument("--max-heap-growth", type=float, default=DEFAULT_MAX_HEAP_GROWTH_KB, help="KB per 1000 requests")
+    parser.add_argument("--max-fd-growth", type=float, default=DEFAULT_MAX_FD_GROWTH, help="open file descriptors per 1000 requests")
+    parser.add_argument("--transport", choices=sorted(TRANSPORTS), default="sse", help="transport for the tool rounds")
+    parser.add_argument("--target", help="URL or server command for the tool rounds; defaults per transport")
+    parser.add_argument("--workload", default=DEFAULT_WORKLOAD, help="tool workload JSON for the tool rounds")
+    add_pipeline_arguments(parser, "--pipeline-workload")
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--output", default=SOAK_RESULTS_PATH)
+    options = parser.parse_args(argv)
+    results = asyncio.run(run_soak(options))
+    return 1 if results["failures"] else 0
+
+
+SUBCOMMANDS = {"compare": compare_main, "history": history_main, "generate-data": generate_data_main, "scale": scale_main,
+               "store": store_main, "coldstart": coldstart_main, "pipeline": pipeline_main, "soak": soak_main}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in SUBCOMMANDS:
+        return SUBCOMMANDS[argv[0]](argv[1:])
+
+    options = build_parser().parse_args(argv)
+    output = options.output or get_transport(options.transport)["results_file"]
+    try:
+        workload = load_workload(options.workload)
+        with RunProfiler(options.profile, options.transport, options.profile_dir, options.profile_interval) as profiler:
+            results = asyncio.run(run_benchmark(options.transport, workload, options))
+    except Exception as e:
+        print(f"\n❌ Error during benchmark: {e}")
+        import traceback
+        traceback.print_exc()
+        return 1
+
+    if profiler.report:
+        results["profile"] = profiler.report
+        profiler.print_summary()
+    with open(output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n\n✅ Benchmark complete. Results saved to {output}")
+    if not options.no_history:
+        record = append_run(results, options.history)
+        print(f"🗂️ Recorded as run {record['run_id'][:8]} in {options.history}")
+
+    if "overall_avg_latency_tools" in results:
+        print(f"\n\n=== OVERALL AVERAGE LATENCY (TOOLS): {results['overall_avg_latency_tools']:.2f} ms ===")
+        print(f"=== OVERALL P99 LATENCY (TOOLS): {results['overall_latency_tools_ms']['p99_ms']:.2f} ms ===")
+    if "overall_avg_latency_resources" in results:
+        print(f"=== OVERALL AVERAGE LATENCY (RESOURCES): {results['overall_avg_latency_resources']:.2f} ms ===")
+    return 0
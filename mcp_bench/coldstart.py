@@ -0,0 +1,169 @@
+import asyncio
+import json
+import os
+import shlex
+import signal
+import socket
+import subprocess
+import time
+
+from .histogram import LatencyHistogram
+from .transports import get_transport
+
+RESULTS_PATH = "benchmark_results_coldstart.json"
+BUILD_COMMAND = "npx tsc"
+RUN_TIMEOUT = 60.0
+
+# name -> (transport, server command). The *-node modes run the tsc output
+# from dist/, the *-tsx modes transpile on every start.
+LAUNCH_MODES = {
+    "stdio-tsx": ("stdio", "npx tsx src/index_stdio.ts"),
+    "stdio-node": ("stdio", "node dist/index_stdio.js"),
+    "sse-tsx": ("sse", "npx tsx src/index.ts"),
+    "sse-node": ("sse", "node dist/index.js"),
+}
+
+PHASES = {
+    "stdio": ("spawn_ms", "initialize_ms", "list_tools_ms", "first_call_ms", "warm_call_ms", "total_ms"),
+    "sse": ("spawn_ms", "ready_ms", "connect_ms", "initialize_ms", "list_tools_ms", "first_call_ms", "warm_call_ms", "total_ms"),
+}
+
+
+def _ms(start_ns, end_ns):
+    return (end_ns - start_ns) / 1e6
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def wait_for_port(port):
+    # The caller's per-run timeout bounds this loop
+    while True:
+        try:
+            _, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.close()
+            return
+        except OSError:
+            await asyncio.sleep(0.005)
+
+
+async def _session_phases(session, tool, args, phases, t_prev):
+    await session.initialize()
+    t_init = time.perf_counter_ns()
+    await session.list_tools()
+    t_list = time.perf_counter_ns()
+    await session.call_tool(tool, args)
+    t_first = time.perf_counter_ns()
+    await session.call_tool(tool, args)
+    t_warm = time.perf_counter_ns()
+    phases.update(initialize_ms=_ms(t_prev, t_init), list_tools_ms=_ms(t_init, t_list),
+                  first_call_ms=_ms(t_list, t_first), warm_call_ms=_ms(t_first, t_warm))
+    return t_first
+
+
+async def cold_start_stdio(command, tool, args):
+    phases = {}
+    start = time.perf_counter_ns()
+    # Entering the stdio context spawns the process; initialize then waits for transpile + module load
+    async with get_transport("stdio")["open"](command) as session:
+        t_spawn = time.perf_counter_ns()
+        phases["spawn_ms"] = _ms(start, t_spawn)
+        first_call_done = await _session_phases(session, tool, args, phases, t_spawn)
+    # Spawn to first answer; the warm call is only there for comparison
+    phases["total_ms"] = _ms(start, first_call_done)
+    return phases
+
+
+async def cold_start_sse(command, tool, args):
+    phases = {}
+    port = free_port()
+    start = time.perf_counter_ns()
+    process = subprocess.Popen(shlex.split(command), env={**os.environ, "PORT": str(port)},
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, start_new_session=True)
+    try:
+        t_spawn = time.perf_counter_ns()
+        await wait_for_port(port)
+        t_ready = time.perf_counter_ns()
+        async with get_transport("sse")["open"](f"http://127.0.0.1:{port}/sse") as session:
+            t_connect = time.perf_counter_ns()
+            phases.update(spawn_ms=_ms(start, t_spawn), ready_ms=_ms(t_spawn, t_ready), connect_ms=_ms(t_ready, t_connect))
+            first_call_done = await _session_phases(session, tool, args, phases, t_connect)
+        phases["total_ms"] = _ms(start, first_call_done)
+    finally:
+        # npx starts node as a child; kill the whole process group
+        try:
+            os.killpg(process.pid, signal.SIGTERM)
+        except (ProcessLookupError, PermissionError):
+            pass
+        try:
+            process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            os.killpg(process.pid, signal.SIGKILL)
+    return phases
+
+
+def build_once():
+    start = time.perf_counter_ns()
+    # tsc emits even when type checking reports errors; dist/ is what matters here
+    completed = subprocess.run(shlex.split(BUILD_COMMAND), capture_output=True, text=True)
+    build_ms = _ms(start, time.perf_counter_ns())
+    if completed.returncode != 0:
+        print(f"⚠️ {BUILD_COMMAND} exited with {completed.returncode} (type errors are expected to still emit JS)")
+    return build_ms
+
+
+async def run_coldstart(options):
+    modes = {name: LAUNCH_MODES[name] for name in options.modes}
+    for spec in options.mode or []:
+        # NAME=TRANSPORT:COMMAND, e.g. bun-stdio=stdio:"bun src/index_stdio.ts"
+        name, rest = spec.split("=", 1)
+        transport_name, command = rest.split(":", 1)
+        modes[name] = (transport_name, command)
+
+    results = {"last_run_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "type": "coldstart",
+               "runs": options.runs, "tool": options.tool, "args": options.args, "modes": {}}
+    if options.build:
+        results["build_ms"] = build_once()
+        print(f"🔨 {BUILD_COMMAND}: {results['build_ms']:.0f} ms")
+
+    for name, (transport_name, command) in modes.items():
+        entry = shlex.split(command)[-1]
+        if entry.startswith("dist") and not os.path.exists(entry):
+            print(f"\n⚠️ Skipping '{name}': {entry} not found (run with --build).")
+            continue
+        print(f"\n🚀 {name}: {command} ({options.runs} runs)")
+        cold_start = cold_start_stdio if transport_name == "stdio" else cold_start_sse
+        histograms = {phase: LatencyHistogram() for phase in PHASES[transport_name]}
+        runs, errors = [], []
+        for i in range(options.runs):
+            try:
+                # A server that never comes up (e.g. npx fetching tsx offline) must not hang the run
+                phases = await asyncio.wait_for(cold_start(command, options.tool, options.args), options.timeout)
+            except Exception as e:
+                cause = e.exceptions[0] if hasattr(e, "exceptions") and e.exceptions else e
+                errors.append(f"{type(cause).__name__}: {cause or f'no first answer within {options.timeout:g}s'}")
+                print(f"   run {i + 1}: ❌ {errors[-1]}")
+                continue
+            runs.append(phases)
+            for phase, value in phases.items():
+                histograms[phase].record(value * 1e6)
+            print(f"   run {i + 1}: " + "  ".join(f"{p.replace('_ms', '')}={v:.0f}" for p, v in phases.items()) + " ms")
+        results["modes"][name] = {
+            "transport": transport_name,
+            "command": command,
+            "phases": {phase: h.summary() for phase, h in histograms.items()},
+            "runs": runs,
+            "errors": errors,
+        }
+
+    print("\n=== TIME TO FIRST CALL (p50 / max, ms) ===")
+    for name, mode in results["modes"].items():
+        total = mode["phases"]["total_ms"]
+        print(f"   {name:<12} {total['p50_ms']:9.1f} / {total['max_ms']:9.1f}   ({len(mode['errors'])} failed)")
+    with open(options.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✅ Results saved to {options.output}")
+    return results
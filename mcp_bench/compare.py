@@ -0,0 +1,117 @@
+import math
+import random
+
+from .histogram import LatencyHistogram
+
+# Both tests work directly on the stored histograms: every bucket stands for
+# `count` samples at the bucket's value. At 3 significant digits that costs
+# a little power to ties but needs no raw samples in the history file.
+
+DEFAULT_ALPHA = 0.01
+DEFAULT_MIN_EFFECT = 0.05
+BOOTSTRAP_ROUNDS = 1000
+
+
+def _buckets(hist):
+    return sorted(hist.counts.items())
+
+
+def mann_whitney_greater(baseline, candidate):
+    """One-sided p-value for "candidate latencies are stochastically larger".
+
+    Normal approximation with tie correction; ties are whole buckets.
+    """
+    n_a, n_b = baseline.count, candidate.count
+    if not n_a or not n_b:
+        return 1.0
+    values = sorted(set(baseline.counts) | set(candidate.counts))
+    below, rank_sum_b, tie_term = 0, 0.0, 0
+    for value in values:
+        a, b = baseline.counts.get(value, 0), candidate.counts.get(value, 0)
+        tied = a + b
+        rank_sum_b += b * (below + (tied + 1) / 2)
+        tie_term += tied ** 3 - tied
+        below += tied
+    n = n_a + n_b
+    u_b = rank_sum_b - n_b * (n_b + 1) / 2
+    mean = n_a * n_b / 2
+    variance = n_a * n_b / 12 * ((n + 1) - tie_term / (n * (n - 1)))
+    if variance <= 0:
+        return 1.0
+    z = (u_b - mean - 0.5) / math.sqrt(variance)  # continuity correction
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def _resample_percentile(buckets, n, percentile, rng):
+    values = [value for value, _ in buckets]
+    weights = [count for _, count in buckets]
+    sample = sorted(rng.choices(values, weights, k=n))
+    return sample[max(0, math.ceil(n * percentile / 100) - 1)]
+
+
+def bootstrap_greater(baseline, candidate, percentile=50, rounds=BOOTSTRAP_ROUNDS, seed=0):
+    """One-sided bootstrap p-value for "candidate percentile > baseline percentile"."""
+    if not baseline.count or not candidate.count:
+        return 1.0
+    rng = random.Random(seed)
+    base_buckets, cand_buckets = _buckets(baseline), _buckets(candidate)
+    # Resampling thousands of values per round is the slow part; cap the sample size
+    n_a, n_b = min(baseline.count, 5000), min(candidate.count, 5000)
+    not_slower = sum(
+        1 for _ in range(rounds)
+        if _resample_percentile(cand_buckets, n_b, percentile, rng) <= _resample_percentile(base_buckets, n_a, percentile, rng)
+    )
+    return (not_slower + 1) / (rounds + 1)
+
+
+def comparable_histograms(results):
+    """Name -> histogram for every measured tool, resource family and the mix."""
+    histograms = {}
+    for name, tool in results.get("tools", {}).items():
+        if "histogram" in tool:
+            histograms[name] = LatencyHistogram.from_dict(tool["histogram"])
+    for family, resource in results.get("resources", {}).items():
+        if "reads" in resource:
+            histograms[f"resource:{family}"] = LatencyHistogram.from_dict(resource["reads"]["histogram"])
+    if "histogram" in results.get("mix", {}):
+        histograms["mix"] = LatencyHistogram.from_dict(results["mix"]["histogram"])
+    return histograms
+
+
+def compare_runs(baseline, candidate, test="mannwhitney", alpha=DEFAULT_ALPHA,
+                 min_effect=DEFAULT_MIN_EFFECT, percentile=50):
+    """Per-name verdicts. A regression must be significant *and* at least
+    `min_effect` slower at the compared percentile, so noise on a large
+    sample does not fail the build over a 0.5% shift."""
+    base_hists = comparable_histograms(baseline["results"])
+    cand_hists = comparable_histograms(candidate["results"])
+    rows = []
+    for name in sorted(set(base_hists) | set(cand_hists)):
+        base, cand = base_hists.get(name), cand_hists.get(name)
+        if base is None or cand is None:
+            rows.append({"name": name, "verdict": "missing in " + ("baseline" if base is None else "candidate")})
+            continue
+        base_p, cand_p = base.percentile_ns(percentile), cand.percentile_ns(percentile)
+        ratio = cand_p / base_p if base_p else float("inf")
+        if test == "bootstrap":
+            greater = lambda a, b: bootstrap_greater(a, b, percentile)
+        else:
+            greater = mann_whitney_greater
+        p_value = greater(base, cand)
+        if p_value < alpha and ratio > 1 + min_effect:
+            verdict = "regression"
+        elif ratio < 1 - min_effect and greater(cand, base) < alpha:
+            verdict = "improvement"
+        else:
+            verdict = "no change"
+        rows.append({
+            "name": name,
+            "baseline_ms": base_p / 1e6,
+            "candidate_ms": cand_p / 1e6,
+            "change": ratio - 1,
+            "baseline_p99_ms": base.percentile_ns(99) / 1e6,
+            "candidate_p99_ms": cand.percentile_ns(99) / 1e6,
+            "p_value": p_value,
+            "verdict": verdict,
+        })
+    return rows
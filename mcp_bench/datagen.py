@@ -0,0 +1,234 @@
+import copy
+import itertools
+import json
+import os
+import random
+
+# Synthetic db.json variants for lookup-scaling benchmarks. The original
+# src/db.json records come first (so the default workload still resolves),
+# the synthetic bulk follows, and one "probe" entity per kind goes last with
+# a name that is not a substring of anything before it: looking it up forces
+# the server's linear scans (findStudentId, findProfessorId, findModule)
+# over the whole collection.
+
+BASE_DB_PATH = os.path.join("src", "db.json")
+DATA_DIR = "bench_data"
+# Bumped whenever generate_db() output changes; cached variants of older versions are regenerated
+GENERATOR_VERSION = 2
+
+# Ordered by frequency; drawn with Zipf weights so common names repeat like
+# they do in a real student body
+FIRST_NAMES = ["Maximilian", "Sophie", "Alexander", "Marie", "Paul", "Anna", "Leon", "Laura", "Lukas", "Lea",
+               "Felix", "Hannah", "Jonas", "Lena", "Tim", "Julia", "David", "Sarah", "Niklas", "Emma",
+               "Jan", "Mia", "Moritz", "Lisa", "Elias", "Katharina", "Finn", "Johanna", "Tobias", "Clara",
+               "Mehmet", "Elif", "Luca", "Sofia", "Noah", "Amelie", "Ben", "Charlotte", "Emil", "Nina",
+               "Ahmet", "Zeynep", "Ivan", "Olga", "Wei", "Mei", "Arjun", "Priya", "Jakub", "Zofia"]
+LAST_NAMES = ["Müller", "Schmidt", "Schneider", "Fischer", "Weber", "Meyer", "Wagner", "Becker", "Schulz", "Hoffmann",
+              "Schäfer", "Koch", "Bauer", "Richter", "Klein", "Wolf", "Schröder", "Neumann", "Schwarz", "Zimmermann",
+              "Braun", "Krüger", "Hofmann", "Hartmann", "Lange", "Schmitt", "Werner", "Schmitz", "Krause", "Meier",
+              "Lehmann", "Schmid", "Schulze", "Maier", "Köhler", "Herrmann", "König", "Walter", "Mayer", "Huber",
+              "Kaiser", "Fuchs", "Peters", "Lang", "Scholz", "Möller", "Weiß", "Jung", "Hahn", "Yılmaz",
+              "Kaya", "Nowak", "Kowalski", "Nguyen", "Popescu", "Rossi", "Ivanov", "Wang", "Öztürk", "Demir"]
+# Ranks past the lists above continue into synthetic names built from
+# syllables ("Brauklinger", "Wendaus"), so the number of distinct names keeps
+# growing with the population like a real long tail instead of saturating at
+# 50 x 60 combinations. Each rank maps to one fixed name.
+ONSETS = ["b", "br", "d", "f", "g", "gr", "h", "k", "kl", "l", "m", "n", "p", "r", "s", "sch", "st", "t", "w", "z"]
+NUCLEI = ["a", "e", "i", "o", "u", "ä", "ö", "ü", "au", "ei"]
+CODAS = ["", "l", "n", "r", "s", "t", "ck", "ld", "nd", "rt", "st", "tz"]
+SYLLABLES = [o + n + c for o, n, c in itertools.product(ONSETS, NUCLEI, CODAS)]
+FIRST_NAME_ENDINGS = ["a", "o", "ina", "ian", "ek", "is", "en", "ia"]
+LAST_NAME_ENDINGS = ["mann", "er", "inger", "hausen", "berg", "feld", "bauer", "meier", "ke", "bach", "ow", "ski"]
+# Zipf exponents of the name ranks: first names concentrate more than last names
+FIRST_NAME_ZIPF = 1.1
+LAST_NAME_ZIPF = 0.9
+
+SUBJECTS = ["Datenbanken", "Web Engineering", "Software Engineering", "Betriebssysteme", "Rechnernetze",
+            "Mathematik", "Statistik", "Rechnungswesen", "Controlling", "Marketing", "Projektmanagement",
+            "IT-Sicherheit", "Künstliche Intelligenz", "Data Science", "Verteilte Systeme", "Compilerbau",
+            "Theoretische Informatik", "Wirtschaftsrecht", "Unternehmensführung", "Geschäftsprozesse",
+            "ERP-Systeme", "Cloud Computing", "Mobile Computing", "Mensch-Computer-Interaktion", "Logistik",
+            "Finanzierung", "Volkswirtschaftslehre", "Kommunikation", "Algorithmen", "Programmieren"]
+LEVELS = ["I", "II", "III", "Grundlagen", "Vertiefung", "Projekt", "Seminar", "Labor"]
+PROGRAMS = ["Wirtschaftsinformatik", "Informatik", "BWL", "Wirtschaftsingenieurwesen", "Data Science", "Angewandte Informatik"]
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]
+SLOTS = ["09:00 - 12:15", "13:00 - 16:15", "14:00 - 17:15"]
+GRADES = [1.0, 1.3, 1.7, 2.0, 2.3, 2.7, 3.0, 3.3, 3.7, 4.0, 5.0]
+SEMESTERS = ["WS23/24", "SS24", "WS24/25", "SS25"]
+
+PROBE_STUDENT = "Probestudentin Zuletzt"
+PROBE_PROFESSOR = "Prof. Dr. Q. Probeprofessorin"
+PROBE_MODULE = "Probemodul Zuletzt"
+PROBE_COURSE = "Probekurs Zuletzt"
+
+
+def _zipf_weights(n, s=1.0):
+    return [1 / (rank + 1) ** s for rank in range(n)]
+
+
+def synthetic_name(rank, endings):
+    """The name for a rank past the common-name lists: syllables in mixed radix plus an ending."""
+    rank, ending = divmod(rank, len(endings))
+    parts = []
+    while True:
+        rank, syllable = divmod(rank, len(SYLLABLES))
+        parts.append(SYLLABLES[syllable])
+        if not rank:
+            break
+        rank -= 1
+    return ("".join(parts) + endings[ending]).capitalize()
+
+
+class NameSampler:
+    """Zipf-distributed names over `common` followed by `tail` synthetic ranks."""
+
+    def __init__(self, common, endings, tail, s):
+        self.common = common
+        self.endings = endings
+        self.cum_weights = list(itertools.accumulate(_zipf_weights(len(common) + tail, s)))
+        self.ranks = range(len(self.cum_weights))
+        self.names = {}
+
+    def __call__(self, rng):
+        rank = rng.choices(self.ranks, cum_weights=self.cum_weights)[0]
+        if rank < len(self.common):
+            return self.common[rank]
+        name = self.names.get(rank)
+        if name is None:
+            name = self.names[rank] = synthetic_name(rank - len(self.common), self.endings)
+        return name
+
+
+def _slug(text):
+    text = text.lower().replace("ä", "ae").replace("ö", "oe").replace("ü", "ue").replace("ß", "ss")
+    return "".join(ch for ch in text if ch.isascii() and ch.isalnum())[:16]
+
+
+def generate_db(students, base=None, grades_per_student=6, seed=0):
+    """Returns (db, meta) with `students` students in total.
+
+    Professors, modules and courses grow with the student count at roughly
+    DHBW ratios (1 professor per 40 students, 1 module per 50, 1 course
+    cohort per 300).
+    """
+    rng = random.Random(seed)
+    db = copy.deepcopy(base) if base else {}
+    for key in ("professors", "students", "courses", "grades", "schedule"):
+        db.setdefault(key, {})
+    # The tail grows with the population, so bigger variants also meet rarer names
+    first_name = NameSampler(FIRST_NAMES, FIRST_NAME_ENDINGS, students // 20, FIRST_NAME_ZIPF)
+    last_name = NameSampler(LAST_NAMES, LAST_NAME_ENDINGS, students // 2, LAST_NAME_ZIPF)
+    departments = sorted({p["department"] for p in db["professors"].values()}) or ["Computer Science"]
+
+    n_profs = max(0, students // 40 - len(db["professors"]))
+    for i in range(n_profs):
+        prof_id = f"p{len(db['professors']) + 1:06d}"
+        first, last = first_name(rng), last_name(rng)
+        db["professors"][prof_id] = {
+            "name": f"Prof. Dr. {first[0]}. {last}",
+            "office": f"Building {chr(65 + i % 6)}, Room {100 + i % 400}",
+            "email": f"{_slug(last)}.{i}@dhbw-generic.de",
+            "department": rng.choice(departments),
+        }
+    db["professors"]["pprobe"] = {"name": PROBE_PROFESSOR, "office": "Building Z, Room 999",
+                                  "email": "probe@dhbw-generic.de", "department": departments[0]}
+    prof_ids = list(db["professors"])
+
+    # Module catalog; each module is taught by one professor
+    modules = [{"module_id": g["module_id"], "module": g["module"], "prof_id": g["prof_id"]}
+               for grades in db["grades"].values() for g in grades]
+    modules = list({m["module_id"]: m for m in modules}.values())
+    n_modules = max(0, students // 50 - len(modules))
+    for i in range(n_modules):
+        name = f"{SUBJECTS[i % len(SUBJECTS)]} {LEVELS[(i // len(SUBJECTS)) % len(LEVELS)]}"
+        if i >= len(SUBJECTS) * len(LEVELS):
+            name += f" ({i // (len(SUBJECTS) * len(LEVELS)) + 1})"
+        modules.append({"module_id": f"m{i:06d}", "module": name, "prof_id": rng.choice(prof_ids)})
+    # Cumulative once: choices(weights=...) would re-add them for every student
+    module_cum_weights = list(itertools.accumulate(_zipf_weights(len(modules), 0.6)))
+
+    # Course cohorts ("Informatik K00017") with a weekly schedule
+    n_courses = max(0, students // 300 - len(db["schedule"]))
+    for i in range(n_courses):
+        program = PROGRAMS[i % len(PROGRAMS)]
+        course = f"{program} K{i:05d}"
+        db["schedule"][course] = [
+            {"day": DAYS[d], "time": rng.choice(SLOTS), "room": f"{chr(65 + d)}.{rng.randint(1, 4)}.{rng.randint(1, 30):02d}",
+             "lecture": m["module"], "prof_id": m["prof_id"], "type": "Lecture"}
+            for d, m in enumerate(rng.sample(modules, min(5, len(modules))))
+        ]
+        db["courses"][course] = {"name": course, "module_code": f"K{i:05d}", "prof_id": rng.choice(prof_ids),
+                                 "student_ids": [], "prerequisites": [], "credits": 5}
+    courses = list(db["schedule"])
+
+    def add_grades(student_id, picked):
+        db["grades"][student_id] = [
+            {"module_id": m["module_id"], "module": m["module"], "grade": rng.choice(GRADES), "credits": 5,
+             "prof_id": m["prof_id"], "status": "passed", "semester": rng.choice(SEMESTERS)}
+            for m in picked
+        ]
+
+    next_id = 1001 + len(db["students"])
+    for _ in range(max(0, students - len(db["students"]) - 1)):
+        student_id = f"s{next_id}"
+        next_id += 1
+        name = f"{first_name(rng)} {last_name(rng)}"
+        db["students"][student_id] = {"name": name, "program": rng.choice(PROGRAMS), "semester": rng.randint(1, 6)}
+        k = min(len(modules), max(1, int(rng.gauss(grades_per_student, 1.5))))
+        add_grades(student_id, {id(m): m for m in rng.choices(modules, cum_weights=module_cum_weights, k=k)}.values())
+
+    # Probes last, so a lookup by name has to walk past every other entry
+    probe_id = f"s{next_id}"
+    db["students"][probe_id] = {"name": PROBE_STUDENT, "program": PROGRAMS[0], "semester": 6}
+    probe_module = {"module_id": "mprobe", "module": PROBE_MODULE, "prof_id": "pprobe"}
+    add_grades(probe_id, [probe_module] + rng.sample(modules, min(grades_per_student - 1, len(modules))))
+    db["schedule"][PROBE_COURSE] = [{"day": "Friday", "time": SLOTS[0], "room": "Z.9.99", "lecture": PROBE_MODULE,
+                                     "prof_id": "pprobe", "type": "Lecture"}]
+    db["courses"][PROBE_COURSE] = {"name": PROBE_COURSE, "module_code": "PROBE", "prof_id": "pprobe",
+                                   "student_ids": [probe_id], "prerequisites": [], "credits": 5}
+
+    meta = {
+        "generator": GENERATOR_VERSION,
+        "students": len(db["students"]),
+        # What name lookups really have to tell apart; repeated names share a spelling
+        "distinct_spellings": len({s["name"].casefold() for s in db["students"].values()}),
+        "professors": len(db["professors"]),
+        "modules": len(modules) + 1,
+        "courses": len(courses) + 1,
+        "grades": sum(len(g) for g in db["grades"].values()),
+        "seed": seed,
+        "grades_per_student": grades_per_student,
+        "probes": {"student_id": probe_id, "student_name": PROBE_STUDENT, "professor_name": PROBE_PROFESSOR,
+                   "module_name": PROBE_MODULE, "course_name": PROBE_COURSE},
+    }
+    return db, meta
+
+
+def variant_paths(students, data_dir=DATA_DIR):
+    return os.path.join(data_dir, f"db_{students}.json"), os.path.join(data_dir, f"db_{students}.meta.json")
+
+
+def write_variant(students, data_dir=DATA_DIR, base_path=BASE_DB_PATH, grades_per_student=6, seed=0):
+    with open(base_path, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    db, meta = generate_db(students, base, grades_per_student, seed)
+    os.makedirs(data_dir, exist_ok=True)
+    db_path, meta_path = variant_paths(students, data_dir)
+    with open(db_path, "w", encoding="utf-8") as f:
+        json.dump(db, f, ensure_ascii=False, separators=(",", ":"))
+    meta["bytes"] = os.path.getsize(db_path)
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2, ensure_ascii=False)
+    return db_path, meta
+
+
+def load_or_generate(students, data_dir=DATA_DIR, base_path=BASE_DB_PATH, grades_per_student=6, seed=0):
+    """Reuse the cached variant if it was generated with the same settings, otherwise (re)write it."""
+    db_path, meta_path = variant_paths(students, data_dir)
+    if os.path.exists(db_path) and os.path.exists(meta_path):
+        with open(meta_path, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        if (meta.get("generator"), meta.get("seed"), meta.get("grades_per_student")) == (GENERATOR_VERSION, seed,
+                                                                                        grades_per_student):
+            return db_path, meta
+    return write_variant(students, data_dir, base_path, grades_per_student, seed)
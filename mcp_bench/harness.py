@@ -0,0 +1,230 @@
+import base64
+import itertools
+import json
+import statistics
+import time
+
+from .histogram import LatencyHistogram
+from .runner import call_tool_checked, run_bounded, run_open_loop, run_sweep
+from .transports import get_transport
+from .workload import weighted_picker
+
+# Bump when a field changes meaning; new fields alone don't need a bump
+SCHEMA_VERSION = 1
+BYTES_PER_TOKEN = 4
+
+
+def _ms(start_ns, end_ns):
+    return (end_ns - start_ns) / 1e6
+
+
+def resource_family(uri):
+    # dhbw://syllabus/intsem -> "syllabus"
+    return str(uri).split("://", 1)[-1].split("/", 1)[0]
+
+
+async def run_load(call, iterations, concurrency, options):
+    if options.rate:
+        return await run_open_loop(call, options.rate, iterations, options.arrivals, options.seed)
+    return await run_bounded(call, iterations, concurrency)
+
+
+async def run_tool_phase(session, tools, options, results):
+    print(f"\n--- 2. LATENCY STRESS TEST ({'open loop at %s req/s, %s arrivals' % (options.rate, options.arrivals) if options.rate else 'closed loop'}) ---")
+    overall = LatencyHistogram()
+    for tool in tools:
+        iterations = options.iterations or tool["iterations"]
+        concurrency = options.concurrency or tool["concurrency"]
+        print(f"\nBenchmarking Tool: '{tool['name']}' (N={iterations}, Concurrency={concurrency})...")
+        call = lambda tool=tool: call_tool_checked(session, tool["name"], tool["args"])
+        histogram, result = await run_load(call, iterations, concurrency, options)
+        overall.merge(histogram)
+        latency = result["latency_ms"]
+        print(f"   p50={latency['p50_ms']:.2f} ms  p99={latency['p99_ms']:.2f} ms  max={latency['max_ms']:.2f} ms  ({result['throughput_rps']:.0f} req/s, "
+              f"client CPU {result['client_cpu_ms_per_request']:.3f} ms/req)")
+        if options.rate:
+            print(f"   target {options.rate:.0f} req/s, achieved {result['achieved_rps']:.1f} req/s, "
+                  f"service time p99={result['service_time_ms']['p99_ms']:.2f} ms, max in flight {result['max_in_flight']}")
+        if result["errors"]:
+            print(f"   ⚠️ {result['errors']} of {iterations} calls failed (connection or isError); they are not in the latencies")
+        results["tools"][tool["name"]] = {**result, "args": tool["args"]}
+
+        if options.sweep:
+            print(f"   Concurrency sweep up to {options.sweep}:")
+            results["sweep"][tool["name"]] = await run_sweep(call, iterations, options.sweep)
+            print(f"   Knee at concurrency {results['sweep'][tool['name']]['knee_concurrency']}")
+    return overall
+
+
+async def run_mix_phase(session, workload, tools, options):
+    # One stream of calls drawn by weight, closer to real traffic than one tool at a time
+    iterations = options.iterations or workload["iterations"]
+    concurrency = options.concurrency or workload["concurrency"]
+    pick = weighted_picker(tools, options.seed)
+    picked = {}
+
+    async def call():
+        tool = pick()
+        picked[tool["name"]] = picked.get(tool["name"], 0) + 1
+        return await call_tool_checked(session, tool["name"], tool["args"])
+
+    print(f"\n--- 3. MIXED WORKLOAD (N={iterations}, weights from '{workload['name']}') ---")
+    _, result = await run_load(call, iterations, concurrency, options)
+    latency = result["latency_ms"]
+    print(f"   p50={latency['p50_ms']:.2f} ms  p99={latency['p99_ms']:.2f} ms  ({result['throughput_rps']:.0f} req/s)")
+    if result["errors"]:
+        print(f"   ⚠️ {result['errors']} of {iterations} calls failed (connection or isError); they are not in the latencies")
+    return {**result, "calls_per_tool": picked}
+
+
+async def list_all_pages(session, method, field):
+    """Follows nextCursor to the end; returns (items, pages, elapsed ms)."""
+    items, cursor, pages = [], None, 0
+    start = time.perf_counter_ns()
+    while True:
+        page = await getattr(session, method)(cursor) if cursor else await getattr(session, method)()
+        pages += 1
+        items.extend(getattr(page, field))
+        cursor = page.nextCursor
+        if not cursor:
+            return items, pages, _ms(start, time.perf_counter_ns())
+
+
+def contents_size(result):
+    size = 0
+    for content in result.contents:
+        if getattr(content, "text", None) is not None:
+            size += len(content.text.encode("utf-8"))
+        elif getattr(content, "blob", None) is not None:
+            size += len(base64.b64decode(content.blob))
+    return size
+
+
+async def run_resource_phase(session, workload, options, results):
+    settings = workload["resources"]
+    iterations = options.iterations or settings.get("iterations", workload["iterations"])
+    concurrency = options.concurrency or settings.get("concurrency", workload["concurrency"])
+    print(f"\n--- 4. RESOURCE BENCHMARKING (N={iterations} reads per family, Concurrency={concurrency}) ---")
+
+    templates, template_pages, templates_ms = await list_all_pages(session, "list_resource_templates", "resourceTemplates")
+    listed, resource_pages, resources_ms = await list_all_pages(session, "list_resources", "resources")
+    # One resources/list call covers every family, so its latency is stored once
+    results["resources_list_latency_ms"] = resources_ms
+    results["resource_listing"] = {
+        "templates": [t.uriTemplate for t in templates],
+        "template_count": len(templates),
+        "resource_count": len(listed),
+        "list_templates_ms": templates_ms,
+        "list_templates_pages": template_pages,
+        "list_resources_ms": resources_ms,
+        "list_resources_pages": resource_pages,
+    }
+    print(f"Found {len(templates)} templates and {len(listed)} concrete resources "
+          f"({resource_pages} page(s), {resources_ms:.2f} ms).")
+
+    # Concrete URIs per family; workload "uris" adds ones the server does not list
+    families = {resource_family(t.uriTemplate): {"template": t.uriTemplate, "uris": []} for t in templates}
+    for uri in [str(r.uri) for r in listed] + settings.get("uris", []):
+        family = families.setdefault(resource_family(uri), {"template": None, "uris": []})
+        if uri not in family["uris"]:
+            family["uris"].append(uri)
+    if settings.get("families"):
+        families = {name: family for name, family in families.items() if name in settings["families"]}
+
+    overall = LatencyHistogram()
+    resource_results = {}
+    for name, family in families.items():
+        if not family["uris"]:
+            print(f"\n⚠️ Skipping resource family '{name}': no concrete URIs listed.")
+            continue
+        sizes = []
+        # Round-robin over the family's URIs so every resource gets read
+        next_uri = itertools.cycle(family["uris"]).__next__
+
+        async def read(next_uri=next_uri, sizes=sizes):
+            sizes.append(contents_size(await session.read_resource(next_uri())))
+
+        print(f"\nBenchmarking Resource Family: '{name}' ({len(family['uris'])} URIs)...")
+        histogram, reads = await run_load(read, iterations, concurrency, options)
+        overall.merge(histogram)
+        latency = reads["latency_ms"]
+        total_bytes = sum(sizes)
+        resource_results[name] = {
+            "template": family["template"],
+            "list_item_count": len(family["uris"]),
+            "read_avg_latency_ms": latency["mean_ms"],
+            "reads": reads,
+            "bytes": {"total": total_bytes, "mean": total_bytes / len(sizes) if sizes else 0,
+                      "max": max(sizes, default=0)},
+            "throughput_bytes_per_s": total_bytes / (reads["total_time"] / 1000) if reads["total_time"] else 0,
+        }
+        print(f"   p50={latency['p50_ms']:.2f} ms  p99={latency['p99_ms']:.2f} ms  ({reads['throughput_rps']:.0f} reads/s, "
+              f"{resource_results[name]['bytes']['mean']:.0f} bytes/read)")
+    if resource_results:
+        results["overall_latency_resources_ms"] = overall.summary()
+    return resource_results
+
+
+async def run_benchmark(transport_name, workload, options):
+    """Runs the workload over one transport and returns the common result schema."""
+    plugin = get_transport(transport_name)
+    target = options.target or plugin["default_target"]
+    phases = set(options.phases)
+    results = {
+        "schema_version": SCHEMA_VERSION,
+        "last_run_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "type": transport_name,
+        "transport": {"name": transport_name, "target": target},
+        "workload": {"name": workload["name"], "path": workload["path"]},
+        "load_model": ({"mode": "open-loop", "rate": options.rate, "arrivals": options.arrivals}
+                       if options.rate else {"mode": "closed-loop"}),
+        "tools": {},
+        "resources": {},
+        "sweep": {},
+    }
+    print(f"🔬 Starting MCP Benchmark over {transport_name} ({target}), workload '{workload['name']}'...")
+
+    print("\n--- 1. PROTOCOL OVERHEAD ANALYSIS ---")
+    start = time.perf_counter_ns()
+    async with plugin["open"](target) as session:
+        connected = time.perf_counter_ns()
+        await session.initialize()
+        initialized = time.perf_counter_ns()
+        advertised = (await session.list_tools()).tools
+        listed = time.perf_counter_ns()
+
+        payload_size = len(json.dumps([t.model_dump() for t in advertised]))
+        results["handshake"] = {
+            "connect_ms": _ms(start, connected),
+            "initialize_ms": _ms(connected, initialized),
+            "list_tools_ms": _ms(initialized, listed),
+            "tools_payload_bytes": payload_size,
+            "tools_token_estimate": payload_size // BYTES_PER_TOKEN,
+            "tool_count": len(advertised),
+        }
+        print(f"✅ Handshake Latency: {results['handshake']['initialize_ms']:.2f} ms (connect {results['handshake']['connect_ms']:.2f} ms)")
+        print(f"📦 Tool Definitions Payload: {payload_size} bytes")
+        print(f"🪙 Estimated Token Cost: ~{payload_size // BYTES_PER_TOKEN} tokens")
+        print(f"🛠️ Tools Found: {len(advertised)}")
+
+        names = {t.name for t in advertised}
+        tools = [tool for tool in workload["tools"] if tool["name"] in names]
+        for tool in workload["tools"]:
+            if tool["name"] not in names:
+                print(f"\n⚠️ Skipping tool '{tool['name']}': not offered by the server.")
+        for name in sorted(names - {tool["name"] for tool in workload["tools"]}):
+            print(f"\n⚠️ Skipping tool '{name}': not part of workload '{workload['name']}'.")
+
+        if "tools" in phases and tools:
+            overall = await run_tool_phase(session, tools, options, results)
+            results["overall_avg_latency_tools"] = statistics.mean(r["avg_latency"] for r in results["tools"].values())
+            results["overall_latency_tools_ms"] = overall.summary()
+            results["overall_throughput_rps"] = statistics.mean(r["throughput_rps"] for r in results["tools"].values())
+        if "mix" in phases and tools:
+            results["mix"] = await run_mix_phase(session, workload, tools, options)
+        if "resources" in phases and workload["resources"].get("enabled"):
+            results["resources"] = await run_resource_phase(session, workload, options, results)
+            if results["resources"]:
+                results["overall_avg_latency_resources"] = statistics.mean(
+                    r["read_avg_latency_ms"] for r in results["resources"].values())
+    return results
@@ -0,0 +1,95 @@
+import math
+
+# HDR-style log-linear histogram: values are bucketed with a fixed number of
+# significant binary digits, so the relative error is bounded (~0.1% with
+# 3 significant decimal digits) no matter how large the value gets.
+# Histograms with the same precision merge by adding counts, which is what
+# lets per-tool / per-worker results be combined without keeping raw samples.
+
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+class LatencyHistogram:
+    def __init__(self, significant_digits=3):
+        self.significant_digits = significant_digits
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10 ** significant_digits))
+        self.counts = {}
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = None
+        self.max_ns = None
+
+    def _bucket(self, value):
+        shift = max(0, value.bit_length() - self.sub_bucket_bits)
+        return (value >> shift) << shift, shift
+
+    def record(self, value_ns, count=1):
+        value_ns = max(0, int(value_ns))
+        low, _ = self._bucket(value_ns)
+        self.counts[low] = self.counts.get(low, 0) + count
+        self.count += count
+        self.total_ns += value_ns * count
+        self.min_ns = value_ns if self.min_ns is None else min(self.min_ns, value_ns)
+        self.max_ns = value_ns if self.max_ns is None else max(self.max_ns, value_ns)
+
+    def merge(self, other):
+        if other.significant_digits != self.significant_digits:
+            raise ValueError("Cannot merge histograms with different precision.")
+        for low, count in other.counts.items():
+            self.counts[low] = self.counts.get(low, 0) + count
+        self.count += other.count
+        self.total_ns += other.total_ns
+        if other.count:
+            self.min_ns = other.min_ns if self.min_ns is None else min(self.min_ns, other.min_ns)
+            self.max_ns = other.max_ns if self.max_ns is None else max(self.max_ns, other.max_ns)
+        return self
+
+    def percentile_ns(self, percentile):
+        if not self.count:
+            return 0
+        rank = max(1, math.ceil(self.count * percentile / 100))
+        seen = 0
+        for low in sorted(self.counts):
+            seen += self.counts[low]
+            if seen >= rank:
+                _, shift = self._bucket(low)
+                # Highest value that lands in this bucket, never above the real max
+                return min(low + (1 << shift) - 1, self.max_ns)
+        return self.max_ns
+
+    def mean_ns(self):
+        return self.total_ns / self.count if self.count else 0
+
+    def summary(self):
+        """Latency fields in ms, as stored in benchmark_results*.json."""
+        to_ms = lambda ns: round(ns / 1e6, 4)
+        result = {
+            "count": self.count,
+            "mean_ms": to_ms(self.mean_ns()),
+            "min_ms": to_ms(self.min_ns or 0),
+        }
+        for p in PERCENTILES:
+            result[f"p{str(p).replace('.', '')}_ms"] = to_ms(self.percentile_ns(p))
+        result["max_ms"] = to_ms(self.max_ns or 0)
+        return result
+
+    def to_dict(self):
+        return {
+            "unit": "ns",
+            "significant_digits": self.significant_digits,
+            "counts": {str(low): count for low, count in sorted(self.counts.items())},
+            "count": self.count,
+            "total_ns": self.total_ns,
+            "min_ns": self.min_ns,
+            "max_ns": self.max_ns,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        hist = cls(data.get("significant_digits", 3))
+        hist.counts = {int(low): count for low, count in data.get("counts", {}).items()}
+        hist.count = data.get("count", sum(hist.counts.values()))
+        hist.total_ns = data.get("total_ns", 0)
+        hist.min_ns = data.get("min_ns")
+        hist.max_ns = data.get("max_ns")
+        return hist
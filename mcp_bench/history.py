@@ -0,0 +1,106 @@
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import time
+import uuid
+
+# Next to the code, so runs started from another directory land in the same history
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HISTORY_PATH = os.path.join(REPO_ROOT, "benchmark_history.jsonl")
+
+
+def git_commit():
+    """Current commit, with a "-dirty" suffix if the work tree has changes."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=REPO_ROOT,
+                               capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("-dirty" if dirty else "")
+
+
+def host_info():
+    return {
+        "node": platform.node(),
+        "system": platform.system(),
+        "release": platform.release(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+    }
+
+
+def host_fingerprint(info=None):
+    # Runs are only comparable on the same kind of machine
+    info = info or host_info()
+    return hashlib.sha1(json.dumps(info, sort_keys=True).encode("utf-8")).hexdigest()[:12]
+
+
+def append_run(results, path=HISTORY_PATH):
+    """Appends one benchmark result to the history file and returns its record."""
+    info = host_info()
+    record = {
+        "run_id": uuid.uuid4().hex,
+        "recorded_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "git_commit": git_commit(),
+        "transport": results.get("type"),
+        "workload": results.get("workload", {}).get("name"),
+        "host_fingerprint": host_fingerprint(info),
+        "host": info,
+        "results": results,
+    }
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record) + "\n")
+    return record
+
+
+def load_runs(path=HISTORY_PATH, transport=None, workload=None, host=None):
+    """All runs, oldest first, optionally filtered. Corrupt lines are skipped."""
+    if not os.path.exists(path):
+        return []
+    runs = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                run = json.loads(line)
+            except ValueError:
+                continue
+            if transport and run.get("transport") != transport:
+                continue
+            if workload and run.get("workload") != workload:
+                continue
+            if host and run.get("host_fingerprint") != host:
+                continue
+            runs.append(run)
+    return runs
+
+
+def find_run(runs, ref):
+    """Resolves "latest", "previous", a run id prefix or a git commit prefix."""
+    if not runs:
+        return None
+    if ref == "latest":
+        return runs[-1]
+    if ref == "previous":
+        return runs[-2] if len(runs) > 1 else None
+    for run in reversed(runs):
+        if run["run_id"].startswith(ref) or (run.get("git_commit") or "").startswith(ref):
+            return run
+    return None
+
+
+def previous_run(runs, candidate):
+    """The last run recorded before `candidate` in `runs` (oldest first), or None.
+
+    History order is recording order; runs appended after the candidate
+    are never its baseline.
+    """
+    for i, run in enumerate(runs):
+        if run["run_id"] == candidate["run_id"]:
+            return runs[i - 1] if i else None
+    earlier = [run for run in runs if run["recorded_utc"] < candidate["recorded_utc"]]
+    return earlier[-1] if earlier else None
@@ -0,0 +1,206 @@
+import importlib
+import json
+import os
+import sys
+import time
+from collections import Counter
+
+from .histogram import LatencyHistogram
+from .profiling import RunProfiler
+from .runner import run_bounded, run_open_loop
+from .workload import WorkloadError, weighted_picker
+
+# End-to-end benchmark of execute_mcp_pipeline (client/backend_logik.py)
+# against the real MCP server and mock_llm_server.py in place of DeepSeek.
+# The per-stage breakdown comes from the pipeline's own tracing spans.
+
+DEFAULT_PIPELINE_WORKLOAD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workloads", "pipeline.json")
+RESULTS_PATH = "benchmark_results_pipeline.json"
+DEFAULT_MCP_URL = "http://localhost:3000/sse"
+DEFAULT_LLM_PORT = 8090
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CLIENT_DIR = os.path.join(REPO_ROOT, "client")
+
+
+def load_pipeline_workload(path=DEFAULT_PIPELINE_WORKLOAD):
+    """Format: {"name", "iterations", "concurrency": [levels], "language",
+    "mock": {"router_latency", "final_latency"}, "prompts": [{"prompt",
+    "weight", "decision"}]}. Only the prompts are required; a prompt without
+    a decision is answered as chat by the mock router."""
+    with open(path, "r", encoding="utf-8") as f:
+        workload = json.load(f)
+    workload.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    workload["path"] = path
+    workload.setdefault("iterations", 200)
+    workload.setdefault("concurrency", [1])
+    workload.setdefault("language", "German")
+    workload.setdefault("mock", {})
+    prompts = workload.get("prompts")
+    if not prompts:
+        raise WorkloadError(f"Pipeline workload '{path}' defines no prompts.")
+    for entry in prompts:
+        if "prompt" not in entry:
+            raise WorkloadError(f"Prompt entry without a prompt in '{path}': {entry}")
+        entry.setdefault("weight", 1)
+    return workload
+
+
+def router_script(workload):
+    return [{"match": entry["prompt"], "decision": entry["decision"]} for entry in workload["prompts"] if "decision" in entry]
+
+
+def import_pipeline(llm_base_url, mcp_url, client_caches=True):
+    """Imports the client modules with their config pointed at the mock LLM.
+
+    config.py reads the environment once at import, so this must run before
+    anything else imports it. Returns (backend_logik, mcp_pool, llm_client).
+    """
+    if "config" in sys.modules:
+        raise RuntimeError("client config was imported before the pipeline benchmark could configure it")
+    os.environ["DEEPSEEK_BASE_URL"] = llm_base_url
+    os.environ["MCP_URL"] = mcp_url
+    os.environ.setdefault("DEEPSEEK_API_KEY", "mock-key")
+    # A persisted router cache or trace export would make runs depend on earlier ones
+    os.environ["ROUTER_CACHE_PATH"] = ""
+    os.environ["TRACE_EXPORT_PATH"] = ""
+    if not client_caches:
+        # Every request takes the LLM router and the MCP server
+        os.environ.update(LOCAL_ROUTER_MIN_CONFIDENCE="2", ROUTER_CACHE_MAX_ENTRIES="0", RESULT_CACHE_MAX_ENTRIES="0")
+    if CLIENT_DIR not in sys.path:
+        sys.path.insert(0, CLIENT_DIR)
+    return tuple(importlib.import_module(name) for name in ("backend_logik", "mcp_pool", "llm_client"))
+
+
+def check_pipeline_result(steps, answer):
+    # The pipeline reports failures as an error step (or an "Error..." tool output) instead of raising
+    failed = next((s for s in steps if s.get("visual_type") == "error"
+                   or (s.get("step") == 4 and str(s.get("data", "")).startswith("Error"))), None)
+    if failed is not None:
+        raise RuntimeError(f"{failed.get('title')}: {failed.get('data')}")
+    if answer.startswith("Error"):
+        raise RuntimeError(answer)
+
+
+class StageRecorder:
+    """Collects the spans of every finished pipeline run."""
+
+    def __init__(self):
+        self.stages = {}
+        self.stage_total_ms = Counter()
+        self.trace_total_ms = 0.0
+        self.router_sources = Counter()
+        self.synthesis = Counter()
+        self.prompts = Counter()
+
+    def record(self, prompt, steps):
+        self.prompts[prompt] += 1
+        waterfall = next((s["data"] for s in reversed(steps) if s.get("visual_type") == "waterfall"), [])
+        for span in waterfall:
+            self.stages.setdefault(span["name"], LatencyHistogram()).record(span["duration_ms"] * 1e6)
+            self.stage_total_ms[span["name"]] += span["duration_ms"]
+            if span["name"] == "router":
+                self.router_sources[span.get("source")] += 1
+            elif span["name"] == "synthesis":
+                self.synthesis[span.get("policy")] += 1
+        if waterfall:
+            self.trace_total_ms += max(s["start_ms"] + s["duration_ms"] for s in waterfall)
+
+    def summary(self):
+        return {
+            "stages": {name: {**hist.summary(), "share": round(self.stage_total_ms[name] / self.trace_total_ms, 4)
+                              if self.trace_total_ms else 0.0}
+                       for name, hist in self.stages.items()},
+            "router_sources": dict(self.router_sources),
+            "synthesis_policies": dict(self.synthesis),
+            "calls_per_prompt": dict(self.prompts),
+        }
+
+
+def print_level(label, result, breakdown):
+    latency = result["latency_ms"]
+    print(f"   {label}: p50={latency['p50_ms']:.1f} ms  p99={latency['p99_ms']:.1f} ms  "
+          f"{result['throughput_rps']:.2f} req/s  ({result['errors']} errors), client CPU {result['client_cpu_ms_per_request']:.2f} ms/req")
+    for name, stage in sorted(breakdown["stages"].items(), key=lambda item: -item[1]["share"]):
+        print(f"      {name:<18} p50={stage['p50_ms']:9.2f} ms  p99={stage['p99_ms']:9.2f} ms  {stage['share']:6.1%} of traced time")
+    print(f"      router: {breakdown['router_sources']}  synthesis: {breakdown['synthesis_policies']}")
+
+
+def start_offline_pipeline(workload, options):
+    """Starts the mock LLM and imports the client against it.
+
+    Returns (mock server, backend_logik, mcp_pool, llm_client).
+    """
+    # Imported here so the mcp_bench package stays usable without the client's dependencies
+    from mock_llm_server import start_mock_server
+
+    router_latency = options.router_latency or workload["mock"].get("router_latency", 0)
+    final_latency = options.final_latency or workload["mock"].get("final_latency", 0)
+    mock = start_mock_server(options.llm_port, router_latency=router_latency, final_latency=final_latency,
+                             script=router_script(workload), seed=options.seed)
+    modules = import_pipeline(f"http://127.0.0.1:{options.llm_port}/v1", options.mcp_url, not options.no_client_caches)
+    return (mock, *modules)
+
+
+async def run_pipeline_benchmark(options):
+    workload = load_pipeline_workload(options.pipeline_workload)
+    mock, backend, mcp_pool, llm_client = start_offline_pipeline(workload, options)
+    state = mock.RequestHandlerClass.state
+
+    iterations = options.iterations or workload["iterations"]
+    levels = options.concurrency or workload["concurrency"]
+    if isinstance(levels, int):
+        levels = [levels]
+    results = {
+        "last_run_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "type": "pipeline",
+        "workload": workload["name"],
+        "mcp_url": options.mcp_url,
+        "client_caches": not options.no_client_caches,
+        "mock": state.config(),
+        "iterations": iterations,
+        "levels": [],
+    }
+    pick = weighted_picker(workload["prompts"], options.seed)
+    recorder = StageRecorder()
+
+    async def call():
+        entry = pick()
+        steps, answer = await backend.execute_mcp_pipeline(entry["prompt"], workload["language"])
+        check_pipeline_result(steps, answer)
+        recorder.record(entry["prompt"], steps)
+
+    print(f"🔬 Pipeline benchmark: '{workload['name']}', N={iterations}, MCP {options.mcp_url}, "
+          f"mock LLM router {results['mock']['router_latency']} / answer {results['mock']['final_latency']} ms, "
+          f"client caches {'on' if results['client_caches'] else 'off'}")
+    try:
+        # Warm-up: opens the session pool and fills the catalog (and, if enabled, the caches)
+        for entry in workload["prompts"]:
+            await backend.execute_mcp_pipeline(entry["prompt"], workload["language"])
+        print(f"   Warm-up: {len(workload['prompts'])} prompts")
+
+        # Profiles cover the measured levels only, not the warm-up
+        with RunProfiler(options.profile, "pipeline", options.profile_dir, options.profile_interval) as profiler:
+            for concurrency in [None] if options.rate else levels:
+                recorder = StageRecorder()
+                state.reset()
+                if options.rate:
+                    _, result = await run_open_loop(call, options.rate, iterations, options.arrivals, options.seed)
+                    label = f"{options.rate:g} req/s ({options.arrivals})"
+                else:
+                    _, result = await run_bounded(call, iterations, concurrency)
+                    label = f"c={concurrency}"
+                breakdown = recorder.summary()
+                results["levels"].append({**result, **breakdown, "llm_requests": state.snapshot()})
+                print_level(label, result, breakdown)
+        if profiler.report:
+            results["profile"] = profiler.report
+            profiler.print_summary()
+    finally:
+        await mcp_pool.close_session_pools()
+        await llm_client.close_llm_clients()
+        mock.shutdown()
+
+    with open(options.output, "w") as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\n✅ Results saved to {options.output}")
+    return results
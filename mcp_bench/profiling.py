@@ -0,0 +1,157 @@
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+# Client-side profiling for a whole benchmark run. Two modes:
+#   cprofile - deterministic, every call counted; writes .prof (snakeviz,
+#              flameprof) and a text report. Inflates the client CPU numbers.
+#   sample   - a background thread snapshots the event-loop thread's stack
+#              every interval and writes collapsed stacks for flamegraph.pl
+#              or speedscope. Low overhead, statistical.
+
+PROFILE_MODES = ("cprofile", "sample")
+PROFILE_DIR = "profiles"
+DEFAULT_SAMPLE_INTERVAL = 0.001
+TOP_FUNCTIONS = 15
+# Leaf frames where the event loop waits for I/O, i.e. for the server
+IDLE_LEAVES = ("select (selectors.py", "poll (selectors.py", "wait (threading.py")
+
+
+def _label(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Samples one thread's Python stack at a fixed interval.
+
+    The sampler needs the GIL to look at the other thread, so the effective
+    resolution is bounded by sys.getswitchinterval() (5 ms by default) while
+    the sampled thread is busy in Python code.
+    """
+
+    def __init__(self, interval=DEFAULT_SAMPLE_INTERVAL, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.stacks = Counter()
+        self.samples = 0
+        self._labels = {}
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        frame = sys._current_frames().get(self.thread_id)
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                label = self._labels[code] = _label(code)
+            stack.append(label)
+            frame = frame.f_back
+        if stack:
+            self.stacks[";".join(reversed(stack))] += 1
+            self.samples += 1
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def write_collapsed(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+    def idle_share(self):
+        idle = sum(count for stack, count in self.stacks.items() if stack.rsplit(";", 1)[-1].startswith(IDLE_LEAVES))
+        return idle / self.samples if self.samples else 0.0
+
+    def top_self(self, n=TOP_FUNCTIONS):
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += count
+        return [{"function": leaf, "samples": count, "share": round(count / self.samples, 4)}
+                for leaf, count in leaves.most_common(n)]
+
+
+class RunProfiler:
+    """Context manager around one benchmark run; `report` is filled on exit.
+
+    Used with mode=None it does nothing, so callers can wrap unconditionally.
+    """
+
+    def __init__(self, mode, name, directory=PROFILE_DIR, interval=DEFAULT_SAMPLE_INTERVAL):
+        if mode is not None and mode not in PROFILE_MODES:
+            raise ValueError(f"Unknown profile mode '{mode}', expected one of {', '.join(PROFILE_MODES)}.")
+        self.mode = mode
+        self.directory = directory
+        self.base = os.path.join(directory, f"{name}_{time.strftime('%Y%m%dT%H%M%S')}")
+        self.interval = interval
+        self.report = None
+        self._profiler = None
+
+    def __enter__(self):
+        if self.mode == "cprofile":
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        elif self.mode == "sample":
+            self._profiler = StackSampler(self.interval)
+            self._profiler.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.mode is None:
+            return False
+        os.makedirs(self.directory, exist_ok=True)
+        if self.mode == "cprofile":
+            self._profiler.disable()
+            self.report = self._cprofile_report()
+        else:
+            self._profiler.stop()
+            path = f"{self.base}.collapsed"
+            self._profiler.write_collapsed(path)
+            self.report = {"mode": "sample", "files": [path], "interval_s": self.interval,
+                           "samples": self._profiler.samples, "idle_share": round(self._profiler.idle_share(), 4),
+                           "top_self": self._profiler.top_self()}
+        return False
+
+    def _cprofile_report(self):
+        prof_path, text_path = f"{self.base}.prof", f"{self.base}.txt"
+        self._profiler.dump_stats(prof_path)
+        out = io.StringIO()
+        stats = pstats.Stats(self._profiler, stream=out)
+        stats.sort_stats("cumulative").print_stats(40)
+        stats.sort_stats("tottime").print_stats(40)
+        with open(text_path, "w", encoding="utf-8") as f:
+            f.write(out.getvalue())
+        rows = sorted(stats.stats.items(), key=lambda item: -item[1][2])[:TOP_FUNCTIONS]
+        top = [{"function": f"{func} ({os.path.basename(file)}:{line})", "calls": nc,
+                "self_ms": round(tt * 1000, 3), "cumulative_ms": round(ct * 1000, 3)}
+               for (file, line, func), (cc, nc, tt, ct, callers) in rows]
+        return {"mode": "cprofile", "files": [prof_path, text_path], "top_self": top}
+
+    def print_summary(self):
+        if not self.report:
+            return
+        print(f"\n=== CLIENT PROFILE ({self.report['mode']}) ===")
+        if self.report["mode"] == "sample":
+            print(f"   {self.report['samples']} samples, {self.report['idle_share']:.1%} waiting in the event loop (I/O)")
+            for row in self.report["top_self"]:
+                print(f"   {row['share']:6.1%}  {row['function']}")
+        else:
+            for row in self.report["top_self"]:
+                print(f"   {row['self_ms']:10.1f} ms self {row['cumulative_ms']:10.1f} ms cum {row['calls']:>8}x  {row['function']}")
+        print(f"   Written: {', '.join(self.report['files'])}")
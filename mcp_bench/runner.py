@@ -0,0 +1,177 @@
+import asyncio
+import random
+import time
+
+from .histogram import LatencyHistogram
+
+# A level counts as saturated once doubling the concurrency adds less than this
+KNEE_MIN_THROUGHPUT_GAIN = 0.10
+
+
+def client_cpu_fields(cpu_ms, requests):
+    # CPU of the event-loop thread only: the client's share of each request.
+    # A stdio/SSE server runs in another process, so it never shows up here.
+    return {"client_cpu_ms": cpu_ms, "client_cpu_ms_per_request": cpu_ms / requests if requests else 0.0}
+
+
+class ToolCallError(Exception):
+    """The server answered with isError set; counted as a failed request, not as a latency sample."""
+
+
+async def call_tool_checked(session, name, args):
+    result = await session.call_tool(name, args)
+    if result.isError:
+        text = "".join(getattr(block, "text", "") for block in result.content)
+        raise ToolCallError(f"{name}: {text[:200]}")
+    return result
+
+
+async def run_bounded(call, iterations, concurrency):
+    """Runs `call()` `iterations` times with at most `concurrency` requests in flight.
+
+    Each of the `concurrency` workers sends its next request as soon as the
+    previous one returns (closed loop). Returns the latency histogram and the
+    per-tool fields stored in benchmark_results*.json.
+    """
+    histogram = LatencyHistogram()
+    counts = {"remaining": iterations, "successes": 0, "errors": 0}
+
+    async def worker():
+        while counts["remaining"] > 0:
+            counts["remaining"] -= 1
+            start = time.perf_counter_ns()
+            try:
+                await call()
+            except Exception:
+                counts["errors"] += 1
+                continue
+            histogram.record(time.perf_counter_ns() - start)
+            counts["successes"] += 1
+
+    start_time = time.perf_counter_ns()
+    cpu_start = time.thread_time_ns()
+    await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, iterations)))))
+    client_cpu = (time.thread_time_ns() - cpu_start) / 1e6
+    total_time = (time.perf_counter_ns() - start_time) / 1e6
+
+    latency = histogram.summary()
+    return histogram, {
+        "avg_latency": latency["mean_ms"],
+        "successes": counts["successes"],
+        "errors": counts["errors"],
+        "total_time": total_time,
+        "mode": "closed-loop",
+        "concurrency": concurrency,
+        "throughput_rps": counts["successes"] / (total_time / 1000) if total_time else 0,
+        **client_cpu_fields(client_cpu, iterations),
+        "latency_ms": latency,
+        "histogram": histogram.to_dict(),
+    }
+
+
+def arrival_offsets(rate, count, arrivals="uniform", seed=None):
+    """Intended send times in seconds after the start, `rate` per second on average."""
+    rng = random.Random(seed)
+    offset = 0.0
+    for _ in range(count):
+        yield offset
+        offset += rng.expovariate(rate) if arrivals == "poisson" else 1.0 / rate
+
+
+async def run_open_loop(call, rate, iterations, arrivals="uniform", seed=None):
+    """Sends `iterations` requests on a fixed schedule, independent of completions.
+
+    Latency is measured from the *intended* send time, so a slow response
+    also charges the queueing delay it causes to every request scheduled
+    behind it (coordinated-omission correction). The plain service time,
+    measured from the actual send, is reported next to it.
+    """
+    histogram = LatencyHistogram()
+    service = LatencyHistogram()
+    counts = {"successes": 0, "errors": 0, "in_flight": 0, "max_in_flight": 0}
+
+    async def send(intended_ns):
+        sent_ns = time.perf_counter_ns()
+        counts["in_flight"] += 1
+        counts["max_in_flight"] = max(counts["max_in_flight"], counts["in_flight"])
+        try:
+            await call()
+        except Exception:
+            counts["errors"] += 1
+            return
+        finally:
+            counts["in_flight"] -= 1
+        done_ns = time.perf_counter_ns()
+        histogram.record(done_ns - intended_ns)
+        service.record(done_ns - sent_ns)
+        counts["successes"] += 1
+
+    tasks = []
+    start_time = time.perf_counter_ns()
+    cpu_start = time.thread_time_ns()
+    for offset in arrival_offsets(rate, iterations, arrivals, seed):
+        intended_ns = start_time + int(offset * 1e9)
+        delay = (intended_ns - time.perf_counter_ns()) / 1e9
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.create_task(send(intended_ns)))
+    send_window = (time.perf_counter_ns() - start_time) / 1e9
+    await asyncio.gather(*tasks)
+    client_cpu = (time.thread_time_ns() - cpu_start) / 1e6
+    total_time = (time.perf_counter_ns() - start_time) / 1e6
+
+    latency = histogram.summary()
+    achieved = counts["successes"] / (total_time / 1000) if total_time else 0
+    return histogram, {
+        "avg_latency": latency["mean_ms"],
+        "successes": counts["successes"],
+        "errors": counts["errors"],
+        "total_time": total_time,
+        "mode": "open-loop",
+        "arrivals": arrivals,
+        "target_rps": rate,
+        "send_rps": iterations / send_window if send_window else 0,
+        "achieved_rps": achieved,
+        "throughput_rps": achieved,
+        "max_in_flight": counts["max_in_flight"],
+        **client_cpu_fields(client_cpu, iterations),
+        "latency_ms": latency,
+        "service_time_ms": service.summary(),
+        "histogram": histogram.to_dict(),
+    }
+
+
+def concurrency_levels(max_concurrency):
+    # 1, 2, 4, ... and always the requested maximum itself
+    levels, level = [], 1
+    while level < max_concurrency:
+        levels.append(level)
+        level *= 2
+    return levels + [max_concurrency]
+
+
+def find_knee(points):
+    """Last concurrency level that still bought a meaningful throughput gain."""
+    knee = points[0]["concurrency"] if points else None
+    for previous, current in zip(points, points[1:]):
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 + KNEE_MIN_THROUGHPUT_GAIN):
+            break
+        knee = current["concurrency"]
+    return knee
+
+
+async def run_sweep(call, iterations, max_concurrency):
+    """Throughput-vs-latency curve for one tool at concurrency 1, 2, 4, ... max."""
+    points = []
+    for concurrency in concurrency_levels(max_concurrency):
+        _, result = await run_bounded(call, iterations, concurrency)
+        latency = result["latency_ms"]
+        points.append({
+            "concurrency": concurrency,
+            "throughput_rps": result["throughput_rps"],
+            "p50_ms": latency["p50_ms"],
+            "p99_ms": latency["p99_ms"],
+            "errors": result["errors"],
+        })
+        print(f"   c={concurrency:<4} {result['throughput_rps']:8.1f} req/s  p50={latency['p50_ms']:.2f} ms  p99={latency['p99_ms']:.2f} ms")
+    return {"points": points, "knee_concurrency": find_knee(points)}
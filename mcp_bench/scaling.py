@@ -0,0 +1,144 @@
+import json
+import math
+import os
+import shutil
+import time
+
+from .datagen import DATA_DIR, load_or_generate
+from .runner import call_tool_checked, run_bounded
+from .transports import get_transport
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+DEFAULT_SERVER = "npx tsx {dir}/index_stdio.ts"
+RESULTS_PATH = "benchmark_results_scale.json"
+# The server imports ./db.json at load time, so each scale gets its own copy of the server sources
+SERVER_FILES = (os.path.join("src", "index_stdio.ts"), os.path.join("src", "schema.ts"))
+
+# (label, tool, args from the variant's probes). Name lookups target the last
+# entry; the "miss" probe has to scan everything and still find nothing.
+PROBES = [
+    ("get_student_grades[id]", "get_student_grades", lambda p: {"query": p["student_id"]}),
+    ("get_student_grades[name]", "get_student_grades", lambda p: {"query": p["student_name"]}),
+    ("get_student_grades[miss]", "get_student_grades", lambda p: {"query": "Niemand Unbekannt"}),
+    ("get_professor_info", "get_professor_info", lambda p: {"prof_name": p["professor_name"]}),
+    ("get_professor_for_module", "get_professor_for_module", lambda p: {"module_name": p["module_name"]}),
+    ("get_schedule", "get_schedule", lambda p: {"course_name": p["course_name"]}),
+    ("get_all_professors", "get_all_professors", lambda p: {}),
+    ("query_academic_data[professor]", "query_academic_data", lambda p: {"professor_name": p["professor_name"]}),
+]
+
+
+def process_tree_rss(root_pid=None):
+    """RSS in bytes of all descendants of `root_pid` (the spawned server), or None off Linux."""
+    root_pid = root_pid or os.getpid()
+    try:
+        children = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", "r") as f:
+                    ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            children.setdefault(ppid, []).append(int(entry))
+    except OSError:
+        return None
+    total, stack = 0, list(children.get(root_pid, []))
+    while stack:
+        pid = stack.pop()
+        stack.extend(children.get(pid, []))
+        try:
+            with open(f"/proc/{pid}/status", "r") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total += int(line.split()[1]) * 1024
+                        break
+        except OSError:
+            continue
+    return total
+
+
+def stage_server(db_path, students, data_dir=DATA_DIR):
+    server_dir = os.path.join(data_dir, f"server_{students}")
+    os.makedirs(server_dir, exist_ok=True)
+    for path in SERVER_FILES:
+        shutil.copy(path, server_dir)
+    shutil.copy(db_path, os.path.join(server_dir, "db.json"))
+    return server_dir
+
+
+def growth_exponent(points, key):
+    """Least-squares slope of log(key) over log(students): ~0 constant, ~1 linear."""
+    xs, ys = [], []
+    for point in points:
+        if point.get(key):
+            xs.append(math.log(point["students"]))
+            ys.append(math.log(point[key]))
+    if len(xs) < 2:
+        return None
+    mean_x, mean_y = sum(xs) / len(xs), sum(ys) / len(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if not var_x:
+        return None
+    return round(sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x, 3)
+
+
+async def measure_scale(students, meta, server_dir, options):
+    plugin = get_transport("stdio")
+    point = {"students": students, "distinct_spellings": meta["distinct_spellings"], "grades": meta["grades"],
+             "professors": meta["professors"], "modules": meta["modules"], "db_bytes": meta["bytes"], "probes": {}}
+    start = time.perf_counter_ns()
+    async with plugin["open"](options.server.format(dir=server_dir)) as session:
+        await session.initialize()
+        point["startup_ms"] = (time.perf_counter_ns() - start) / 1e6
+        rss = process_tree_rss()
+        point["rss_idle_mb"] = rss / 2 ** 20 if rss is not None else None
+
+        for label, tool, make_args in PROBES:
+            args = make_args(meta["probes"])
+            call = lambda tool=tool, args=args: call_tool_checked(session, tool, args)
+            _, result = await run_bounded(call, options.iterations, 1)
+            point["probes"][label] = {"p50_ms": result["latency_ms"]["p50_ms"], "p99_ms": result["latency_ms"]["p99_ms"],
+                                      "mean_ms": result["latency_ms"]["mean_ms"], "errors": result["errors"]}
+            print(f"   {label:<32} p50={result['latency_ms']['p50_ms']:9.3f} ms  p99={result['latency_ms']['p99_ms']:9.3f} ms")
+
+        rss = process_tree_rss()
+        point["rss_after_mb"] = rss / 2 ** 20 if rss is not None else None
+    return point
+
+
+async def run_scaling(options):
+    results = {"last_run_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "type": "scale",
+               "server": options.server, "iterations": options.iterations, "points": []}
+    for students in options.sizes:
+        print(f"\n📈 {students:,} students")
+        db_path, meta = load_or_generate(students, options.data_dir, grades_per_student=options.grades_per_student,
+                                         seed=options.seed)
+        print(f"   db.json: {meta['bytes'] / 2 ** 20:.1f} MB, {meta['distinct_spellings']:,} distinct names, "
+              f"{meta['grades']:,} grades, {meta['professors']:,} professors, "
+              f"{meta['modules']:,} modules")
+        server_dir = stage_server(db_path, students, options.data_dir)
+        try:
+            point = await measure_scale(students, meta, server_dir, options)
+        except Exception as e:
+            # A server that cannot even load the file is a result too (e.g. V8's string length limit)
+            print(f"   ❌ Server failed at this size: {e}")
+            point = {"students": students, "grades": meta["grades"], "db_bytes": meta["bytes"], "error": str(e)}
+        results["points"].append(point)
+
+    measured = [p for p in results["points"] if "probes" in p]
+    results["growth_exponents"] = {
+        label: growth_exponent([{"students": p["students"], "p50_ms": p["probes"][label]["p50_ms"]} for p in measured], "p50_ms")
+        for label, _, _ in PROBES
+    }
+    results["growth_exponents"]["startup_ms"] = growth_exponent(measured, "startup_ms")
+    results["growth_exponents"]["rss_idle_mb"] = growth_exponent(measured, "rss_idle_mb")
+
+    print("\n=== GROWTH WITH DATA SIZE (p50 ~ students^k) ===")
+    for label, exponent in results["growth_exponents"].items():
+        print(f"   {label:<32} k = {exponent if exponent is not None else 'n/a'}")
+    with open(options.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✅ Results saved to {options.output}")
+    return results
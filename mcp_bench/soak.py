@@ -0,0 +1,283 @@
+import asyncio
+import gc
+import itertools
+import json
+import os
+import re
+import threading
+import time
+import tracemalloc
+
+from .pipeline import check_pipeline_result, load_pipeline_workload, start_offline_pipeline
+from .runner import call_tool_checked, run_bounded
+from .transports import get_transport
+from .workload import load_workload, weighted_picker
+
+# Long-running leak check. Requests run in rounds of --churn-every calls;
+# every round opens fresh connections (a new MCP session for tool rounds, a
+# new session pool and LLM client for pipeline rounds) and tears them down
+# again, so leaks in connection setup and teardown add up over the run.
+# Memory is sampled in between; growth is fitted against the request count
+# after a settle period in which the bounded caches and pools fill up.
+
+RESULTS_PATH = "benchmark_results_soak.json"
+SOAK_MODES = ("tools", "pipeline")
+DEFAULT_DURATION = "10m"
+DEFAULT_SAMPLE_INTERVAL = 30.0
+SETTLE_FRACTION = 0.2
+# Allowed growth per 1000 requests after the settle period
+DEFAULT_MAX_RSS_GROWTH_KB = 512.0
+DEFAULT_MAX_HEAP_GROWTH_KB = 128.0
+DEFAULT_MAX_FD_GROWTH = 2.0
+TOP_ALLOCATION_SITES = 15
+# Pause after a failed round so a server that is down is not hammered with reconnects
+FAILED_ROUND_PAUSE_S = 1.0
+
+
+def parse_duration(text):
+    """Seconds from "90", "90s", "30m" or "2h"."""
+    match = re.fullmatch(r"\s*([\d.]+)\s*([smh]?)\s*", str(text))
+    if not match:
+        raise ValueError(f"Invalid duration '{text}', expected e.g. 90s, 30m or 2h.")
+    return float(match.group(1)) * {"": 1, "s": 1, "m": 60, "h": 3600}[match.group(2)]
+
+
+def process_rss():
+    """Current RSS of this process in bytes, or None off Linux."""
+    try:
+        with open("/proc/self/status", "r") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        return None
+    return None
+
+
+def open_fds():
+    try:
+        return len(os.listdir("/proc/self/fd"))
+    except OSError:
+        return None
+
+
+def linear_slope(xs, ys):
+    """Least-squares slope of ys over xs, None with fewer than two distinct xs."""
+    points = [(x, y) for x, y in zip(xs, ys) if y is not None]
+    if len(points) < 2:
+        return None
+    mean_x = sum(x for x, _ in points) / len(points)
+    mean_y = sum(y for _, y in points) / len(points)
+    var_x = sum((x - mean_x) ** 2 for x, _ in points)
+    if not var_x:
+        return None
+    return sum((x - mean_x) * (y - mean_y) for x, y in points) / var_x
+
+
+class MemorySampler:
+    def __init__(self, counts, trace_heap):
+        self.counts = counts
+        self.trace_heap = trace_heap
+        self.start = time.monotonic()
+        self.samples = []
+
+    def sample(self):
+        heap = tracemalloc.get_traced_memory()[0] if self.trace_heap else None
+        point = {
+            "elapsed_s": round(time.monotonic() - self.start, 3),
+            "requests": self.counts["requests"],
+            "errors": self.counts["errors"],
+            "rss_bytes": process_rss(),
+            "heap_bytes": heap,
+            "open_fds": open_fds(),
+            "threads": threading.active_count(),
+            "asyncio_tasks": len(asyncio.all_tasks()),
+        }
+        self.samples.append(point)
+        minutes, seconds = divmod(int(point["elapsed_s"]), 60)
+        rss = f"{point['rss_bytes'] / 2 ** 20:.1f} MB" if point["rss_bytes"] is not None else "n/a"
+        heap = f"{heap / 2 ** 20:.1f} MB" if heap is not None else "off"
+        print(f"⏱️ {minutes:4d}m{seconds:02d}s  {point['requests']:>9,} req ({point['errors']} errors)  RSS {rss}  "
+              f"heap {heap}  fds {point['open_fds']}  threads {point['threads']}  tasks {point['asyncio_tasks']}")
+        return point
+
+    async def run(self, interval):
+        while True:
+            await asyncio.sleep(interval)
+            self.sample()
+
+
+def growth_report(samples, settle_s):
+    """Slopes per 1000 requests (and per hour) over the samples after the settle period."""
+    settled = [s for s in samples if s["elapsed_s"] >= settle_s] or samples
+    requests = [s["requests"] for s in settled]
+    hours = [s["elapsed_s"] / 3600 for s in settled]
+    report = {"samples_used": len(settled)}
+    for key, scale in (("rss_bytes", 1024), ("heap_bytes", 1024), ("open_fds", 1), ("threads", 1), ("asyncio_tasks", 1)):
+        values = [s[key] for s in settled]
+        per_request = linear_slope(requests, values)
+        per_hour = linear_slope(hours, values)
+        name = key.replace("_bytes", "_kb")
+        report[f"{name}_per_1k_requests"] = round(per_request * 1000 / scale, 3) if per_request is not None else None
+        report[f"{name}_per_hour"] = round(per_hour / scale, 3) if per_hour is not None else None
+    return report
+
+
+def top_allocation_sites(baseline, final, limit=TOP_ALLOCATION_SITES):
+    stats = final.compare_to(baseline, "lineno")
+    return [{"site": str(stat.traceback[0]), "size_diff_kb": round(stat.size_diff / 1024, 1),
+             "count_diff": stat.count_diff, "size_kb": round(stat.size / 1024, 1)}
+            for stat in stats[:limit] if stat.size_diff > 0]
+
+
+def take_snapshot():
+    # Only the garbage that survives a collection is interesting
+    gc.collect()
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+    ))
+
+
+def counted(call, counts):
+    async def wrapper():
+        try:
+            return await call()
+        except Exception:
+            counts["errors"] += 1
+            raise
+        finally:
+            counts["requests"] += 1
+    return wrapper
+
+
+async def run_soak(options):
+    duration = parse_duration(options.duration)
+    settle_s = duration * SETTLE_FRACTION
+    counts = {"requests": 0, "errors": 0}
+    history = []
+    rounds = {}
+    cleanup = []
+
+    if "tools" in options.modes:
+        plugin = get_transport(options.transport)
+        target = options.target or plugin["default_target"]
+        pick_tool = weighted_picker(load_workload(options.workload)["tools"], options.seed)
+
+        async def tool_round():
+            # A fresh session per round: connect, initialize, N calls, teardown
+            async with plugin["open"](target) as session:
+                await session.initialize()
+
+                async def call():
+                    tool = pick_tool()
+                    return await call_tool_checked(session, tool["name"], tool["args"])
+                return await run_bounded(counted(call, counts), options.churn_every, options.concurrency)
+        rounds["tools"] = tool_round
+
+    if "pipeline" in options.modes:
+        workload = load_pipeline_workload(options.pipeline_workload)
+        mock, backend, mcp_pool, llm_client = start_offline_pipeline(workload, options)
+        cleanup.append(mock.shutdown)
+        pick_prompt = weighted_picker(workload["prompts"], options.seed)
+
+        async def pipeline_call():
+            prompt = pick_prompt()["prompt"]
+            steps, answer = await backend.execute_mcp_pipeline(prompt, workload["language"])
+            check_pipeline_result(steps, answer)
+            if options.retain_history:
+                # What st.session_state.messages keeps for a chat that never ends
+                history.append({"role": "user", "content": prompt})
+                history.append({"role": "assistant", "content": answer})
+
+        async def pipeline_round():
+            try:
+                return await run_bounded(counted(pipeline_call, counts), options.churn_every, options.concurrency)
+            finally:
+                # Drop the SSE sessions and the LLM keep-alive pool; the next round reconnects
+                await mcp_pool.close_session_pools()
+                await llm_client.close_llm_clients()
+        rounds["pipeline"] = pipeline_round
+
+    results = {
+        "last_run_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "type": "soak",
+        "modes": options.modes,
+        "duration_s": duration,
+        "churn_every": options.churn_every,
+        "concurrency": options.concurrency,
+        "retain_history": options.retain_history,
+        "tracemalloc": not options.no_tracemalloc,
+        "thresholds": {"rss_kb_per_1k_requests": options.max_rss_growth, "heap_kb_per_1k_requests": options.max_heap_growth,
+                       "open_fds_per_1k_requests": options.max_fd_growth},
+    }
+    if not options.no_tracemalloc:
+        tracemalloc.start(options.tracemalloc_frames)
+    sampler = MemorySampler(counts, not options.no_tracemalloc)
+    print(f"🧪 Soak run: {', '.join(options.modes)} for {options.duration}, {options.churn_every} requests per connection, "
+          f"concurrency {options.concurrency}, sampling every {options.sample_interval:g} s")
+    sampler.sample()
+    sampling = asyncio.create_task(sampler.run(options.sample_interval))
+    baseline = None
+    rounds_done = failed_rounds = 0
+    try:
+        for mode in itertools.cycle(options.modes):
+            elapsed = time.monotonic() - sampler.start
+            if elapsed >= duration:
+                break
+            if baseline is None and elapsed >= settle_s and not options.no_tracemalloc:
+                baseline = take_snapshot()
+            try:
+                await rounds[mode]()
+            except Exception as e:
+                # A round that cannot connect is an error, not the end of a run that may already be hours in
+                counts["errors"] += 1
+                failed_rounds += 1
+                print(f"⚠️ {mode} round failed: {type(e).__name__}: {e}")
+                await asyncio.sleep(FAILED_ROUND_PAUSE_S)
+            rounds_done += 1
+    finally:
+        sampling.cancel()
+        for stop in cleanup:
+            stop()
+        sampler.sample()
+
+        results["rounds"] = rounds_done
+        results["failed_rounds"] = failed_rounds
+        results["requests"] = counts["requests"]
+        results["errors"] = counts["errors"]
+        results["samples"] = sampler.samples
+        results["growth"] = growth_report(sampler.samples, settle_s)
+        if not options.no_tracemalloc:
+            final = take_snapshot()
+            results["top_allocation_sites"] = top_allocation_sites(baseline or final, final)
+            tracemalloc.stop()
+
+        growth = results["growth"]
+        failures = []
+        for key, limit, unit in (("rss_kb_per_1k_requests", options.max_rss_growth, "KB"),
+                                 ("heap_kb_per_1k_requests", options.max_heap_growth, "KB"),
+                                 ("open_fds_per_1k_requests", options.max_fd_growth, "fds")):
+            if growth.get(key) is not None and growth[key] > limit:
+                failures.append(f"{key} = {growth[key]} {unit} > {limit} {unit}")
+        if rounds_done and failed_rounds == rounds_done:
+            failures.append("no round completed")
+        results["failures"] = failures
+        results["verdict"] = "fail" if failures else "pass"
+        with open(options.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if failed_rounds:
+        print(f"\n⚠️ {failed_rounds} of {rounds_done} rounds failed before finishing")
+    print(f"\n=== GROWTH AFTER {settle_s:.0f} s SETTLE ({growth['samples_used']} samples, {counts['requests']:,} requests) ===")
+    for key, value in growth.items():
+        if key != "samples_used":
+            print(f"   {key:<34} {value if value is not None else 'n/a'}")
+    if results.get("top_allocation_sites"):
+        print("\n=== TOP ALLOCATION SITES (growth since settle) ===")
+        for site in results["top_allocation_sites"]:
+            print(f"   {site['size_diff_kb']:+10.1f} KB  {site['count_diff']:+8d} blocks  {site['site']}")
+    print(f"\n{'❌' if failures else '✅'} Soak {results['verdict']}: {'; '.join(failures) or 'no growth above the thresholds'}. "
+          f"Results saved to {options.output}")
+    return results
@@ -0,0 +1,295 @@
+import gc
+import itertools
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+from .datagen import load_or_generate
+from .histogram import LatencyHistogram
+from .pipeline import CLIENT_DIR
+from .scaling import growth_exponent
+
+# The server's key folding, shared with the client stores
+if CLIENT_DIR not in sys.path:
+    sys.path.insert(0, CLIENT_DIR)
+from academic_store import normalize  # noqa: E402
+
+RESULTS_PATH = "benchmark_results_store.json"
+# Per probe and side; slow scans on big variants stop at the time budget instead
+TIME_BUDGET_S = 2.0
+DEFAULT_FUZZY_QUERIES = 50
+# Exhaustive fuzzy scans take seconds per query on big variants; recall is checked on this many
+FUZZY_SCAN_QUERIES = 5
+PLAIN_VOWELS = str.maketrans("äöüÄÖÜ", "aouAOU")
+SPELLED_UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "Ä": "Ae", "Ö": "Oe", "Ü": "Ue"})
+
+
+# Python ports of the linear helpers in src/index.ts, run on the raw dict
+
+def scan_student(db, query):
+    q = normalize(query)
+    if q in db["students"]:
+        return q
+    for student_id, student in db["students"].items():
+        if normalize(student["name"]) == q:
+            return student_id
+    for student_id, student in db["students"].items():
+        if q in normalize(student["name"]):
+            return student_id
+    return None
+
+
+def scan_professor(db, query):
+    q = normalize(query)
+    return next((prof_id for prof_id, prof in db["professors"].items() if q in normalize(prof["name"])), None)
+
+
+def scan_professor_for_module(db, query):
+    q = normalize(query)
+    module_id = next((g["module_id"] for grades in db["grades"].values() for g in grades if q in normalize(g["module"])), None)
+    if module_id is None:
+        return None
+    return next((g["prof_id"] for grades in db["grades"].values() for g in grades if g["module_id"] == module_id), None)
+
+
+def scan_modules_taught_by(db, prof_id):
+    return {g["module"] for grades in db["grades"].values() for g in grades if g["prof_id"] == prof_id}
+
+
+def scan_schedule(db, course_name):
+    q = normalize(course_name)
+    return next((key for key in db["schedule"] if normalize(key) == q), None)
+
+
+def scan_query_academic_data(db, student_name, professor_name):
+    student_id, prof_id = scan_student(db, student_name), scan_professor(db, professor_name)
+    return [g for g in db["grades"].get(student_id, []) if g["prof_id"] == prof_id]
+
+
+# (label, scan(db, probes), store lookup(store, probes))
+PROBES = [
+    ("student[name]", lambda db, p: scan_student(db, p["student_name"]),
+     lambda store, p: store.find_student(p["student_name"])),
+    ("student[miss]", lambda db, p: scan_student(db, "Niemand Unbekannt"),
+     lambda store, p: store.find_student("Niemand Unbekannt")),
+    ("professor[name]", lambda db, p: scan_professor(db, p["professor_name"]),
+     lambda store, p: store.find_professor(p["professor_name"])),
+    ("module->professor", lambda db, p: scan_professor_for_module(db, p["module_name"]),
+     lambda store, p: store.professor_for_module(p["module_name"])),
+    ("professor->modules", lambda db, p: scan_modules_taught_by(db, "pprobe"),
+     lambda store, p: store.modules_taught_by("pprobe")),
+    ("course->schedule", lambda db, p: scan_schedule(db, p["course_name"]),
+     lambda store, p: store.schedule_for(p["course_name"])),
+    ("student+professor", lambda db, p: scan_query_academic_data(db, p["student_name"], p["professor_name"]),
+     lambda store, p: store.query_academic_data(student_name=p["student_name"], professor_name=p["professor_name"])),
+]
+# Lookup sides per probe: the raw-dict port of the server, AcademicStore, SqliteAcademicStore
+SIDES = ("scan", "store", "sqlite")
+
+
+def measure(fn, iterations, budget_s=TIME_BUDGET_S):
+    histogram = LatencyHistogram()
+    deadline = time.perf_counter() + budget_s
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        fn()
+        histogram.record(time.perf_counter_ns() - start)
+        if time.perf_counter() > deadline:
+            break
+    return histogram.summary()
+
+
+def traced_bytes():
+    gc.collect()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def import_client():
+    """(academic_store, sqlite_store) from client/."""
+    if CLIENT_DIR not in sys.path:
+        sys.path.insert(0, CLIENT_DIR)
+    import academic_store
+    import sqlite_store
+    return academic_store, sqlite_store
+
+
+def measure_memory(db_path, AcademicStore):
+    """MB of raw dict, store and student name index from tracemalloc; a separate pass because tracing slows loading down."""
+    tracemalloc.start()
+    try:
+        base = traced_bytes()
+        with open(db_path, "r", encoding="utf-8") as f:
+            db = json.load(f)
+        raw = traced_bytes() - base
+        store = AcademicStore(db)
+        del db
+        total = traced_bytes() - base
+        store.search_students("")
+        index = traced_bytes() - base - total
+        del store
+        return raw / 2 ** 20, total / 2 ** 20, index / 2 ** 20
+    finally:
+        tracemalloc.stop()
+
+
+# --- Ranked fuzzy search vs. linear scans ---
+
+def typo(word, rng):
+    """One random edit (delete, substitute, swap or insert) after the first letter."""
+    i = rng.randrange(1, len(word) - 1)
+    edit = rng.choice(("delete", "substitute", "swap", "insert"))
+    if edit == "delete":
+        return word[:i] + word[i + 1:]
+    if edit == "substitute":
+        return word[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + word[i + 1:]
+    if edit == "swap":
+        return word[:i] + word[i + 1] + word[i] + word[i + 2:]
+    return word[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + word[i:]
+
+
+def fuzzy_queries(students, count, seed):
+    """{"exact"|"typo"|"umlaut": [(query, intended name)]} for a sample of students."""
+    rng = random.Random(seed)
+    queries = {"exact": [], "typo": [], "umlaut": []}
+    for student in rng.sample(students, min(count, len(students))):
+        name = student.name
+        queries["exact"].append((name, name))
+        words = name.split()
+        longest = max(range(len(words)), key=lambda i: len(words[i]))
+        if len(words[longest]) >= 4:
+            words[longest] = typo(words[longest], rng)
+            queries["typo"].append((" ".join(words), name))
+        if name != name.translate(PLAIN_VOWELS):
+            queries["umlaut"].append((name.translate(SPELLED_UMLAUTS), name))
+            queries["umlaut"].append((name.translate(PLAIN_VOWELS), name))
+    return queries
+
+
+def scan_fuzzy(students, query, coverage, spellings):
+    # The same scoring as the index, on every record
+    words = spellings(query)[0][0]
+    return max(students, key=lambda s: max(coverage(words, w) for w, _ in spellings(s.name)))
+
+
+def measure_fuzzy(store, options):
+    from name_index import coverage, spellings
+
+    def same_name(found, name):
+        return found is not None and spellings(found.name)[0][1] == spellings(name)[0][1]
+
+    students = list(store.students.values())
+    start = time.perf_counter_ns()
+    store.search_students("")
+    result = {"names": len(students), "build_ms": (time.perf_counter_ns() - start) / 1e6,
+              "distinct_spellings": len(store._name_index("students")), "recall": {}}
+    queries = fuzzy_queries(students, options.fuzzy_queries, options.seed)
+    for kind, pairs in queries.items():
+        if not pairs:
+            continue
+        ranked = [[s for _, s in store.search_students(query, 5)] for query, _ in pairs]
+        result["recall"][kind] = {
+            "queries": len(pairs),
+            "substring_scan": sum(same_name(store.find_student(q), name) for q, name in pairs) / len(pairs),
+            "index@1": sum(bool(r) and same_name(r[0], name) for r, (_, name) in zip(ranked, pairs)) / len(pairs),
+            "index@5": sum(any(same_name(s, name) for s in r) for r, (_, name) in zip(ranked, pairs)) / len(pairs),
+            "fuzzy_scan@1": sum(same_name(scan_fuzzy(students, q, coverage, spellings), name)
+                                for q, name in pairs[:FUZZY_SCAN_QUERIES]) / min(len(pairs), FUZZY_SCAN_QUERIES),
+        }
+
+    typos = itertools.cycle(q for q, _ in queries["typo"] or queries["exact"])
+    result["latency"] = {
+        "substring_scan": measure(lambda: store.find_student(next(typos)), options.iterations),
+        "index": measure(lambda: store.search_students(next(typos), 5), options.iterations),
+        "fuzzy_scan": measure(lambda: scan_fuzzy(students, next(typos), coverage, spellings), options.iterations),
+    }
+    latency = result["latency"]
+    print(f"   fuzzy names: {result['names']:,} students, {result['distinct_spellings']:,} spellings, index build {result['build_ms']:.0f} ms")
+    print(f"      p50 (typo queries): substring scan {latency['substring_scan']['p50_ms']:.3f} ms, "
+          f"fuzzy scan {latency['fuzzy_scan']['p50_ms']:.1f} ms, index {latency['index']['p50_ms']:.3f} ms")
+    for kind, recall in result["recall"].items():
+        print(f"      {kind:<7} ({recall['queries']:>3}) substring {recall['substring_scan']:6.1%}  index@1 {recall['index@1']:6.1%}  "
+              f"index@5 {recall['index@5']:6.1%}  fuzzy scan@1 {recall['fuzzy_scan@1']:6.1%}")
+    return result
+
+
+def measure_sqlite(db_path, sqlite_store):
+    """Imports the variant (next to its JSON) and times open + first answer; returns (store, info)."""
+    sqlite_path = f"{db_path[:-len('.json')]}.sqlite"
+    start = time.perf_counter_ns()
+    sqlite_store.import_json(db_path, sqlite_path)
+    info = {"import_ms": (time.perf_counter_ns() - start) / 1e6, "file_mb": os.path.getsize(sqlite_path) / 2 ** 20}
+    start = time.perf_counter_ns()
+    store = sqlite_store.SqliteAcademicStore(sqlite_path)
+    store.find_student("s1001")
+    info["first_answer_ms"] = (time.perf_counter_ns() - start) / 1e6
+    return store, info
+
+
+def measure_size(students, db_path, meta, options, client):
+    academic_store, sqlite_store = client
+    point = {"students": students, "distinct_spellings": meta["distinct_spellings"], "grades": meta["grades"],
+             "db_bytes": meta["bytes"], "probes": {}}
+    start = time.perf_counter_ns()
+    with open(db_path, "r", encoding="utf-8") as f:
+        db = json.load(f)
+    point["load_ms"] = (time.perf_counter_ns() - start) / 1e6
+    start = time.perf_counter_ns()
+    store = academic_store.AcademicStore(db)
+    point["build_ms"] = (time.perf_counter_ns() - start) / 1e6
+    sqlite, point["sqlite"] = measure_sqlite(db_path, sqlite_store)
+
+    probes = meta["probes"]
+    for label, scan, lookup in PROBES:
+        calls = {"scan": lambda: scan(db, probes), "store": lambda: lookup(store, probes), "sqlite": lambda: lookup(sqlite, probes)}
+        latency = {side: measure(calls[side], options.iterations) for side in SIDES}
+        speedup = latency["scan"]["p50_ms"] / latency["store"]["p50_ms"] if latency["store"]["p50_ms"] else None
+        point["probes"][label] = {**latency, "speedup_p50": speedup}
+        print(f"   {label:<20} scan p50={latency['scan']['p50_ms']:10.4f} ms   store p50={latency['store']['p50_ms']:8.4f} ms   "
+              f"sqlite p50={latency['sqlite']['p50_ms']:8.4f} ms   x{speedup or 0:,.0f}")
+
+    point["fuzzy"] = measure_fuzzy(store, options)
+
+    sqlite.close()
+    del db, store, sqlite, calls
+    point["raw_dict_mb"], point["store_mb"], point["name_index_mb"] = measure_memory(db_path, academic_store.AcademicStore)
+    print(f"   json.load {point['load_ms']:.0f} ms ({point['raw_dict_mb']:.1f} MB dict), "
+          f"index build {point['build_ms']:.0f} ms ({point['store_mb']:.1f} MB store, "
+          f"+{point['name_index_mb']:.1f} MB student name index)")
+    print(f"   sqlite import {point['sqlite']['import_ms']:.0f} ms ({point['sqlite']['file_mb']:.1f} MB file), "
+          f"open + first answer {point['sqlite']['first_answer_ms']:.1f} ms "
+          f"vs. {point['load_ms'] + point['build_ms']:.0f} ms to load and index the JSON")
+    return point
+
+
+def run_store_benchmark(options):
+    client = import_client()
+    results = {"last_run_utc": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()), "type": "store",
+               "iterations": options.iterations, "points": []}
+    for students in options.sizes:
+        print(f"\n🗃️ {students:,} students")
+        db_path, meta = load_or_generate(students, options.data_dir, grades_per_student=options.grades_per_student,
+                                         seed=options.seed)
+        results["points"].append(measure_size(students, db_path, meta, options, client))
+
+    points = results["points"]
+    results["growth_exponents"] = {"build_ms": growth_exponent(points, "build_ms"), "store_mb": growth_exponent(points, "store_mb")}
+    for method in ("substring_scan", "index", "fuzzy_scan"):
+        results["growth_exponents"][f"fuzzy:{method}"] = growth_exponent(
+            [{"students": p["students"], "p50_ms": p["fuzzy"]["latency"][method]["p50_ms"]} for p in points], "p50_ms")
+    results["growth_exponents"]["sqlite:import_ms"] = growth_exponent(
+        [{"students": p["students"], "import_ms": p["sqlite"]["import_ms"]} for p in points], "import_ms")
+    for label, _, _ in PROBES:
+        for side in SIDES:
+            results["growth_exponents"][f"{label}:{side}"] = growth_exponent(
+                [{"students": p["students"], "p50_ms": p["probes"][label][side]["p50_ms"]} for p in points], "p50_ms")
+
+    print("\n=== GROWTH WITH DATA SIZE (p50 ~ students^k) ===")
+    for label, exponent in results["growth_exponents"].items():
+        print(f"   {label:<28} k = {exponent if exponent is not None else 'n/a'}")
+    with open(options.output, "w") as f:
+        json.dump(results, f, indent=2)
+    print(f"\n✅ Results saved to {options.output}")
+    return results
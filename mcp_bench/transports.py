@@ -0,0 +1,50 @@
+import shlex
+from contextlib import asynccontextmanager
+
+from mcp import ClientSession, StdioServerParameters, stdio_client
+from mcp.client.sse import sse_client
+from mcp.client.streamable_http import streamablehttp_client
+
+# Transport plugins. Each one is an async context manager that takes the CLI
+# options and yields a connected but *not yet initialized* ClientSession, so
+# the harness can time connect and initialize separately. Register a new
+# transport with @transport(...) and it is available as --transport <name>.
+
+TRANSPORTS = {}
+
+
+def transport(name, results_file, default_target):
+    def register(open_session):
+        TRANSPORTS[name] = {"open": asynccontextmanager(open_session),
+                            "results_file": results_file, "default_target": default_target}
+        return open_session
+    return register
+
+
+def get_transport(name):
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown transport '{name}'. Available: {', '.join(sorted(TRANSPORTS))}")
+    return TRANSPORTS[name]
+
+
+@transport("sse", "benchmark_results.json", "http://localhost:3000/sse")
+async def open_sse(target):
+    async with sse_client(target) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            yield session
+
+
+@transport("stdio", "benchmark_results_stdio.json", "npx tsx src/index_stdio.ts")
+async def open_stdio(target):
+    command, *args = shlex.split(target)
+    server_params = StdioServerParameters(command=command, args=args)
+    async with stdio_client(server_params) as (read_stream, write_stream):
+        async with ClientSession(read_stream, write_stream) as session:
+            yield session
+
+
+@transport("streamable-http", "benchmark_results_streamable_http.json", "http://localhost:3000/mcp")
+async def open_streamable_http(target):
+    async with streamablehttp_client(target) as (read_stream, write_stream, _get_session_id):
+        async with ClientSession(read_stream, write_stream) as session:
+            yield session
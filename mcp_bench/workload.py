@@ -0,0 +1,49 @@
+import json
+import os
+import random
+
+DEFAULT_WORKLOAD = os.path.join(os.path.dirname(os.path.abspath(__file__)), "workloads", "default.json")
+
+
+class WorkloadError(ValueError):
+    pass
+
+
+def load_workload(path=DEFAULT_WORKLOAD):
+    """Reads a workload file and fills in per-tool defaults.
+
+    Format: {"name", "iterations", "concurrency", "tools": [{"name", "args",
+    "weight", "concurrency", "iterations"}], "resources": {"enabled",
+    "iterations", "concurrency", "families", "uris"}}. Only the tool names
+    are required.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        workload = json.load(f)
+    workload.setdefault("name", os.path.splitext(os.path.basename(path))[0])
+    workload["path"] = path
+    workload.setdefault("iterations", 500)
+    workload.setdefault("concurrency", 5)
+    workload.setdefault("resources", {"enabled": False})
+
+    tools = workload.get("tools")
+    if not tools:
+        raise WorkloadError(f"Workload '{path}' defines no tools.")
+    for tool in tools:
+        if "name" not in tool:
+            raise WorkloadError(f"Tool entry without a name in '{path}': {tool}")
+        tool.setdefault("args", {})
+        tool.setdefault("weight", 1)
+        tool.setdefault("concurrency", workload["concurrency"])
+        tool.setdefault("iterations", workload["iterations"])
+        if tool["weight"] < 0:
+            raise WorkloadError(f"Negative weight for tool '{tool['name']}'.")
+    return workload
+
+
+def weighted_picker(tools, seed=None):
+    """Returns a function that draws tool entries in proportion to their weight."""
+    rng = random.Random(seed)
+    weights = [tool["weight"] for tool in tools]
+    if not any(weights):
+        raise WorkloadError("All tool weights are zero.")
+    return lambda: rng.choices(tools, weights)[0]
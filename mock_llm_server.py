@@ -0,0 +1,253 @@
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-in for the DeepSeek chat-completions endpoint.
+# Lets us measure connection reuse and client-side latency without network access:
+#   python mock_llm_server.py --port 8088 --latency-ms 50
+#   DEEPSEEK_BASE_URL=http://127.0.0.1:8088/v1 streamlit run client/main.py
+# Router prompts (see backend_logik.py) are answered from a script of
+# decisions, so the full pipeline runs offline:
+#   python mock_llm_server.py --router-latency lognormal:400:0.4 --final-latency normal:900:200 --script decisions.json
+
+DEFAULT_PORT = 8088
+ROUTER_MARKER = "DHBW System Router"
+ROUTER_QUERY = re.compile(r'Query: "(.*)"')
+
+
+class LatencyModel:
+    """Server-side delay per request in ms, drawn from a distribution.
+
+    Specs: "constant:50", "uniform:20:80" (low, high), "normal:50:10"
+    (mean, stddev, clipped at 0), "lognormal:50:0.5" (median, sigma) and
+    "exponential:50" (mean). A bare number is a constant.
+    """
+
+    def __init__(self, dist="constant", a=0.0, b=0.0, seed=None):
+        if dist not in ("constant", "uniform", "normal", "lognormal", "exponential"):
+            raise ValueError(f"Unknown latency distribution '{dist}'.")
+        self.dist = dist
+        self.a = a
+        self.b = b
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+
+    @classmethod
+    def parse(cls, spec, seed=None):
+        if isinstance(spec, cls):
+            return spec
+        if isinstance(spec, (int, float)):
+            return cls("constant", float(spec), seed=seed)
+        dist, *params = str(spec).split(":")
+        try:
+            return cls("constant", float(dist), seed=seed)
+        except ValueError:
+            pass
+        params = [float(p) for p in params] + [0.0, 0.0]
+        return cls(dist, params[0], params[1], seed)
+
+    def sample(self):
+        with self.lock:
+            if self.dist == "uniform":
+                value = self.rng.uniform(self.a, self.b)
+            elif self.dist == "normal":
+                value = self.rng.gauss(self.a, self.b)
+            elif self.dist == "lognormal":
+                value = self.rng.lognormvariate(math.log(self.a), self.b) if self.a > 0 else 0.0
+            elif self.dist == "exponential":
+                value = self.rng.expovariate(1 / self.a) if self.a > 0 else 0.0
+            else:
+                value = self.a
+        return max(0.0, value)
+
+    def spec(self):
+        if self.dist == "constant":
+            return f"constant:{self.a:g}"
+        if self.dist == "exponential":
+            return f"exponential:{self.a:g}"
+        return f"{self.dist}:{self.a:g}:{self.b:g}"
+
+
+def load_script(path):
+    """Router script: [{"match": "<substring of the user query>", "decision": {...}}, ...].
+
+    The first rule whose match occurs in the query (case-insensitive) wins;
+    unmatched queries get a chat decision.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        rules = json.load(f)
+    for rule in rules:
+        if "match" not in rule or "decision" not in rule:
+            raise ValueError(f"Script rule needs 'match' and 'decision': {rule}")
+    return rules
+
+
+class MockLLMState:
+    def __init__(self, latency_ms=0.0, reply="Mock answer.", router_latency=None, final_latency=None, script=None, seed=None):
+        self.latency = {
+            "router": LatencyModel.parse(router_latency if router_latency is not None else latency_ms, seed),
+            "final": LatencyModel.parse(final_latency if final_latency is not None else latency_ms,
+                                        None if seed is None else seed + 1),
+        }
+        self.reply = reply
+        self.script = script or []
+        self.lock = threading.Lock()
+        self.connections = 0
+        self.requests = 0
+        self.router_requests = 0
+        self.final_requests = 0
+        self.unscripted = 0
+
+    def count(self, field):
+        with self.lock:
+            setattr(self, field, getattr(self, field) + 1)
+
+    def decide(self, query):
+        folded = query.casefold()
+        for rule in self.script:
+            if rule["match"].casefold() in folded:
+                return rule["decision"]
+        self.count("unscripted")
+        return {"action": "chat", "response": self.reply, "reasoning": "No scripted decision for this query."}
+
+    def snapshot(self):
+        with self.lock:
+            return {"connections": self.connections, "requests": self.requests, "router_requests": self.router_requests,
+                    "final_requests": self.final_requests, "unscripted": self.unscripted}
+
+    def config(self):
+        return {"router_latency": self.latency["router"].spec(), "final_latency": self.latency["final"].spec(),
+                "script_rules": len(self.script)}
+
+    def reset(self):
+        with self.lock:
+            self.connections = 0
+            self.requests = 0
+            self.router_requests = 0
+            self.final_requests = 0
+            self.unscripted = 0
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep the connection alive between requests
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate small writes; with Nagle on, the
+    # second one waits for the client's delayed ACK (~40 ms per request)
+    disable_nagle_algorithm = True
+    state = MockLLMState()
+
+    def setup(self):
+        super().setup()
+        self.state.count("connections")
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body):
+        data = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_stream(self, body, content):
+        # OpenAI-style SSE over chunked transfer encoding, one word per chunk
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        words = content.split(" ")
+        for i, word in enumerate(words):
+            delta = {"content": word if i == len(words) - 1 else word + " "}
+            event = {"object": "chat.completion.chunk", "model": body.get("model", "mock"), "choices": [{"index": 0, "delta": delta}]}
+            self._write_chunk(f"data: {json.dumps(event)}\n\n")
+        self._write_chunk("data: [DONE]\n\n")
+        self.wfile.write(b"0\r\n\r\n")
+
+    def _write_chunk(self, text):
+        data = text.encode("utf-8")
+        self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+        self.wfile.flush()
+
+    def do_GET(self):
+        if self.path == "/stats":
+            self._send_json(200, self.state.snapshot())
+        else:
+            self._send_json(404, {"error": "not found"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        body = json.loads(self.rfile.read(length) or b"{}")
+        if self.path == "/stats/reset":
+            self.state.reset()
+            self._send_json(200, self.state.snapshot())
+            return
+        if not self.path.endswith("/chat/completions"):
+            self._send_json(404, {"error": "not found"})
+            return
+
+        self.state.count("requests")
+        messages = body.get("messages") or [{}]
+        prompt = messages[-1].get("content") or ""
+        if ROUTER_MARKER in prompt:
+            stage = "router"
+            query = ROUTER_QUERY.search(prompt)
+            content = json.dumps(self.state.decide(query.group(1) if query else prompt), ensure_ascii=False)
+        else:
+            stage = "final"
+            content = self.state.reply
+        self.state.count(f"{stage}_requests")
+        delay_ms = self.state.latency[stage].sample()
+        if delay_ms:
+            time.sleep(delay_ms / 1000)
+        if body.get("stream"):
+            self._send_stream(body, content)
+            return
+        self._send_json(200, {
+            "id": f"mock-{self.state.requests}",
+            "object": "chat.completion",
+            "model": body.get("model", "mock"),
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": content}}],
+        })
+
+
+def start_mock_server(port=DEFAULT_PORT, latency_ms=0.0, reply="Mock answer.", router_latency=None,
+                      final_latency=None, script=None, seed=None):
+    """Starts the mock in a daemon thread and returns the server (call .shutdown() to stop).
+
+    `latency_ms` applies to both stages unless `router_latency` / `final_latency`
+    (LatencyModel specs) override it; `script` is a list of router rules.
+    """
+    state = MockLLMState(latency_ms, reply, router_latency, final_latency, script, seed)
+    handler = type("Handler", (MockLLMHandler,), {"state": state})
+    server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local DeepSeek chat-completions stand-in.")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--router-latency", help="latency spec for router calls, e.g. lognormal:400:0.4")
+    parser.add_argument("--final-latency", help="latency spec for answer calls, e.g. normal:900:200")
+    parser.add_argument("--script", help="JSON file with scripted router decisions")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+
+    server = start_mock_server(args.port, args.latency_ms, router_latency=args.router_latency, final_latency=args.final_latency,
+                               script=load_script(args.script) if args.script else None, seed=args.seed)
+    config = server.RequestHandlerClass.state.config()
+    print(f"🤖 Mock LLM listening on http://127.0.0.1:{args.port}/v1 "
+          f"(router {config['router_latency']} ms, answer {config['final_latency']} ms, {config['script_rules']} scripted decisions)")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
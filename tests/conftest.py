@@ -0,0 +1,28 @@
+import os
+import sys
+
+import pytest
+
+# The client modules import each other top-level (streamlit runs client/main.py as a script)
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+for path in (ROOT, os.path.join(ROOT, "client")):
+    if path not in sys.path:
+        sys.path.insert(0, path)
+
+
+class FakeClock:
+    """Replaces a module's `time` import: both clocks read `now`, which the test moves."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
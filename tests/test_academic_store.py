@@ -0,0 +1,112 @@
+import json
+import os
+
+import pytest
+
+import academic_store
+from academic_store import AcademicStore, get_academic_store, normalize
+from mcp_bench.store_bench import scan_professor, scan_professor_for_module, scan_schedule, scan_student
+
+DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "db.json")
+
+DB = {
+    "students": {
+        "s1": {"name": "Anna Weber", "program": "WI", "semester": "3"},
+        "s2": {"name": "Anna Weber", "program": "WI", "semester": "5"},
+        "s3": {"name": "Annabell Schulz", "program": "INF", "semester": "3"},
+    },
+    "professors": {
+        "p1": {"name": "Prof. Dr. Webermann", "office": "A1", "email": "w@x", "department": "WI"},
+        "p2": {"name": "Prof. Dr. E. Weber", "office": "A2", "email": "e@x", "department": "WI"},
+    },
+    "grades": {
+        "s1": [{"module_id": "db2", "module": "Datenbanken II", "grade": 1.3, "prof_id": "p1", "status": "passed"},
+               {"module_id": "db", "module": "Datenbanken", "grade": 2.0, "prof_id": "p2", "status": "passed"}],
+        "s3": [{"module_id": "db", "module": "Datenbanken", "grade": 1.0, "prof_id": "p1", "status": "passed"}],
+    },
+    "schedule": {"WI 2024": [{"day": "Monday", "time": "09:00", "room": "A.1", "lecture": "Datenbanken", "prof_id": "p2"}]},
+    "courses": {"Wirtschaftsinformatik": {"name": "Wirtschaftsinformatik"}},
+}
+
+
+@pytest.fixture(scope="module")
+def store():
+    return AcademicStore(DB)
+
+
+def ids(records):
+    return [r.id for r in records]
+
+
+def test_normalize_matches_the_server():
+    assert normalize(" Prof. Dr. E-Weber ") == "profdreweber"
+    assert normalize(None) == ""
+
+
+def test_student_indexes(store):
+    assert store.find_student("S3").name == "Annabell Schulz"
+    assert ids(store.students_named("anna weber")) == ["s1", "s2"]
+    # Alphabetical by normalized name: "annabellschulz" < "annaweber"
+    assert ids(store.students_with_prefix("Anna")) == ["s3", "s1", "s2"]
+    assert ids(store.students_with_prefix("Anna", limit=1)) == ["s3"]
+    # Exact name first, then the first name containing the query
+    assert store.find_student("Anna Weber").id == "s1"
+    assert store.find_student("Schulz").id == "s3"
+    assert store.find_student("Xaver") is None
+
+
+def test_module_and_professor_indexes(store):
+    assert [g.module.name for g in store.grades_for("s1")] == ["Datenbanken II", "Datenbanken"]
+    # The grades share the module record instead of copying it
+    assert store.grades_for("s1")[1].module is store.grades_for("s3")[0].module
+    module, prof = store.professor_for_module("Datenbanken")
+    assert (module.id, prof.id) == ("db", "p2")
+    assert ids(store.modules_taught_by("p1")) == ["db2", "db"]
+    assert store.find_professor("weber").id == "p2"
+    assert store.find_professor("Webe").id == "p1"
+
+
+def test_schedule_needs_the_exact_course_and_courses_match_substrings(store):
+    course, lectures = store.schedule_for("wi 2024")
+    assert course == "WI 2024" and lectures[0].as_dict()["lecture"] == "Datenbanken"
+    assert store.schedule_for("WI") is None
+    assert store.find_course("informatik")[0] == "Wirtschaftsinformatik"
+
+
+def test_exact_names_beat_an_earlier_substring_match(store):
+    # The documented deviation: the server returns the first entry containing the query
+    assert scan_professor(DB, "Weber") == "p1"
+    assert store.find_professor("Weber").id == "p2"
+    assert scan_professor_for_module(DB, "Datenbanken") == "p1"
+    assert store.find_module("Datenbanken").id == "db"
+
+
+def test_lookups_agree_with_the_server_scans_on_db_json():
+    with open(DB_PATH, "r", encoding="utf-8") as f:
+        db = json.load(f)
+    store = AcademicStore(db)
+    for student_id, student in db["students"].items():
+        for query in (student_id, student["name"], student["name"].split()[-1]):
+            assert store.find_student(query).id == scan_student(db, query)
+    for prof in db["professors"].values():
+        assert store.find_professor(prof["name"]).id == scan_professor(db, prof["name"])
+    for grades in db["grades"].values():
+        for g in grades:
+            assert store.find_module(g["module"]).prof_id == scan_professor_for_module(db, g["module"])
+    for course in db["schedule"]:
+        assert store.schedule_for(course.upper())[0] == scan_schedule(db, course.upper())
+
+
+def test_get_academic_store_rebuilds_when_the_file_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(academic_store, "_store", None)
+    path = tmp_path / "db.json"
+    path.write_text(json.dumps(DB), encoding="utf-8")
+    first = get_academic_store(str(path))
+    assert get_academic_store(str(path)) is first
+
+    changed = dict(DB, students={"s9": {"name": "Neu Student"}})
+    path.write_text(json.dumps(changed), encoding="utf-8")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    rebuilt = get_academic_store(str(path))
+    assert rebuilt is not first and list(rebuilt.students) == ["s9"]
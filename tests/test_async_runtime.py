@@ -0,0 +1,68 @@
+import asyncio
+import threading
+
+import pytest
+
+import llm_client
+import mcp_pool
+from async_runtime import AsyncRuntime
+
+
+@pytest.fixture
+def runtime():
+    runtime = AsyncRuntime(name="test-runtime")
+    yield runtime
+    runtime.shutdown()
+
+
+def test_coroutines_run_on_the_runtime_thread(runtime):
+    async def where():
+        await asyncio.sleep(0)
+        return threading.current_thread().name
+
+    assert runtime.run(where()) == "test-runtime"
+    assert runtime.submit(where()).result(1) == "test-runtime"
+
+
+def test_iterate_yields_every_item_and_closes_an_abandoned_generator(runtime):
+    closed = threading.Event()
+
+    async def count(n):
+        try:
+            for i in range(n):
+                await asyncio.sleep(0)
+                yield i
+        finally:
+            closed.set()
+
+    assert list(runtime.iterate(count(3))) == [0, 1, 2]
+
+    closed.clear()
+    for item in runtime.iterate(count(10)):
+        if item == 1:
+            break
+    # Streamlit drops the generator when a rerun starts; the async side must not be left suspended
+    assert closed.wait(1)
+
+
+def test_shutdown_closes_the_pools_and_stops_the_loop(monkeypatch):
+    closed = []
+
+    async def close_pools():
+        closed.append("mcp")
+
+    async def close_clients():
+        closed.append("llm")
+
+    monkeypatch.setattr(mcp_pool, "close_session_pools", close_pools)
+    monkeypatch.setattr(llm_client, "close_llm_clients", close_clients)
+    runtime = AsyncRuntime()
+    runtime.shutdown()
+    assert closed == ["mcp", "llm"]
+    assert not runtime._thread.is_alive()
+    coro = asyncio.sleep(0)
+    with pytest.raises(RuntimeError):
+        runtime.submit(coro)
+    coro.close()
+    runtime.shutdown()
+    assert closed == ["mcp", "llm"]
@@ -0,0 +1,81 @@
+import math
+import random
+
+import pytest
+
+from mcp_bench.compare import bootstrap_greater, compare_runs, mann_whitney_greater
+from mcp_bench.histogram import LatencyHistogram
+
+MS = 1_000_000
+
+
+def histogram(values):
+    hist = LatencyHistogram()
+    for value in values:
+        hist.record(value)
+    return hist
+
+
+def latencies(median_ms, count, seed):
+    rng = random.Random(seed)
+    return [int(median_ms * MS * rng.lognormvariate(0, 0.2)) for _ in range(count)]
+
+
+def reference_p_value(a, b):
+    # Textbook Mann-Whitney U with tie correction, pair by pair on the raw samples
+    u_b = sum((y > x) + 0.5 * (y == x) for x in a for y in b)
+    n_a, n_b, n = len(a), len(b), len(a) + len(b)
+    ties = sum((a + b).count(v) ** 3 - (a + b).count(v) for v in set(a + b))
+    variance = n_a * n_b / 12 * ((n + 1) - ties / (n * (n - 1)))
+    z = (u_b - n_a * n_b / 2 - 0.5) / math.sqrt(variance)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def test_mann_whitney_on_buckets_matches_the_raw_sample_test():
+    # Values below 1000 ns have exact buckets, so the histogram ties are the sample ties
+    rng = random.Random(3)
+    a = [rng.randrange(100, 130) for _ in range(60)]
+    b = [rng.randrange(105, 135) for _ in range(50)]
+    assert mann_whitney_greater(histogram(a), histogram(b)) == pytest.approx(reference_p_value(a, b))
+
+
+def bootstrap_median(baseline, candidate):
+    return bootstrap_greater(baseline, candidate, rounds=300)
+
+
+@pytest.mark.parametrize("greater", [mann_whitney_greater, bootstrap_median])
+def test_a_slower_candidate_is_significant_in_one_direction_only(greater):
+    base, slower = histogram(latencies(10, 500, 1)), histogram(latencies(11, 500, 2))
+    assert greater(base, slower) < 0.01
+    assert greater(slower, base) > 0.5
+
+
+@pytest.mark.parametrize("greater", [mann_whitney_greater, bootstrap_median])
+def test_the_same_distribution_is_not_significant(greater):
+    assert greater(histogram(latencies(10, 500, 1)), histogram(latencies(10, 500, 2))) > 0.01
+
+
+def test_empty_histograms_are_never_significant():
+    full = histogram(latencies(10, 100, 1))
+    assert mann_whitney_greater(LatencyHistogram(), full) == 1.0
+    assert bootstrap_greater(full, LatencyHistogram()) == 1.0
+
+
+def run(tools):
+    return {"results": {"tools": {name: {"histogram": histogram(values).to_dict()} for name, values in tools.items()}}}
+
+
+def test_compare_runs_verdicts():
+    baseline = run({"grades": latencies(10, 3000, 1), "events": latencies(10, 3000, 2),
+                    "schedule": latencies(10, 3000, 3), "news": latencies(10, 100, 4)})
+    candidate = run({"grades": latencies(12, 3000, 5), "events": latencies(8, 3000, 6),
+                     # Significant on 3000 samples, but below the 5% minimum effect
+                     "schedule": latencies(10.2, 3000, 7)})
+    verdicts = {row["name"]: row["verdict"] for row in compare_runs(baseline, candidate)}
+    assert verdicts == {"grades": "regression", "events": "improvement", "schedule": "no change",
+                        "news": "missing in candidate"}
+
+
+def test_compare_runs_with_the_bootstrap():
+    rows = compare_runs(run({"grades": latencies(10, 300, 1)}), run({"grades": latencies(12, 300, 2)}), test="bootstrap")
+    assert rows[0]["verdict"] == "regression" and rows[0]["p_value"] < 0.01
@@ -0,0 +1,19 @@
+import json
+
+from mcp_bench.datagen import load_or_generate
+
+
+def test_cached_variant_is_reused_only_with_the_same_settings(tmp_path):
+    db_path, meta = load_or_generate(60, str(tmp_path), seed=1)
+    assert meta["students"] == 60 and meta["seed"] == 1
+    with open(db_path, "r", encoding="utf-8") as f:
+        first = json.load(f)
+
+    assert load_or_generate(60, str(tmp_path), seed=1)[1] == meta
+    _, reseeded = load_or_generate(60, str(tmp_path), seed=2)
+    assert reseeded["seed"] == 2
+    with open(db_path, "r", encoding="utf-8") as f:
+        assert json.load(f)["students"] != first["students"]
+
+    _, denser = load_or_generate(60, str(tmp_path), seed=2, grades_per_student=10)
+    assert denser["grades_per_student"] == 10 and denser["grades"] > reseeded["grades"]
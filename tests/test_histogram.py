@@ -0,0 +1,65 @@
+import math
+import random
+
+import pytest
+
+from mcp_bench.histogram import LatencyHistogram
+
+MS = 1_000_000
+
+
+def exact_percentile(values, percentile):
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(len(ordered) * percentile / 100)) - 1]
+
+
+def test_percentiles_stay_within_the_relative_error():
+    rng = random.Random(0)
+    values = [int(rng.lognormvariate(16, 1)) for _ in range(20000)]
+    hist = LatencyHistogram()
+    for value in values:
+        hist.record(value)
+    for percentile in (50, 90, 99, 99.9):
+        exact = exact_percentile(values, percentile)
+        assert abs(hist.percentile_ns(percentile) - exact) <= exact * 0.001 + 1
+    assert hist.percentile_ns(100) == max(values)
+    assert hist.mean_ns() == pytest.approx(sum(values) / len(values))
+
+
+def test_summary_is_in_milliseconds():
+    hist = LatencyHistogram()
+    for ms in range(1, 101):
+        hist.record(ms * MS)
+    summary = hist.summary()
+    assert summary["count"] == 100
+    assert summary["min_ms"] == 1.0 and summary["max_ms"] == 100.0
+    assert summary["p50_ms"] == pytest.approx(50, rel=0.001)
+    assert summary["p99_ms"] == pytest.approx(99, rel=0.001)
+
+
+def test_empty_histogram_reports_zeros():
+    summary = LatencyHistogram().summary()
+    assert summary["count"] == 0 and summary["p99_ms"] == 0 and summary["max_ms"] == 0
+
+
+def test_merge_equals_recording_everything_in_one():
+    rng = random.Random(1)
+    parts = [[rng.randrange(1, 500 * MS) for _ in range(1000)] for _ in range(3)]
+    merged, combined = LatencyHistogram(), LatencyHistogram()
+    for part in parts:
+        hist = LatencyHistogram()
+        for value in part:
+            hist.record(value)
+            combined.record(value)
+        merged.merge(hist)
+    assert merged.to_dict() == combined.to_dict()
+    assert merged.merge(LatencyHistogram()).count == 3000
+
+
+def test_dict_round_trip_and_precision_mismatch():
+    hist = LatencyHistogram()
+    hist.record(3 * MS, count=5)
+    restored = LatencyHistogram.from_dict(hist.to_dict())
+    assert restored.summary() == hist.summary()
+    with pytest.raises(ValueError):
+        hist.merge(LatencyHistogram(significant_digits=2))
@@ -0,0 +1,66 @@
+import json
+import os
+
+import pytest
+
+from mcp_bench.cli import compare_main
+from mcp_bench.history import HISTORY_PATH, find_run, load_runs, previous_run
+
+
+def run(run_id, recorded, transport="sse", host="host-a", commit=None):
+    return {"run_id": run_id, "recorded_utc": recorded, "git_commit": commit, "transport": transport,
+            "workload": None, "host_fingerprint": host, "host": {}, "results": {}}
+
+
+@pytest.fixture
+def history(tmp_path):
+    path = tmp_path / "history.jsonl"
+    runs = [
+        run("aaaa1111", "2026-01-01T10:00:00Z", commit="c0ffee1"),
+        run("bbbb2222", "2026-01-02T10:00:00Z", transport="stdio"),
+        run("cccc3333", "2026-01-03T10:00:00Z", host="host-b"),
+        run("dddd4444", "2026-01-04T10:00:00Z", commit="deadbee"),
+        run("eeee5555", "2026-01-05T10:00:00Z"),
+    ]
+    path.write_text("".join(json.dumps(r) + "\n" for r in runs) + "{corrupt\n", encoding="utf-8")
+    return str(path)
+
+
+def test_load_runs_filters_and_skips_corrupt_lines(history):
+    assert [r["run_id"] for r in load_runs(history)] == ["aaaa1111", "bbbb2222", "cccc3333", "dddd4444", "eeee5555"]
+    assert [r["run_id"] for r in load_runs(history, transport="sse", host="host-a")] == ["aaaa1111", "dddd4444", "eeee5555"]
+    assert load_runs(history + ".missing") == []
+
+
+def test_find_run_resolves_names_ids_and_commits(history):
+    runs = load_runs(history)
+    assert find_run(runs, "latest")["run_id"] == "eeee5555"
+    assert find_run(runs, "previous")["run_id"] == "dddd4444"
+    assert find_run(runs, "cccc")["run_id"] == "cccc3333"
+    assert find_run(runs, "deadbee")["run_id"] == "dddd4444"
+    assert find_run(runs, "ffff") is None
+
+
+def test_previous_run_is_recorded_before_the_candidate(history):
+    runs = load_runs(history, transport="sse", host="host-a")
+    assert previous_run(runs, runs[2])["run_id"] == "dddd4444"
+    # Not the newest other run: eeee5555 was recorded after the candidate
+    assert previous_run(runs, runs[1])["run_id"] == "aaaa1111"
+    assert previous_run(runs, runs[0]) is None
+
+
+def test_compare_picks_the_baseline_before_an_older_candidate(history, capsys):
+    assert compare_main(["--history", history, "--candidate", "dddd"]) == 0
+    out = capsys.readouterr().out
+    assert "Baseline : aaaa1111" in out
+    assert "Candidate: dddd4444" in out
+
+
+def test_compare_without_an_earlier_run_fails(history, capsys):
+    assert compare_main(["--history", history, "--candidate", "aaaa"]) == 2
+    assert "No baseline" in capsys.readouterr().out
+
+
+
+def test_history_lives_in_the_repo_root_not_the_working_directory():
+    assert HISTORY_PATH == os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "benchmark_history.jsonl")
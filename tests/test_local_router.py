@@ -0,0 +1,100 @@
+import pytest
+
+from local_router import LocalRouter
+
+DB = {
+    "students": {
+        "s1001": {"name": "Max Mustermann"},
+        "s1002": {"name": "Erika Musterfrau"},
+        "s1003": {"name": "Jürgen Müller"},
+    },
+    "professors": {
+        "p01": {"name": "Prof. Dr. E. Weber"},
+        "p02": {"name": "Prof. Dr. B. Schneider"},
+    },
+    "grades": {
+        "s1001": [{"module_id": "webeng", "module": "Web Engineering", "prof_id": "p01"}],
+        "s1002": [{"module_id": "dbs", "module": "Datenbanken", "prof_id": "p02"}],
+    },
+    "schedule": {"Wirtschaftsinformatik": [], "Informatik": []},
+    "courses": {"BWL": {"name": "BWL"}, "Informatik": {"name": "Informatik"}},
+    "syllabi": {"webeng": {}},
+    "news": {"n01": {}},
+}
+
+
+@pytest.fixture
+def router():
+    return LocalRouter(DB, min_confidence=0.8)
+
+
+def tool_call(decision):
+    return decision and (decision["name"], decision["args"])
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Zeig mir die Noten von s1001", ("get_student_grades", {"query": "s1001"})),
+    ("Welche Noten hat Erika Musterfrau?", ("get_student_grades", {"query": "s1002"})),
+    ("Liste alle Professoren", ("get_all_professors", {})),
+    ("Wer unterrichtet Datenbanken?", ("get_professor_for_module", {"module_name": "Datenbanken"})),
+    ("Stundenplan für Wirtschaftsinformatik", ("get_schedule", {"course_name": "Wirtschaftsinformatik"})),
+    ("Wie ist die E-Mail von Weber?", ("get_professor_info", {"prof_name": "Prof. Dr. E. Weber"})),
+    ("Welche Veranstaltungen gibt es?", ("get_events", {})),
+])
+def test_unambiguous_queries_are_routed_locally(router, query, expected):
+    decision = router.route(query)
+    assert tool_call(decision) == expected
+    assert decision["router"] == "local"
+    assert router.stats["handled"] == 1
+
+
+def test_longest_course_match_wins(router):
+    # "informatik" inside "wirtschaftsinformatik" is not a second course
+    assert router.route("Stundenplan Wirtschaftsinformatik")["args"] == {"course_name": "Wirtschaftsinformatik"}
+
+
+def test_misspelled_name_is_found_with_lower_confidence(router):
+    decision = router.route("Noten von Erika Musterfau")
+    assert tool_call(decision) == ("get_student_grades", {"query": "s1002"})
+    assert decision["confidence"] < 0.9
+
+
+@pytest.mark.parametrize("query", [
+    "Noten von s1001 und s1002",
+    "Noten von s1001 und Stundenplan Informatik",
+    "Stundenplan für BWL",
+    "Setze die Note von s1001 auf 1.0",
+    "Wie wird das Wetter morgen?",
+    "List the news about all events",
+    "Gibt es Neuigkeiten zu den Veranstaltungen?",
+])
+def test_ambiguous_unknown_or_mutating_queries_fall_back(router, query):
+    assert router.route(query) is None
+    assert router.stats == {"handled": 0, "fallback": 1, "corrected": 0}
+
+
+def test_repeated_student_id_is_still_one_student(router):
+    assert tool_call(router.route("Noten von s1001, bitte s1001")) == ("get_student_grades", {"query": "s1001"})
+
+
+def test_tools_missing_from_the_catalog_are_not_chosen(router):
+    assert router.route("Noten von s1001", available_tools={"get_events"}) is None
+
+
+def test_validate_keeps_arguments_the_server_resolves(router):
+    for decision in ({"action": "tool", "name": "get_student_grades", "args": {"query": "Mustermann"}},
+                     {"action": "tool", "name": "get_professor_info", "args": {"prof_name": "Weber"}},
+                     {"action": "chat", "response": "Hallo"}):
+        assert router.validate(decision) is decision
+    assert router.stats["corrected"] == 0
+
+
+def test_validate_corrects_typos_and_umlaut_spellings(router):
+    decision = router.validate({"action": "tool", "name": "get_professor_info", "args": {"prof_name": "Webr"}})
+    assert decision["args"] == {"prof_name": "Prof. Dr. E. Weber"}
+    assert decision["corrected_args"] == {"prof_name": {"from": "Webr", "to": "Prof. Dr. E. Weber"}}
+
+    # The server folds "ü" but does not know "ue", so this needs a correction too
+    decision = router.validate({"action": "tool", "name": "get_student_grades", "args": {"query": "Juergen Mueller"}})
+    assert decision["args"] == {"query": "s1003"}
+    assert router.stats["corrected"] == 2
@@ -0,0 +1,93 @@
+import asyncio
+from types import SimpleNamespace
+
+from mcp import types
+
+import mcp_catalog
+from mcp_catalog import CapabilityCatalog
+
+
+class FakePool:
+    """Runs catalog requests against an in-memory server, counting the list calls."""
+
+    def __init__(self):
+        self.stats = {"reconnects": 0}
+        self.message_handlers = []
+        self.close_handlers = []
+        self.tools = ["get_events"]
+        self.calls = 0
+
+    async def run(self, fn):
+        return await fn(self)
+
+    async def list_tools(self):
+        self.calls += 1
+        tools = [types.Tool(name=name, description=name, inputSchema={"type": "object"}) for name in self.tools]
+        return SimpleNamespace(tools=tools, nextCursor=None)
+
+    async def notify(self, notification):
+        for handler in self.message_handlers:
+            await handler(types.ServerNotification(root=notification))
+
+
+def names(tools):
+    return [t.name for t in tools]
+
+
+def test_entries_are_reused_until_the_ttl_runs_out(monkeypatch, clock):
+    monkeypatch.setattr(mcp_catalog, "time", clock)
+    pool = FakePool()
+    catalog = CapabilityCatalog(pool, ttl=300)
+
+    async def scenario():
+        await catalog.tools()
+        clock.now += 299
+        await catalog.tools()
+        assert pool.calls == 1
+        pool.tools.append("get_schedule")
+        clock.now += 2
+        assert names(await catalog.tools()) == ["get_events", "get_schedule"]
+
+    asyncio.run(scenario())
+    assert pool.calls == 2
+    assert catalog.stats == {"hits": 1, "misses": 2, "invalidations": 0}
+
+
+def test_list_changed_notification_drops_tools_and_prompt_version():
+    pool = FakePool()
+    catalog = CapabilityCatalog(pool, ttl=0)
+
+    async def scenario():
+        first = await catalog.version()
+        pool.tools.append("get_schedule")
+        # Without a notification the cached catalog is still served
+        assert await catalog.version() == first
+        await pool.notify(types.ToolListChangedNotification(method="notifications/tools/list_changed"))
+        assert names(await catalog.tools()) == ["get_events", "get_schedule"]
+        assert await catalog.version() != first
+
+    asyncio.run(scenario())
+    assert pool.calls == 2
+
+
+def test_a_reconnect_invalidates_the_catalog():
+    pool = FakePool()
+    catalog = CapabilityCatalog(pool, ttl=0)
+
+    async def scenario():
+        await catalog.tools()
+        pool.stats["reconnects"] += 1
+        await catalog.tools()
+
+    asyncio.run(scenario())
+    assert pool.calls == 2 and catalog.stats["invalidations"] == 1
+
+
+def test_catalog_is_dropped_with_its_pool(monkeypatch):
+    pool = FakePool()
+    monkeypatch.setattr(mcp_catalog, "get_session_pool", lambda: pool)
+    catalog = mcp_catalog.get_capability_catalog()
+    assert mcp_catalog.get_capability_catalog() is catalog
+    for handler in pool.close_handlers:
+        handler(pool)
+    assert pool not in mcp_catalog._catalogs
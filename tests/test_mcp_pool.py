@@ -0,0 +1,181 @@
+import asyncio
+
+import pytest
+
+import mcp_pool
+
+
+class FakeSession:
+    """Stands in for PooledSession: no SSE connection, opens after `open_gate` is set."""
+
+    opened = []
+    failures = 0
+    open_gate = None
+
+    def __init__(self, url, message_handler=None):
+        self.session = self
+        self.in_flight = 0
+        self.total_requests = 0
+        self.last_used = 0.0
+        self.alive = True
+        self.closed = False
+
+    @property
+    def healthy(self):
+        return self.alive and not self.closed
+
+    async def open(self):
+        if FakeSession.open_gate is not None:
+            await FakeSession.open_gate.wait()
+        await asyncio.sleep(0)
+        if FakeSession.failures:
+            FakeSession.failures -= 1
+            raise ConnectionError("server down")
+        FakeSession.opened.append(self)
+        return self
+
+    async def ping(self):
+        return self.alive
+
+    async def close(self):
+        await asyncio.sleep(0)
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def fake_sessions(monkeypatch):
+    FakeSession.opened = []
+    FakeSession.failures = 0
+    FakeSession.open_gate = None
+    monkeypatch.setattr(mcp_pool, "PooledSession", FakeSession)
+
+
+def make_pool(**kwargs):
+    options = {"min_sessions": 1, "max_sessions": 2, "max_in_flight": 1, "healthcheck_interval": 0}
+    return mcp_pool.MCPSessionPool("http://test/sse", **{**options, **kwargs})
+
+
+def test_acquire_spreads_load_and_waits_at_max_sessions():
+    async def scenario():
+        pool = make_pool()
+        first = await pool._acquire()
+        second = await pool._acquire()
+        assert first is not second
+        assert pool.stats["opened"] == 2
+
+        waiter = asyncio.create_task(pool._acquire())
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        await pool._release(first)
+        assert await asyncio.wait_for(waiter, 1) is first
+        assert pool.stats["waited"] >= 1
+        await pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_sessions_open_without_holding_the_lock():
+    async def scenario():
+        pool = make_pool(max_in_flight=2)
+        FakeSession.open_gate = asyncio.Event()
+        opening = asyncio.create_task(pool._acquire())
+        await asyncio.sleep(0.01)
+        assert pool._opening == 1
+        assert not pool._cond.locked()
+
+        # The reserved slot counts: a second caller opens the second (last) session, a third one waits
+        second = asyncio.create_task(pool._acquire())
+        third = asyncio.create_task(pool._acquire())
+        await asyncio.sleep(0.01)
+        assert pool._opening == 2
+        FakeSession.open_gate.set()
+        sessions = await asyncio.wait_for(asyncio.gather(opening, second, third), 1)
+        assert len(FakeSession.opened) == 2
+        assert pool._opening == 0
+        assert sorted(s.in_flight for s in pool.sessions) == [1, 2]
+        assert len(set(map(id, sessions))) == 2
+        await pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_failed_open_releases_its_slot():
+    async def scenario():
+        pool = make_pool(max_sessions=1)
+        FakeSession.failures = 1
+        with pytest.raises(ConnectionError):
+            await pool._acquire()
+        assert pool._opening == 0
+        assert await pool._acquire() is FakeSession.opened[0]
+        await pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_run_retries_on_a_fresh_session_after_connection_loss():
+    async def scenario():
+        pool = make_pool(max_sessions=1)
+        calls = []
+
+        async def operation(session):
+            calls.append(session)
+            if len(calls) == 1:
+                session.alive = False
+                raise ConnectionError("stream closed")
+            return "ok"
+
+        assert await pool.run(operation) == "ok"
+        assert calls[0] is not calls[1]
+        assert pool.stats["reconnects"] == 1
+        await pool.close()
+        assert calls[0].closed and calls[1].closed
+
+    asyncio.run(scenario())
+
+
+def test_run_gives_up_after_the_retries():
+    async def scenario():
+        pool = make_pool()
+
+        async def operation(session):
+            raise ConnectionError("stream closed")
+
+        with pytest.raises(ConnectionError):
+            await pool.run(operation, retries=2)
+        assert pool.stats["reconnects"] == 3
+        await pool.close()
+
+    asyncio.run(scenario())
+
+
+def test_unhealthy_sessions_are_evicted_and_closed():
+    async def scenario():
+        pool = make_pool()
+        stale = await pool._acquire()
+        await pool._release(stale)
+        stale.alive = False
+
+        fresh = await pool._acquire()
+        assert fresh is not stale
+        assert stale not in pool.sessions
+        assert pool.stats["reconnects"] == 1
+        await pool.close()
+        # close() waits for the background close of discarded sessions too
+        assert stale.closed
+        assert not pool._close_tasks
+
+    asyncio.run(scenario())
+
+
+def test_closed_pool_refuses_sessions_and_runs_close_handlers():
+    async def scenario():
+        pool = make_pool()
+        await pool.start()
+        closed = []
+        pool.close_handlers.append(closed.append)
+        await pool.close()
+        assert closed == [pool]
+        with pytest.raises(RuntimeError):
+            await pool._acquire()
+
+    asyncio.run(scenario())
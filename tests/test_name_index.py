@@ -0,0 +1,73 @@
+import pytest
+
+from name_index import NameIndex, spellings
+
+STUDENTS = [
+    ("Anna Müller", "s1"),
+    ("Anna Mueller", "s2"),
+    ("Jonas Weber", "s3"),
+    ("Jonas Webermann", "s4"),
+    ("Max Mustermann", "s5"),
+    ("Maximilian Musterfrau", "s6"),
+    ("Zeynep Yılmaz", "s7"),
+    ("Jürgen Schröder", "s8"),
+]
+
+
+@pytest.fixture(scope="module")
+def index():
+    return NameIndex(STUDENTS)
+
+
+def values(results):
+    return [value for _, value in results]
+
+
+def test_spellings_cover_both_umlaut_forms_and_drop_titles():
+    assert [words for words, _ in spellings("Prof. Dr. Jürgen Müller")] == [("juergen", "mueller"), ("jurgen", "muller")]
+    assert spellings("Weber") == [(("weber",), "weber")]
+
+
+def test_exact_name_ranks_first(index):
+    results = index.search("Jonas Weber")
+    assert results[0] == (1.0, "s3")
+    assert values(results)[1] == "s4"
+
+
+@pytest.mark.parametrize("query", ["Müller", "Mueller", "Muller", "MÜLLER"])
+def test_umlaut_spellings_find_both_entries(index, query):
+    assert set(values(index.search("Anna " + query, limit=2))) == {"s1", "s2"}
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Max Musterman", "s5"),
+    ("Jurgen Schroeder", "s8"),
+    ("Jürgen Schröter", "s8"),
+    ("Zeynep Yilmaz", "s7"),
+    ("Maximilian Mustrefrau", "s6"),
+])
+def test_typos_rank_the_intended_name_first(index, query, expected):
+    assert values(index.search(query))[0] == expected
+
+
+def test_prefixes_count_as_near_matches(index):
+    score, value = index.search("Must", limit=1)[0]
+    assert value in ("s5", "s6") and score >= 0.9
+
+
+def test_unrelated_names_fall_below_the_minimum_score(index):
+    assert index.search("Xaver Quast") == []
+    assert index.search("") == []
+
+
+def test_mentions_finds_names_inside_a_sentence(index):
+    results = index.mentions("Welche Noten hat Jonas Webermann im Semester?")
+    assert values(results)[0] == "s4"
+    # "Wetter" is a weak match for "Weber"; the router only trusts mentions from 0.85 on
+    assert index.mentions("Wie wird das Wetter morgen?", min_score=0.85) == []
+
+
+def test_equal_names_share_an_entry():
+    index = NameIndex([("Anna Müller", "s1"), ("Anna Müller", "s2"), ("Anna Muller", "s3")])
+    assert len(index) == 2
+    assert values(index.search("Anna Müller", limit=5)) == ["s1", "s2", "s3"]
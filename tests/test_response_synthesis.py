@@ -0,0 +1,58 @@
+import json
+
+import pytest
+
+from response_synthesis import render_locally
+
+SCHEDULE = {"action": "tool", "name": "get_schedule", "args": {"course_name": "Informatik"}}
+PROFESSORS = {"action": "tool", "name": "get_all_professors", "args": {}}
+NEWS = {"action": "resource", "uri": "dhbw://news/n01"}
+
+
+def test_template_renders_json_as_markdown():
+    lectures = [{"day": "Monday", "time": "09:00", "lecture": "Datenbanken", "room": "A.1.01", "professor_name": "Weber"}]
+    answer = render_locally("template", SCHEDULE, json.dumps(lectures), "German")
+    assert answer.startswith("**Stundenplan:**")
+    assert "| Monday | 09:00 | Datenbanken | A.1.01 | Weber |" in answer
+    assert render_locally("template", PROFESSORS, '["Weber"]', "English") == "**Professors:**\n\n- Weber"
+
+
+def test_resources_use_their_family_template():
+    news = {"headline": "Neu", "date": "2026-01-01", "body": "Text"}
+    assert render_locally("template", NEWS, json.dumps(news)) == "**Neu** (2026-01-01)\n\nText"
+
+
+GRADES = {"action": "tool", "name": "get_student_grades", "args": {"query": "s1001"}}
+SYLLABUS = {"action": "resource", "uri": "dhbw://syllabus/webeng"}
+
+
+def test_passthrough_returns_the_tool_output_in_the_server_language():
+    assert render_locally("passthrough", GRADES, "**Grades for X**\n\n- 1.3", "English") == "**Grades for X**\n\n- 1.3"
+
+
+def test_passthrough_in_another_language_uses_the_template_or_the_llm():
+    assert render_locally("passthrough", GRADES, "**Grades for X**\n\n- 1.3", "German") is None
+    assert render_locally("passthrough", SYLLABUS, "COURSE: Web Engineering", "German") is None
+    assert render_locally("passthrough", PROFESSORS, '["Weber"]', "German") == "**Professoren:**\n\n- Weber"
+
+
+@pytest.mark.parametrize("policy", ["template", "passthrough"])
+@pytest.mark.parametrize("output", ["null", "[]", "{}", " [ ]\n", '""'])
+@pytest.mark.parametrize("language", ["German", "English"])
+def test_empty_results_go_to_the_llm(policy, output, language):
+    assert render_locally(policy, SCHEDULE, output, language) is None
+
+
+@pytest.mark.parametrize("output", ["", "Error: connection lost", '[{"day": "Monday"}]', '{"broken": '])
+def test_errors_and_unexpected_shapes_go_to_the_llm(output):
+    assert render_locally("template", SCHEDULE, output) is None
+
+
+def test_plain_text_answers_are_shown_as_they_are_in_the_server_language():
+    assert render_locally("template", SCHEDULE, "Course 'X' not found.", "English") == "Course 'X' not found."
+    assert render_locally("template", SCHEDULE, "Course 'X' not found.", "German") is None
+
+
+def test_llm_policy_and_unknown_templates_are_never_rendered():
+    assert render_locally("llm", PROFESSORS, '["Weber"]') is None
+    assert render_locally("template", {"action": "tool", "name": "get_student_grades"}, '[{"grade": 1.0}]') is None
@@ -0,0 +1,88 @@
+import asyncio
+from types import SimpleNamespace
+
+import result_cache
+from result_cache import ToolResultCache, canonical_args, resource_family
+
+TTLS = {"default": 60, "get_events": 0, "syllabus": 600}
+
+
+def make_cache(tmp_path, **kwargs):
+    db_path = tmp_path / "db.json"
+    if not db_path.exists():
+        db_path.write_text("{}", encoding="utf-8")
+    return ToolResultCache(ttls=TTLS, db_path=str(db_path), **kwargs)
+
+
+def test_canonical_args_ignore_order_and_omitted_nulls():
+    assert canonical_args({"b": 1, "a": "x"}) == canonical_args({"a": "x", "b": 1})
+    assert canonical_args({"a": "x", "b": None}) == canonical_args({"a": "x"})
+    assert canonical_args(None) == canonical_args({}) == "{}"
+    assert resource_family("dhbw://syllabus/intsem") == "syllabus"
+
+
+def test_hit_for_the_same_call_with_reordered_args(tmp_path):
+    cache = make_cache(tmp_path)
+    cache.put("tool", "query_academic_data", {"student_name": "Max", "professor_name": "Weber"}, "result")
+    assert cache.get("tool", "query_academic_data", {"professor_name": "Weber", "student_name": "Max"}) == "result"
+    assert cache.get("tool", "query_academic_data", {"student_name": "Erika"}) is None
+    assert cache.snapshot()["hit_rate"] == 0.5
+
+
+def test_per_tool_ttl_and_zero_means_never_cached(monkeypatch, tmp_path, clock):
+    monkeypatch.setattr(result_cache, "time", clock)
+    cache = make_cache(tmp_path)
+    cache.put("tool", "get_events", {}, "events")
+    assert cache.get("tool", "get_events", {}) is None
+
+    cache.put("tool", "get_schedule", {"course_name": "X"}, "schedule")
+    cache.put("resource", "dhbw://syllabus/intsem", None, "syllabus")
+    clock.now += 61
+    assert cache.get("tool", "get_schedule", {"course_name": "X"}) is None
+    assert cache.get("resource", "dhbw://syllabus/intsem") == "syllabus"
+    assert cache.stats["expired"] == 1
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = make_cache(tmp_path, max_entries=2)
+    cache.put("tool", "a", {}, 1)
+    cache.put("tool", "b", {}, 2)
+    cache.get("tool", "a", {})
+    cache.put("tool", "c", {}, 3)
+    assert cache.get("tool", "b", {}) is None
+    assert cache.get("tool", "a", {}) == 1
+    assert cache.stats["evictions"] == 1
+
+
+def test_changed_db_file_invalidates_everything(monkeypatch, tmp_path, clock):
+    monkeypatch.setattr(result_cache, "time", clock)
+    cache = make_cache(tmp_path)
+    cache.put("tool", "get_all_professors", {}, "professors")
+    (tmp_path / "db.json").write_text('{"professors": {}}', encoding="utf-8")
+    # Checked at most once per FINGERPRINT_INTERVAL
+    assert cache.get("tool", "get_all_professors", {}) == "professors"
+    clock.now += ToolResultCache.FINGERPRINT_INTERVAL + 0.1
+    assert cache.get("tool", "get_all_professors", {}) is None
+    assert cache.stats["db_invalidations"] == 1
+
+
+def test_call_tool_caches_results_but_not_errors(tmp_path):
+    calls = []
+
+    class FakePool:
+        async def run(self, operation):
+            return await operation(self)
+
+        async def call_tool(self, name, args):
+            calls.append(name)
+            return SimpleNamespace(isError=name == "broken", content=[])
+
+    async def scenario():
+        cache, pool = make_cache(tmp_path), FakePool()
+        assert (await cache.call_tool(pool, "get_all_professors", {}))[1] is False
+        assert (await cache.call_tool(pool, "get_all_professors", {}))[1] is True
+        await cache.call_tool(pool, "broken", {})
+        assert (await cache.call_tool(pool, "broken", {}))[1] is False
+
+    asyncio.run(scenario())
+    assert calls == ["get_all_professors", "broken", "broken"]
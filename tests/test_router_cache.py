@@ -0,0 +1,68 @@
+import router_cache
+from router_cache import RouterDecisionCache, normalize_query
+
+GRADES = {"action": "tool", "name": "get_student_grades", "args": {"query": "s1001"}}
+
+
+def test_normalized_queries_share_an_entry():
+    assert normalize_query('Zeige mir die „Noten" für Student S1001?') == "zeige mir die noten für student s1001"
+    cache = RouterDecisionCache(path=None)
+    cache.put("Zeige mir die Noten für Student s1001?", "German", "v1", GRADES)
+    assert cache.get("zeige mir die noten  für student S1001", "German", "v1") == GRADES
+    assert cache.stats["hits"] == 1
+
+
+def test_language_and_catalog_version_are_part_of_the_key():
+    cache = RouterDecisionCache(path=None)
+    cache.put("Noten s1001", "German", "v1", GRADES)
+    assert cache.get("Noten s1001", "English", "v1") is None
+    assert cache.get("Noten s1001", "German", "v2") is None
+    assert cache.stats["misses"] == 2
+
+
+def test_entries_expire_after_the_ttl(monkeypatch, clock):
+    monkeypatch.setattr(router_cache, "time", clock)
+    cache = RouterDecisionCache(ttl=60, path=None)
+    cache.put("Noten s1001", "German", "v1", GRADES)
+    clock.now += 59
+    assert cache.get("Noten s1001", "German", "v1") == GRADES
+    clock.now += 2
+    assert cache.get("Noten s1001", "German", "v1") is None
+    assert cache.stats["expired"] == 1
+    assert cache.snapshot()["entries"] == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = RouterDecisionCache(max_entries=2, path=None)
+    for query in ("a", "b"):
+        cache.put(query, "German", "v1", GRADES)
+    cache.get("a", "German", "v1")
+    cache.put("c", "German", "v1", GRADES)
+    assert cache.get("b", "German", "v1") is None
+    assert cache.get("a", "German", "v1") == GRADES
+    assert cache.stats["evictions"] == 1
+
+
+def test_callers_get_copies_and_invalid_decisions_are_not_stored():
+    cache = RouterDecisionCache(path=None)
+    cache.put("Noten s1001", "German", "v1", GRADES)
+    cache.get("Noten s1001", "German", "v1")["args"]["query"] = "changed"
+    assert cache.get("Noten s1001", "German", "v1") == GRADES
+
+    cache.put("kaputt", "German", "v1", {"action": "explode"})
+    assert cache.get("kaputt", "German", "v1") is None
+
+
+def test_entries_survive_a_restart_and_clear(tmp_path):
+    path = str(tmp_path / "router_cache.json")
+    RouterDecisionCache(path=path).put("Noten s1001", "German", "v1", GRADES)
+    reloaded = RouterDecisionCache(path=path)
+    assert reloaded.get("Noten s1001", "German", "v1") == GRADES
+    reloaded.clear()
+    assert RouterDecisionCache(path=path).get("Noten s1001", "German", "v1") is None
+
+
+def test_corrupt_cache_file_is_ignored(tmp_path):
+    path = tmp_path / "router_cache.json"
+    path.write_text("{not json", encoding="utf-8")
+    assert RouterDecisionCache(path=str(path)).snapshot()["entries"] == 0
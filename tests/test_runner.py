@@ -0,0 +1,61 @@
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from mcp_bench.runner import ToolCallError, call_tool_checked, run_bounded, run_open_loop
+
+MS = 1_000_000
+
+
+def test_open_loop_charges_the_queueing_delay_to_late_requests():
+    calls = []
+
+    async def call():
+        calls.append(time.perf_counter_ns())
+        if len(calls) == 1:
+            # Blocks the event loop, so the next nine requests go out late
+            time.sleep(0.1)
+
+    histogram, result = asyncio.run(run_open_loop(call, rate=100, iterations=10))
+    assert result["successes"] == 10 and result["errors"] == 0
+    # Measured from the intended send times 10..90 ms, not from the late actual send
+    assert histogram.percentile_ns(50) >= 30 * MS
+    assert result["service_time_ms"]["p50_ms"] < 20
+    assert result["latency_ms"]["max_ms"] >= 90
+
+
+def test_closed_loop_hides_the_same_stall():
+    calls = []
+
+    async def call():
+        calls.append(None)
+        if len(calls) == 1:
+            time.sleep(0.1)
+
+    histogram, _ = asyncio.run(run_bounded(call, 10, 1))
+    assert histogram.percentile_ns(50) < 20 * MS
+
+
+class FakeSession:
+    def __init__(self, errors):
+        self.errors = errors
+
+    async def call_tool(self, name, args):
+        is_error = self.errors > 0
+        self.errors -= 1
+        text = "Student not found" if is_error else "ok"
+        return SimpleNamespace(isError=is_error, content=[SimpleNamespace(type="text", text=text)])
+
+
+def test_tool_errors_count_as_failed_requests():
+    session = FakeSession(errors=3)
+    histogram, result = asyncio.run(run_bounded(lambda: call_tool_checked(session, "get_student_grades", {}), 10, 2))
+    assert result["errors"] == 3 and result["successes"] == 7
+    assert histogram.count == 7
+
+
+def test_call_tool_checked_raises_with_the_error_text():
+    with pytest.raises(ToolCallError, match="get_events: Student not found"):
+        asyncio.run(call_tool_checked(FakeSession(errors=1), "get_events", {}))
@@ -0,0 +1,133 @@
+import json
+import os
+import shutil
+
+import pytest
+
+import sqlite_store
+from academic_store import AcademicStore
+from sqlite_store import SqliteAcademicStore, get_data_store, import_json
+
+DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src", "db.json")
+
+
+def touch(path, seconds=1):
+    # A later mtime without waiting for the file system clock
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + seconds * 1_000_000_000))
+
+
+@pytest.fixture
+def imported(tmp_path):
+    json_path, sqlite_path = str(tmp_path / "db.json"), str(tmp_path / "db.sqlite")
+    shutil.copyfile(DB_PATH, json_path)
+    counts = import_json(json_path, sqlite_path)
+    store = SqliteAcademicStore(sqlite_path)
+    yield json_path, sqlite_path, counts, store
+    store.close()
+
+
+@pytest.fixture(scope="module")
+def db():
+    with open(DB_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def key(record):
+    return record and record.as_dict()
+
+
+def test_import_json_counts_rows_and_leaves_no_temp_file(imported, db):
+    json_path, sqlite_path, counts, store = imported
+    memory = AcademicStore(db)
+    assert counts["students"] == len(db["students"]) and counts["courses"] == len(db["courses"])
+    assert store.stats() == memory.stats()
+    assert not os.path.exists(sqlite_path + ".tmp")
+    # Importing again replaces the file instead of appending to it
+    assert import_json(json_path, sqlite_path) == counts
+
+
+def test_lookups_match_the_in_memory_store(imported, db):
+    store, memory = imported[3], AcademicStore(db)
+    student_queries = [q for sid, s in db["students"].items() for q in (sid, s["name"], s["name"].split()[-1], s["name"][:4])]
+    for query in student_queries + ["nobody"]:
+        assert key(store.find_student(query)) == key(memory.find_student(query))
+        assert [key(s) for s in store.students_named(query)] == [key(s) for s in memory.students_named(query)]
+        assert [s.id for s in store.students_with_prefix(query)] == [s.id for s in memory.students_with_prefix(query)]
+    for student_id in db["students"]:
+        assert [key(g) for g in store.grades_for(student_id)] == [key(g) for g in memory.grades_for(student_id)]
+
+    prof_queries = [q for p in db["professors"].values() for q in (p["name"], p["name"].split()[-1], p["name"][-4:])]
+    for query in prof_queries + ["nobody"]:
+        assert key(store.find_professor(query)) == key(memory.find_professor(query))
+    for prof_id in db["professors"]:
+        assert [m.id for m in store.modules_taught_by(prof_id)] == [m.id for m in memory.modules_taught_by(prof_id)]
+
+    modules = {g["module"] for grades in db["grades"].values() for g in grades}
+    for query in sorted(modules) + [m[:5] for m in sorted(modules)] + ["nothing"]:
+        found, expected = store.professor_for_module(query), memory.professor_for_module(query)
+        assert (found and (found[0].id, key(found[1]))) == (expected and (expected[0].id, key(expected[1])))
+
+    for course in list(db["schedule"]) + [c.lower() for c in db["schedule"]] + ["WI"]:
+        found, expected = store.schedule_for(course), memory.schedule_for(course)
+        assert (found and (found[0], [key(l) for l in found[1]])) == (expected and (expected[0], [key(l) for l in expected[1]]))
+    for query in list(db["courses"]) + ["inf", "nothing"]:
+        assert store.find_course(query) == memory.find_course(query)
+
+
+def test_query_academic_data_matches_the_in_memory_store(imported, db):
+    store, memory = imported[3], AcademicStore(db)
+    students = [s["name"] for s in db["students"].values()] + ["nobody", None]
+    professors = [p["name"].split()[-1] for p in db["professors"].values()] + ["nobody", None]
+    for student_name in students:
+        for professor_name in professors:
+            assert (store.query_academic_data(student_name, professor_name)
+                    == memory.query_academic_data(student_name, professor_name))
+    for course in list(db["courses"]) + ["nothing"]:
+        assert store.query_academic_data(course_name=course) == memory.query_academic_data(course_name=course)
+
+
+def test_is_current_follows_db_json(imported):
+    json_path, _, _, store = imported
+    assert store.is_current(json_path)
+    touch(json_path)
+    assert not store.is_current(json_path)
+    assert store.is_current(json_path + ".missing")
+
+
+@pytest.fixture
+def configured(imported, monkeypatch):
+    json_path, sqlite_path = imported[:2]
+    monkeypatch.setattr(sqlite_store, "DATA_BACKEND", "sqlite")
+    monkeypatch.setattr(sqlite_store, "DB_JSON_PATH", json_path)
+    monkeypatch.setattr(sqlite_store, "DB_SQLITE_PATH", sqlite_path)
+    monkeypatch.setattr(sqlite_store, "_sqlite_store", None)
+    monkeypatch.setattr(sqlite_store, "_sqlite_key", None)
+    yield json_path, sqlite_path
+    if sqlite_store._sqlite_store is not None:
+        sqlite_store._sqlite_store.close()
+
+
+def test_get_data_store_uses_a_current_sqlite_file(configured):
+    store = get_data_store()
+    assert store.backend == "sqlite" and store.path == configured[1]
+    assert get_data_store() is store
+
+
+def test_get_data_store_falls_back_while_the_sqlite_file_is_stale_or_missing(configured):
+    json_path, sqlite_path = configured
+    touch(json_path)
+    assert get_data_store().backend == "json"
+
+    import_json(json_path, sqlite_path)
+    touch(sqlite_path, 2)
+    assert get_data_store().backend == "sqlite"
+
+    os.remove(sqlite_path)
+    assert get_data_store().backend == "json"
+
+
+def test_json_backend_never_opens_sqlite(configured, monkeypatch):
+    monkeypatch.setattr(sqlite_store, "DATA_BACKEND", "json")
+    assert get_data_store().backend == "json"
+    assert sqlite_store._sqlite_store is None